@@ -4,6 +4,7 @@ Uses Webster's formula and traffic state to optimize green times.
 """
 
 import numpy as np
+from typing import Optional
 from control.signal_phases import SignalPhaseController, PhaseType
 from control.safety_validator import SafetyValidator
 
@@ -48,20 +49,28 @@ class AdaptiveController:
             PhaseType.EW_THROUGH: 0.0
         }
         self.max_wait_before_override = 90.0  # seconds
+        self.last_update_time: Optional[float] = None
         
         print(f"✓ Adaptive controller initialized")
     
-    def update(self, intersection_state, current_time: float) -> str:
+    def update(self, intersection_state, current_time: float,
+               dt: Optional[float] = None) -> str:
         """
         Update signal with adaptive logic
         
         Args:
             intersection_state: Current IntersectionState
             current_time: Simulation time
+            dt: Seconds since the previous update (None = derived from
+                the previous call's current_time)
             
         Returns:
             SUMO signal state string
         """
+        if dt is None:
+            dt = 0.0 if self.last_update_time is None else current_time - self.last_update_time
+        self.last_update_time = current_time
+        
         phase_elapsed = current_time - self.phase_start_time
         
         # Check for phase transition
@@ -89,7 +98,7 @@ class AdaptiveController:
                 self.planned_green_time = phase_elapsed + 5.0
         
         # Update wait times for starvation prevention
-        self._update_wait_times(intersection_state, phase_elapsed)
+        self._update_wait_times(intersection_state, dt)
         
         # Handle transitions
         if self.in_transition:
@@ -158,15 +167,15 @@ class AdaptiveController:
         
         return candidate
     
-    def _update_wait_times(self, intersection_state, phase_elapsed: float):
-        """Track how long each phase has been waiting"""
+    def _update_wait_times(self, intersection_state, dt: float):
+        """Track how long each phase has been waiting (dt = seconds since last update)"""
         # Current phase is being served, reset its wait time
         self.phase_wait_times[self.current_phase] = 0.0
         
         # Other phases accumulate wait time
         for phase_type in self.phase_wait_times.keys():
             if phase_type != self.current_phase:
-                self.phase_wait_times[phase_type] += 0.1  # Assuming 0.1s update interval
+                self.phase_wait_times[phase_type] += dt
     
     def _handle_transition(self, current_time: float) -> str:
         """Handle yellow and all-red transitions"""
@@ -211,6 +220,7 @@ class AdaptiveController:
         self.in_transition = False
         self.transition_stage = 0  # ← ADDED
         self.transition_target_phase = None  # ← ADDED
+        self.last_update_time = None
         
         # Clean up transition timing attributes if they exist
         if hasattr(self, 'yellow_start_time'):  # ← ADDED
@@ -3,6 +3,7 @@ Fixed-time traffic signal controller.
 Simple baseline using predetermined cycle times.
 """
 
+from typing import Optional
 from control.signal_phases import SignalPhaseController, PhaseType
 from control.safety_validator import SafetyValidator
 
@@ -40,13 +41,16 @@ class FixedTimeController:
         
         print(f"✓ Fixed-time controller initialized (NS:{ns_green_time}s, EW:{ew_green_time}s)")
     
-    def update(self, intersection_state, current_time: float) -> str:
+    def update(self, intersection_state, current_time: float,
+               dt: Optional[float] = None) -> str:
         """
         Update signal state (fixed-time logic)
         
         Args:
             intersection_state: Current traffic state (ignored for fixed-time)
             current_time: Current simulation time
+            dt: Seconds since the previous update (unused - schedule is
+                driven by current_time)
             
         Returns:
             SUMO signal state string
@@ -5,6 +5,8 @@ Acts as arbiter between normal operation and emergency preemption.
 Day 3: Uses clean circuit breaker pattern with emergency controller.
 """
 
+from typing import Optional
+
 from control.adaptive_controller import AdaptiveController
 from control.emergency_priority import EmergencyPriorityController
 from control.signal_phases import PhaseType, SignalPhaseController
@@ -49,13 +51,15 @@ class IntegratedSignalController:
         
         print("✓ Integrated signal controller initialized")
     
-    def update(self, intersection_state, current_time: float) -> str:
+    def update(self, intersection_state, current_time: float,
+               dt: Optional[float] = None) -> str:
         """
         Update signal control with emergency priority.
         
         Args:
             intersection_state: Current traffic state (IntersectionState)
             current_time: Simulation time (seconds)
+            dt: Seconds since the previous update (passed to adaptive control)
             
         Returns:
             SUMO signal state string (12 characters)
@@ -88,7 +92,7 @@ class IntegratedSignalController:
                 print(f"✓  RETURNING TO NORMAL MODE")
                 self.in_emergency_mode = False
             
-            return self.adaptive_controller.update(intersection_state, current_time)
+            return self.adaptive_controller.update(intersection_state, current_time, dt)
     
     def get_status(self) -> dict:
         """Get controller status for monitoring"""
@@ -9,6 +9,8 @@ sys.path.insert(0, str(project_root))
 
 from simulation.sumo_interface import SUMOInterface
 from perception.ground_truth_perception import GroundTruthPerception
+from perception.meso_perception import MesoPerception
+from perception.lane_aggregate_adapter import LaneAggregatePerceptionAdapter
 from perception.lane_mapper import LaneMapper
 from state_estimation.state_estimator import TrafficStateEstimator
 from control.fixed_time_controller import FixedTimeController
@@ -16,16 +18,76 @@ from control.adaptive_controller import AdaptiveController
 from control.signal_controller import IntegratedSignalController
 from evaluation.metrics import MetricsCollector, PerformanceMetrics
 from evaluation.scenarios import TrafficScenario
-from typing import List
+from evaluation.snapshots import SnapshotCache
+from evaluation.route_compiler import compile_scenario_routes
+from simulation.scheduler import MultiRateScheduler, DEFAULT_STAGE_RATES, MESO_STAGE_RATES
+from simulation.trace import TraceRecorder
+from simulation.signal_actuator import SignalActuator
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
 import time
 
 
 class TrafficControlEvaluator:
     """Evaluates traffic control systems across multiple scenarios"""
     
-    def __init__(self, config_file: str, intersection_config: str):
+    def __init__(self, config_file: str, intersection_config: str,
+                 backend: str = 'traci',
+                 snapshot_dir: Optional[str] = None,
+                 stage_rates: Optional[Dict[str, float]] = None,
+                 pipelined: bool = False,
+                 actuation_delay: Optional[int] = None,
+                 mesoscopic: bool = False,
+                 lane_aggregates: bool = False):
+        """
+        Args:
+            config_file: Path to sumo.cfg
+            intersection_config: Path to intersection_config.yaml
+            backend: SUMO backend for every run ('traci' or 'libsumo')
+            snapshot_dir: Where warm-start snapshots are cached
+                (default: <project>/cache/snapshots)
+            stage_rates: Loop rates in Hz for 'sumo', 'state_estimation',
+                'control' and 'metrics' (missing keys use DEFAULT_STAGE_RATES)
+            pipelined: Run perception/estimation/control/metrics for step t
+                in a worker thread while SUMO advances to t+1
+            actuation_delay: SUMO steps between the observation a signal
+                command is based on and its application (default: 0 serial,
+                1 pipelined; pipelined mode requires >= 1)
+            mesoscopic: Fast screening mode - SUMO's mesoscopic model at
+                1 s steps (MESO_STAGE_RATES unless stage_rates override),
+                perception from edge aggregates instead of vehicles
+            lane_aggregates: Measure lane states from SUMO lane
+                subscriptions (LaneAggregatePerceptionAdapter) instead of
+                perceiving and tracking every vehicle
+        """
+        if actuation_delay is None:
+            actuation_delay = 1 if pipelined else 0
+        if actuation_delay < (1 if pipelined else 0):
+            raise ValueError(
+                f"actuation_delay must be >= {1 if pipelined else 0} "
+                f"{'in pipelined mode ' if pipelined else ''}(got {actuation_delay})"
+            )
+        if mesoscopic and lane_aggregates:
+            raise ValueError("Mesoscopic runs have no lane aggregates; "
+                             "use either mesoscopic or lane_aggregates")
+        
         self.config_file = config_file
         self.intersection_config = intersection_config
+        self.backend = backend
+        base_rates = MESO_STAGE_RATES if mesoscopic else DEFAULT_STAGE_RATES
+        self.stage_rates = {**base_rates, **(stage_rates or {})}
+        self.pipelined = pipelined
+        self.actuation_delay = actuation_delay
+        self.mesoscopic = mesoscopic
+        self.lane_aggregates = lane_aggregates
+        self.snapshot_dir = snapshot_dir or str(project_root / "cache" / "snapshots")
+        # Warm-ups step like the runs that load them (one cache serves
+        # evaluate_controller and evaluate_parallel's snapshot prebuild)
+        self.snapshots = SnapshotCache(config_file, self.snapshot_dir, backend=backend,
+                                       mesoscopic=mesoscopic,
+                                       step_length=1.0 / self.stage_rates['sumo'])
         
         # Setup components (initialized per run)
         self.lane_ids = [f"{a}_in_{i}" for a in ['N', 'S', 'E', 'W'] for i in range(3)]
@@ -34,19 +96,44 @@ class TrafficControlEvaluator:
                           controller,
                           controller_name: str,
                           scenario: TrafficScenario,
-                          verbose: bool = True) -> PerformanceMetrics:
+                          verbose: bool = True,
+                          port: int = 8813,
+                          seed: Optional[int] = None,
+                          warmup: float = 0.0,
+                          trace_path: Optional[str] = None) -> PerformanceMetrics:
         """
         Evaluate a controller on a scenario
         
+        With warmup > 0 the run starts from a cached snapshot of the network
+        after `warmup` seconds of SUMO's own signal program. Time seen by
+        perception, control, metrics and emergency spawns is measured from
+        the start of the evaluated period, so controllers behave as in a
+        cold start and scenario timings keep their meaning.
+        
         Args:
             controller: Controller instance
             controller_name: Name for logging
             scenario: Traffic scenario to run
             verbose: Print progress
+            port: TraCI port for this run's SUMO instance
+            seed: SUMO random seed (None = random run; required for warmup)
+            warmup: Warm-up seconds to skip via snapshot (0 = cold start)
+            trace_path: Record every SUMO step's vehicles to this trace
+                file for offline replay (None = no recording)
             
         Returns:
             PerformanceMetrics object
         """
+        if trace_path is not None and (self.mesoscopic or self.lane_aggregates):
+            raise ValueError("Trace recording needs vehicle positions; "
+                             "not available with aggregate perception")
+        
+        snapshot = None
+        if warmup > 0:
+            snapshot = self.snapshots.get_or_create(
+                scenario, seed, warmup, port=port, verbose=verbose
+            )
+        
         if verbose:
             print(f"\n{'='*70}")
             print(f"Evaluating: {controller_name}")
@@ -55,26 +142,87 @@ class TrafficControlEvaluator:
             print(f"{'='*70}\n")
         
         # Initialize simulation
-        sumo = SUMOInterface(self.config_file, use_gui=False)
-        sumo.start()
+        # Multi-rate loop: SUMO steps at the base rate, other stages run
+        # when due and receive the elapsed time since their previous run
+        scheduler = MultiRateScheduler(
+            base_rate=self.stage_rates['sumo'],
+            rates={k: v for k, v in self.stage_rates.items() if k != 'sumo'}
+        )
+        
+        # Scenario demand (flow_multiplier, directional_bias, demand_profile)
+        route_file = compile_scenario_routes(self.config_file, scenario, warmup=warmup)
+        sumo = SUMOInterface(self.config_file, use_gui=False, backend=self.backend,
+                             step_length=scheduler.step_length, route_file=route_file,
+                             use_subscriptions=not (self.mesoscopic or self.lane_aggregates),
+                             mesoscopic=self.mesoscopic)
+        sumo.start(port=port, seed=seed,
+                   state_file=str(snapshot) if snapshot is not None else None)
+        run_start = sumo.get_current_time()
         
-        # Perception and state estimation
-        lane_mapper = LaneMapper(self.intersection_config)
-        perception = GroundTruthPerception(lane_mapper)
-        state_estimator = TrafficStateEstimator(self.lane_ids, enable_smoothing=True)
+        # Perception, state estimation, control and metrics for one step.
+        # observe(t) runs on the main thread (it talks to SUMO); perceive
+        # runs in the loop and turns the observation into estimator input.
+        if self.mesoscopic:
+            # Meso vehicles have no positions: perceive edge aggregates
+            perception = MesoPerception(sumo.get_primary_intersection())
+            sumo.subscribe_edges(perception.incoming_edges)
+            observe = lambda t: sumo.get_edge_aggregates()
+            perceive = perception.process_edge_aggregates
+        elif self.lane_aggregates:
+            # Lane states are measured directly; nothing left to perceive
+            perception = LaneAggregatePerceptionAdapter(sumo)
+            observe = perception.perceive_lane_states
+            perceive = lambda lane_states: lane_states
+        else:
+            perception = GroundTruthPerception(LaneMapper(self.intersection_config))
+            observe = lambda t: sumo.get_vehicle_frame()
+            perceive = perception.process_vehicle_frame
         
-        # Metrics collector
-        metrics_collector = MetricsCollector(controller_name)
+        loop = _ControlLoop(
+            perception=perception,
+            state_estimator=TrafficStateEstimator(self.lane_ids, enable_smoothing=True),
+            controller=controller,
+            metrics_collector=MetricsCollector(controller_name),
+            perceive=perceive
+        )
         
         # Track emergency spawns
         spawned_emergencies = set()
         
+        recorder = None
+        if trace_path is not None:
+            recorder = TraceRecorder(trace_path, sumo.intersection_pos,
+                                     step_length=sumo.step_length)
+        
+        # Only changed signal states reach SUMO (it holds the last one)
+        actuator = SignalActuator(sumo)
+        
+        # Signal commands wait here until their actuation step:
+        # (apply_after_step, signal_state, observation perf_counter)
+        pending_commands = deque()
+        decision_latencies = []
+        
+        # Pipelined mode: a single worker runs the loop stages for step t
+        # while the main thread advances SUMO to t+1 (TraCI stays on the
+        # main thread). The worker's command is therefore at least one
+        # step late, which actuation_delay accounts for.
+        worker = ThreadPoolExecutor(max_workers=1) if self.pipelined else None
+        in_flight = None  # (future, step, observation perf_counter)
+        
+        def queue_command(signal_state, step, observed_at):
+            if signal_state is not None:
+                pending_commands.append(
+                    (step + self.actuation_delay, signal_state, observed_at)
+                )
+        
         try:
-            steps = int(scenario.duration * 10)  # 0.1s per step
+            steps = int(round(scenario.duration / scheduler.step_length))
+            wall_start = time.perf_counter()
             
             for step in range(steps):
                 sumo.step()
-                current_time = sumo.get_current_time()
+                current_time = round(sumo.get_current_time() - run_start, 6)
+                due = scheduler.tick()
                 
                 # Spawn emergency vehicles
                 for event in scenario.emergency_events:
@@ -88,39 +236,66 @@ class TrafficControlEvaluator:
                         )
                         spawned_emergencies.add(event_key)
                 
-                # Perception
-                sumo_vehicles = sumo.get_all_vehicles()
-                perceived = perception.process_sumo_vehicles(sumo_vehicles)
+                observation = None
+                if recorder is not None:
+                    observation = sumo.get_vehicle_frame()
+                    recorder.record(current_time, observation)
                 
-                # State estimation
-                intersection_state = state_estimator.update(perceived, current_time)
+                if 'state_estimation' in due and observation is None:
+                    observation = observe(current_time)
+                observed_at = time.perf_counter()
                 
-                # Control
-                signal_state = controller.update(intersection_state, current_time)
-                sumo.set_traffic_light_state(signal_state)
+                # Collect the previous step's command before queuing this one
+                if in_flight is not None:
+                    future, prev_step, prev_observed = in_flight
+                    queue_command(future.result(), prev_step, prev_observed)
+                    in_flight = None
                 
-                # Get controller status (for emergency tracking)
-                controller_status = None
-                if hasattr(controller, 'get_status'):
-                    controller_status = controller.get_status()
+                if due:
+                    if worker is not None:
+                        in_flight = (
+                            worker.submit(loop.process, observation, current_time, due),
+                            step, observed_at
+                        )
+                    else:
+                        queue_command(loop.process(observation, current_time, due),
+                                      step, observed_at)
                 
-                # Collect metrics
-                metrics_collector.update(
-                    intersection_state,
-                    signal_state,
-                    current_time,
-                    controller_status
-                )
+                # Apply commands whose actuation step has come
+                while pending_commands and pending_commands[0][0] <= step:
+                    _, signal_state, command_observed = pending_commands.popleft()
+                    actuator.command(signal_state)
+                    decision_latencies.append(time.perf_counter() - command_observed)
+                actuator.flush(current_time)
                 
                 # Progress reporting
-                if verbose and step % 100 == 0:
+                if verbose and step % 100 == 0 and loop.intersection_state is not None:
                     progress = (step / steps) * 100
                     print(f"  Progress: {progress:5.1f}% | "
                           f"t={current_time:6.1f}s | "
-                          f"Vehicles: {intersection_state.total_vehicles:3d}")
+                          f"Vehicles: {loop.intersection_state.total_vehicles:3d}")
+            
+            if in_flight is not None:
+                in_flight[0].result()
+            wall_time = time.perf_counter() - wall_start
+            
+            if recorder is not None:
+                recorder.close()
+                if verbose:
+                    print(f"\n  ✓ Trace saved: {trace_path} ({len(recorder)} steps)")
             
             # Finalize metrics
-            metrics = metrics_collector.finalize(scenario.duration)
+            metrics = loop.metrics_collector.finalize(scenario.duration)
+            metrics.wall_time = wall_time
+            metrics.steps_per_second = steps / wall_time if wall_time > 0 else 0.0
+            metrics.pipelined = self.pipelined
+            metrics.mesoscopic = self.mesoscopic
+            metrics.actuation_delay = self.actuation_delay * scheduler.step_length
+            metrics.signal_commands = sum(actuator.command_counts.values())
+            metrics.signal_writes = sum(actuator.write_counts.values())
+            if decision_latencies:
+                metrics.avg_decision_latency = float(np.mean(decision_latencies))
+                metrics.max_decision_latency = float(np.max(decision_latencies))
             
             if verbose:
                 print(f"\n  ✓ Completed {controller_name} on {scenario.name}")
@@ -129,8 +304,99 @@ class TrafficControlEvaluator:
             return metrics
             
         finally:
+            if worker is not None:
+                worker.shutdown(wait=True)
             sumo.close()
     
+    def evaluate_parallel(self,
+                          scenarios: List[TrafficScenario],
+                          controller_factory: Callable[[], List[Tuple[object, str]]],
+                          max_workers: Optional[int] = None,
+                          base_seed: int = 42,
+                          base_port: int = 8813,
+                          verbose: bool = True,
+                          warmup: float = 0.0) -> Dict[str, Dict[str, PerformanceMetrics]]:
+        """
+        Evaluate every (scenario, controller) pair on a process pool
+        
+        Each run gets its own SUMO instance on a dedicated TraCI port
+        (base_port + run index; unused with libsumo). All controllers on a
+        scenario share one seed, so they face identical demand.
+        
+        Args:
+            scenarios: Scenarios to run
+            controller_factory: Returns fresh [(controller, name), ...];
+                called once per scenario so no state leaks between runs
+            max_workers: Pool size (None = os.cpu_count())
+            base_seed: Seed for first scenario (scenario i uses base_seed + i)
+            base_port: First TraCI port to allocate
+            verbose: Print per-run completion
+            warmup: Warm-up seconds; snapshots are built once per scenario
+                before the controller runs are dispatched
+            
+        Returns:
+            {scenario_name: {controller_name: PerformanceMetrics}}
+        """
+        jobs = []
+        for scenario_idx, scenario in enumerate(scenarios):
+            for controller, name in controller_factory():
+                jobs.append({
+                    'controller': controller,
+                    'controller_name': name,
+                    'scenario': scenario,
+                    'seed': base_seed + scenario_idx,
+                    'port': base_port + len(jobs),
+                    'warmup': warmup
+                })
+        
+        if verbose:
+            print(f"\nDispatching {len(jobs)} runs "
+                  f"({len(scenarios)} scenarios, backend={self.backend})")
+        
+        results = {scenario.name: {} for scenario in scenarios}
+        start = time.time()
+        
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            if warmup > 0:
+                # One warm-up per scenario; every controller run then loads it
+                warmup_futures = [
+                    pool.submit(
+                        self.snapshots.get_or_create,
+                        scenario, base_seed + scenario_idx, warmup,
+                        base_port + len(jobs) + scenario_idx, False
+                    )
+                    for scenario_idx, scenario in enumerate(scenarios)
+                ]
+                for future in warmup_futures:
+                    future.result()
+                
+                if verbose:
+                    print(f"  ✓ Warm-up snapshots ready ({time.time() - start:.1f}s)")
+            
+            futures = {
+                pool.submit(_run_evaluation_job, self, job): job
+                for job in jobs
+            }
+            
+            for future in as_completed(futures):
+                job = futures[future]
+                metrics = future.result()
+                results[job['scenario'].name][job['controller_name']] = metrics
+                
+                if verbose:
+                    print(f"  ✓ {job['controller_name']:20s} on "
+                          f"{job['scenario'].name:20s} "
+                          f"({time.time() - start:6.1f}s elapsed)")
+        
+        # Preserve controller order from the factory
+        ordered = {}
+        for scenario in scenarios:
+            names = [j['controller_name'] for j in jobs
+                     if j['scenario'] is scenario]
+            ordered[scenario.name] = {n: results[scenario.name][n] for n in names}
+        
+        return ordered
+    
     def _print_metrics_summary(self, metrics: PerformanceMetrics):
         """Print summary of metrics"""
         print(f"\n  Results:")
@@ -141,3 +407,101 @@ class TrafficControlEvaluator:
         if metrics.emergency_count > 0:
             print(f"    Emergency Events:     {metrics.emergency_count:8d}")
             print(f"    Avg Preemption Time:  {metrics.avg_emergency_preemption_duration:8.2f}s")
+        print(f"    Loop Mode:            {'pipelined' if metrics.pipelined else 'serial':>8s}")
+        print(f"    Traffic Model:        {'meso' if metrics.mesoscopic else 'micro':>8s}")
+        print(f"    Steps/s:              {metrics.steps_per_second:8.1f} "
+              f"({metrics.wall_time:.1f}s wall)")
+        print(f"    Actuation Delay:      {metrics.actuation_delay:8.2f}s sim")
+        print(f"    Signal Writes:        {metrics.signal_writes:8d} "
+              f"of {metrics.signal_commands} commands")
+        print(f"    Decision Latency:     {metrics.avg_decision_latency * 1000:8.2f}ms avg "
+              f"/ {metrics.max_decision_latency * 1000:.2f}ms max")
+
+
+class _ControlLoop:
+    """
+    Per-step pipeline stages after SUMO: perception, state estimation,
+    control and metrics. Holds the latest outputs between multi-rate ticks.
+    
+    Only touched by one thread at a time - the main thread in serial mode,
+    the single worker in pipelined mode.
+    """
+    
+    def __init__(self, perception, state_estimator, controller, metrics_collector,
+                 perceive: Optional[Callable] = None):
+        """
+        Args:
+            perception: Perception object (process_vehicle_frame by default)
+            perceive: Observation -> PerceivedFrame (None =
+                perception.process_vehicle_frame)
+        """
+        self.perception = perception
+        self.perceive = perceive or perception.process_vehicle_frame
+        self.state_estimator = state_estimator
+        self.controller = controller
+        self.metrics_collector = metrics_collector
+        
+        self.intersection_state = None
+        self.signal_state = None
+        self.controller_status = None
+    
+    def process(self, observation, current_time: float,
+                due: Dict[str, float]) -> Optional[str]:
+        """
+        Run the stages due this step
+        
+        Args:
+            observation: What perceive() consumes - a VehicleFrame,
+                EdgeAggregates in mesoscopic mode or lane states with
+                lane-aggregate perception (None if not due)
+            current_time: Simulation time (seconds)
+            due: Stages due and their dt, from MultiRateScheduler.tick()
+        
+        Returns:
+            New signal state if control ran, else None
+        """
+        command = None
+        
+        # Perception + state estimation (columnar - no per-vehicle objects)
+        if 'state_estimation' in due:
+            perceived = self.perceive(observation)
+            self.intersection_state = self.state_estimator.update(
+                perceived, current_time, dt=due['state_estimation']
+            )
+        
+        # Control
+        if 'control' in due:
+            command = self.controller.update(
+                self.intersection_state, current_time, dt=due['control']
+            )
+            self.signal_state = command
+            
+            # Get controller status (for emergency tracking)
+            if hasattr(self.controller, 'get_status'):
+                self.controller_status = self.controller.get_status()
+        
+        # Collect metrics
+        if 'metrics' in due:
+            self.metrics_collector.update(
+                self.intersection_state,
+                self.signal_state,
+                current_time,
+                self.controller_status,
+                dt=due['metrics']
+            )
+        
+        return command
+
+
+def _run_evaluation_job(evaluator: TrafficControlEvaluator,
+                        job: dict) -> PerformanceMetrics:
+    """Process pool entry point: run one (scenario, controller) pair"""
+    return evaluator.evaluate_controller(
+        job['controller'],
+        job['controller_name'],
+        job['scenario'],
+        verbose=False,
+        port=job['port'],
+        seed=job['seed'],
+        warmup=job['warmup']
+    )
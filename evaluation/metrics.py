@@ -3,7 +3,7 @@ Comprehensive metrics collection for traffic control evaluation.
 """
 
 import numpy as np
-from typing import Dict, List
+from typing import Dict, List, Optional
 from dataclasses import dataclass, field
 
 
@@ -35,6 +35,17 @@ class PerformanceMetrics:
     avg_emergency_response_time: float = 0.0
     avg_emergency_preemption_duration: float = 0.0
     
+    # Runtime metrics (filled in by the evaluator)
+    wall_time: float = 0.0
+    steps_per_second: float = 0.0
+    pipelined: bool = False
+    mesoscopic: bool = False
+    actuation_delay: float = 0.0       # simulated seconds
+    avg_decision_latency: float = 0.0  # wall seconds, observation -> signal applied
+    max_decision_latency: float = 0.0
+    signal_commands: int = 0           # signal states returned by the controller
+    signal_writes: int = 0             # of those, changes actually sent to SUMO
+    
     # Per-approach metrics
     approach_metrics: Dict[str, Dict] = field(default_factory=dict)
     
@@ -43,13 +54,22 @@ class PerformanceMetrics:
 
 
 class MetricsCollector:
-    """Collects and computes traffic control performance metrics"""
+    """
+    Collects and computes traffic control performance metrics
+    
+    Samples may arrive at any rate. Averages are per sample; totals are
+    weighted by each sample's dt relative to REFERENCE_DT, so they match
+    what 10 Hz sampling would have produced.
+    """
+    
+    REFERENCE_DT = 0.1  # seconds - sampling interval totals are expressed in
     
     def __init__(self, controller_name: str):
         self.controller_name = controller_name
         
         # Time series storage
         self.time = []
+        self.sample_dt = []
         self.total_waiting_time = []
         self.total_stopped = []
         self.total_vehicles = []
@@ -71,11 +91,17 @@ class MetricsCollector:
         self.vehicles_exited = set()
     
     def update(self, intersection_state, signal_state: str, current_time: float,
-               controller_status: dict = None):
-        """Update metrics with current state"""
+               controller_status: dict = None, dt: Optional[float] = None):
+        """
+        Update metrics with current state
+        
+        Args:
+            dt: Seconds covered by this sample (None = REFERENCE_DT)
+        """
         
         # Time series
         self.time.append(current_time)
+        self.sample_dt.append(self.REFERENCE_DT if dt is None else dt)
         
         # Waiting time (sum of all vehicles * their waiting time)
         total_wait = sum(
@@ -120,7 +146,11 @@ class MetricsCollector:
         
         # Basic statistics
         avg_waiting = np.mean(self.total_waiting_time) if self.total_waiting_time else 0.0
-        total_wait = np.sum(self.total_waiting_time) if self.total_waiting_time else 0.0
+        if self.total_waiting_time:
+            weights = np.asarray(self.sample_dt) / self.REFERENCE_DT
+            total_wait = float(np.dot(self.total_waiting_time, weights))
+        else:
+            total_wait = 0.0
         
         avg_stopped = np.mean(self.total_stopped) if self.total_stopped else 0.0
         avg_vehicles = np.mean(self.total_vehicles) if self.total_vehicles else 0.0
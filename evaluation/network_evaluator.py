@@ -0,0 +1,207 @@
+"""
+Evaluation on networks with many signalized intersections.
+
+Every traffic light discovered in the net file gets its own perception,
+state estimation, controller and metrics pipeline. All pipelines share one
+SUMO instance: one simulation step and one bulk vehicle query per step,
+partitioned between intersections by incoming lane.
+"""
+
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from simulation.sumo_interface import SUMOInterface
+from simulation.intersections import IntersectionIndex
+from simulation.signal_actuator import SignalActuator
+from simulation.scheduler import MultiRateScheduler, DEFAULT_STAGE_RATES
+from perception.intersection_perception import IntersectionPerception
+from state_estimation.state_estimator import TrafficStateEstimator
+from evaluation.evaluator import _ControlLoop
+from evaluation.metrics import MetricsCollector, PerformanceMetrics
+from evaluation.scenarios import TrafficScenario
+from evaluation.route_compiler import compile_scenario_routes
+from typing import Callable, Dict, Optional
+import numpy as np
+import time
+
+
+class NetworkEvaluator:
+    """Evaluates one controller type on every intersection of a network"""
+
+    def __init__(self, config_file: str, backend: str = 'traci',
+                 stage_rates: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            config_file: Path to sumo.cfg (network.net.xml next to it)
+            backend: SUMO backend ('traci' or 'libsumo')
+            stage_rates: Loop rates in Hz (missing keys use DEFAULT_STAGE_RATES)
+        """
+        self.config_file = config_file
+        self.backend = backend
+        self.stage_rates = {**DEFAULT_STAGE_RATES, **(stage_rates or {})}
+
+    def evaluate(self,
+                 controller_factory: Callable[[], object],
+                 controller_name: str,
+                 scenario: TrafficScenario,
+                 verbose: bool = True,
+                 port: int = 8813,
+                 seed: Optional[int] = None) -> Dict[str, PerformanceMetrics]:
+        """
+        Run one controller per intersection for the scenario duration
+
+        Args:
+            controller_factory: Returns a fresh controller; called once per TLS
+            controller_name: Name for logging / metrics
+            scenario: Duration, demand and emergency events (emergency
+                routes must exist in this network)
+            verbose: Print progress
+            port: TraCI port
+            seed: SUMO random seed (None = random run)
+
+        Returns:
+            {tls_id: PerformanceMetrics} in sorted TLS order
+        """
+        scheduler = MultiRateScheduler(
+            base_rate=self.stage_rates['sumo'],
+            rates={k: v for k, v in self.stage_rates.items() if k != 'sumo'}
+        )
+
+        sumo = SUMOInterface(self.config_file, use_gui=False, backend=self.backend,
+                             step_length=scheduler.step_length,
+                             route_file=compile_scenario_routes(self.config_file, scenario))
+        intersections = sumo.get_intersections()
+        index = IntersectionIndex(intersections)
+
+        if verbose:
+            print(f"\n{'='*70}")
+            print(f"Evaluating: {controller_name} on {len(intersections)} intersections")
+            print(f"Scenario: {scenario.name} - {scenario.description}")
+            print(f"Duration: {scenario.duration}s")
+            print(f"{'='*70}\n")
+
+        # One pipeline per TLS; track IDs are shared along the network
+        track_id_map: Dict[str, int] = {}
+        loops = [
+            _ControlLoop(
+                perception=IntersectionPerception(intersection, track_id_map),
+                state_estimator=TrafficStateEstimator(
+                    intersection.local_lane_ids, enable_smoothing=True
+                ),
+                controller=controller_factory(),
+                metrics_collector=MetricsCollector(controller_name)
+            )
+            for intersection in intersections
+        ]
+
+        sumo.start(port=port, seed=seed)
+        spawned_emergencies = set()
+        
+        # Change-only signal writes, sent once per step for all TLS
+        actuator = SignalActuator(sumo)
+
+        try:
+            steps = int(round(scenario.duration / scheduler.step_length))
+            no_vehicles = [None] * len(intersections)
+            wall_start = time.perf_counter()
+
+            for step in range(steps):
+                sumo.step()
+                current_time = sumo.get_current_time()
+                due = scheduler.tick()
+
+                # Spawn emergency vehicles
+                for event in scenario.emergency_events:
+                    event_key = f"{event.spawn_time}_{event.route}"
+                    if current_time >= event.spawn_time and event_key not in spawned_emergencies:
+                        if verbose:
+                            print(f"\n🚨 Spawning {event.vehicle_type} at t={current_time:.1f}s")
+                        sumo.add_emergency_vehicle(
+                            route_id=event.route,
+                            vtype=event.vehicle_type
+                        )
+                        spawned_emergencies.add(event_key)
+
+                if not due:
+                    continue
+
+                # One bulk query, split by incoming lane
+                sub_frames = no_vehicles
+                if 'state_estimation' in due:
+                    vehicle_frame = sumo.get_vehicle_frame()
+                    rows = index.partition(vehicle_frame.lane_ids)
+                    sub_frames = [vehicle_frame.take(r) for r in rows[:len(intersections)]]
+
+                for intersection, loop, sub_frame in zip(intersections, loops, sub_frames):
+                    command = loop.process(sub_frame, current_time, due)
+                    if command is not None:
+                        actuator.command(intersection.to_sumo_state(command),
+                                         intersection.tls_id)
+                actuator.flush(current_time)
+
+                # Progress reporting
+                if verbose and step % 100 == 0:
+                    total = sum(l.intersection_state.total_vehicles for l in loops
+                                if l.intersection_state is not None)
+                    print(f"  Progress: {(step / steps) * 100:5.1f}% | "
+                          f"t={current_time:6.1f}s | "
+                          f"Vehicles at signals: {total:4d}")
+
+            wall_time = time.perf_counter() - wall_start
+
+            results = {}
+            for intersection, loop in zip(intersections, loops):
+                metrics = loop.metrics_collector.finalize(scenario.duration)
+                metrics.wall_time = wall_time
+                metrics.steps_per_second = steps / wall_time if wall_time > 0 else 0.0
+                metrics.signal_commands = actuator.command_counts[intersection.tls_id]
+                metrics.signal_writes = actuator.write_counts[intersection.tls_id]
+                results[intersection.tls_id] = metrics
+
+            if verbose:
+                print(f"\n  ✓ Completed {controller_name} on {scenario.name}")
+                self.print_summary(results)
+
+            return results
+
+        finally:
+            sumo.close()
+
+    @staticmethod
+    def summarize(results: Dict[str, PerformanceMetrics]) -> dict:
+        """Network-level aggregates over per-intersection metrics"""
+        metrics = list(results.values())
+        if not metrics:
+            return {}
+
+        return {
+            'intersections': len(metrics),
+            'avg_waiting_time': float(np.mean([m.avg_waiting_time for m in metrics])),
+            'avg_queue_length': float(np.mean([m.avg_queue_length for m in metrics])),
+            'max_queue_length': float(np.max([m.max_queue_length for m in metrics])),
+            'avg_stopped_vehicles': float(np.sum([m.avg_stopped_vehicles for m in metrics])),
+            'total_phase_changes': int(np.sum([m.total_phase_changes for m in metrics])),
+            'signal_commands': int(np.sum([m.signal_commands for m in metrics])),
+            'signal_writes': int(np.sum([m.signal_writes for m in metrics])),
+            'wall_time': metrics[0].wall_time,
+            'steps_per_second': metrics[0].steps_per_second
+        }
+
+    def print_summary(self, results: Dict[str, PerformanceMetrics]):
+        """Print per-intersection and network summary"""
+        print(f"\n  {'TLS':<16} {'Avg wait (s)':>12} {'Avg queue (m)':>14} {'Phase chg':>10}")
+        for tls_id, m in results.items():
+            print(f"  {tls_id:<16} {m.avg_waiting_time:>12.2f} "
+                  f"{m.avg_queue_length:>14.2f} {m.total_phase_changes:>10d}")
+
+        summary = self.summarize(results)
+        if summary:
+            print(f"\n  Network ({summary['intersections']} intersections):")
+            print(f"    Avg Waiting Time:     {summary['avg_waiting_time']:8.2f}s")
+            print(f"    Avg Queue Length:     {summary['avg_queue_length']:8.2f}m")
+            print(f"    Signal Writes:        {summary['signal_writes']:8d} "
+                  f"of {summary['signal_commands']} commands")
+            print(f"    Steps/s:              {summary['steps_per_second']:8.1f} "
+                  f"({summary['wall_time']:.1f}s wall)")
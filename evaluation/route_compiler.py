@@ -0,0 +1,240 @@
+"""
+Scenario route compiler.
+
+Turns a scenario's demand settings into a route file SUMO can run:
+flow_multiplier scales every flow, directional_bias scales flows by the
+approach they enter from, and demand_profile splits each flow into
+piecewise-constant time segments. Profile times are measured from the
+start of the evaluated run, so with a warm-up they are shifted by the
+warm-up length. The compiled file is written to
+cache/routes, keyed on the base route file and the scenario's demand, so
+every run of the same demand reuses it.
+
+Scenarios with neutral demand (multiplier 1, no bias, no profile) run the
+base route file unchanged.
+
+Usage:
+    route_file = compile_scenario_routes("sumo_networks/simple_4way/sumo.cfg",
+                                         ScenarioGenerator.get_rush_hour_scenario(),
+                                         warmup=120.0)
+    sumo = SUMOInterface(config_file, route_file=route_file)
+"""
+
+import hashlib
+import json
+import os
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from evaluation.scenarios import TrafficScenario
+from simulation.geometry_cache import file_digest, load_network
+from simulation.intersections import approach_of
+
+
+# Bump when the compiled output changes for the same inputs
+ROUTE_COMPILER_VERSION = 2
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / "cache" / "routes"
+
+
+def config_route_file(config_file: str) -> str:
+    """Absolute path of the (first) route file named in a sumo.cfg"""
+    root = ET.parse(config_file).getroot()
+    element = root.find('./input/route-files')
+    if element is None:
+        raise ValueError(f"No route-files entry in {config_file}")
+
+    route_file = element.get('value').split(',')[0].strip()
+    return str((Path(config_file).parent / route_file).resolve())
+
+
+def has_neutral_demand(scenario: TrafficScenario) -> bool:
+    """True if the scenario runs the base demand unchanged"""
+    bias = scenario.directional_bias or {}
+    return (scenario.flow_multiplier == 1.0
+            and all(v == 1.0 for v in bias.values())
+            and all(m == 1.0 for _, m in (scenario.demand_profile or [])))
+
+
+def demand_key(scenario: TrafficScenario) -> dict:
+    """Scenario fields that determine the compiled demand"""
+    return {
+        'flow_multiplier': scenario.flow_multiplier,
+        'directional_bias': scenario.directional_bias,
+        'demand_profile': scenario.demand_profile
+    }
+
+
+def _profile_segments(profile: Optional[List[Tuple[float, float]]],
+                      begin: float, end: float) -> List[Tuple[float, float, float]]:
+    """Split [begin, end) into (start, stop, multiplier) pieces of the profile"""
+    if not profile:
+        return [(begin, end, 1.0)]
+
+    breakpoints = sorted(profile)
+    segments = []
+    for i, (start, multiplier) in enumerate(breakpoints):
+        stop = breakpoints[i + 1][0] if i + 1 < len(breakpoints) else float('inf')
+        if i == 0 and start > begin:
+            # Before the first breakpoint the base demand applies
+            segments.append((begin, min(start, end), 1.0))
+        lo, hi = max(start, begin), min(stop, end)
+        if lo < hi:
+            segments.append((lo, hi, multiplier))
+
+    return [s for s in segments if s[0] < s[1]]
+
+
+class _ApproachResolver:
+    """Approach ('N', 'S', 'E', 'W') a route enters the network from"""
+
+    def __init__(self, net_file: str, routes: Dict[str, List[str]]):
+        self.network = load_network(net_file)
+        self.routes = routes
+        min_x, min_y, max_x, max_y = self.network.bounds
+        self.center = ((min_x + max_x) / 2, (min_y + max_y) / 2)
+
+    def of_edge(self, edge_id: str) -> Optional[str]:
+        shape = self.network.lane_shapes.get(f"{edge_id}_0")
+        if shape is None:
+            return None
+        return approach_of(shape, self.center)
+
+    def of_flow(self, flow: ET.Element) -> Optional[str]:
+        if flow.get('from'):
+            return self.of_edge(flow.get('from'))
+
+        route = flow.get('route')
+        if route in self.routes:
+            return self.of_edge(self.routes[route][0])
+
+        inline = flow.find('route')
+        if inline is not None:
+            return self.of_edge(inline.get('edges').split()[0])
+        return None
+
+
+def _scale_flow(flow: ET.Element, factor: float):
+    """Scale a flow's rate attribute in place"""
+    if flow.get('vehsPerHour') is not None:
+        flow.set('vehsPerHour', f"{float(flow.get('vehsPerHour')) * factor:.4f}")
+    elif flow.get('period') is not None:
+        flow.set('vehsPerHour', f"{3600.0 / float(flow.get('period')) * factor:.4f}")
+        del flow.attrib['period']
+    elif flow.get('probability') is not None:
+        flow.set('probability', f"{min(1.0, float(flow.get('probability')) * factor):.6f}")
+    elif flow.get('number') is not None:
+        flow.set('number', str(int(round(int(flow.get('number')) * factor))))
+    else:
+        raise ValueError(f"Flow '{flow.get('id')}' has no rate attribute to scale")
+
+
+def compile_routes(base_route_file: str, net_file: str, scenario: TrafficScenario,
+                   output_file: str, warmup: float = 0.0):
+    """
+    Write the scenario's demand to output_file
+
+    Args:
+        base_route_file: Route file with vTypes, routes and base flows
+            (every flow needs an explicit end)
+        net_file: Network the routes run on (to resolve entry approaches)
+        scenario: Scenario with flow_multiplier / directional_bias / demand_profile
+        output_file: Destination route file
+        warmup: Warm-up seconds before the evaluated run; profile
+            breakpoints (relative to run start) are shifted by this much
+    """
+    tree = ET.parse(base_route_file)
+    root = tree.getroot()
+
+    routes = {r.get('id'): r.get('edges').split() for r in root.findall('route')}
+    resolver = _ApproachResolver(net_file, routes)
+    bias = scenario.directional_bias or {}
+    # Profile breakpoints in absolute SUMO time
+    profile = [(start + warmup, multiplier)
+               for start, multiplier in (scenario.demand_profile or [])]
+
+    # SUMO reads route files incrementally and expects departures sorted by
+    # time, so segments are re-emitted ordered by begin after the other
+    # elements (vTypes, routes)
+    pieces = []
+    for flow in [e for e in root if e.tag == 'flow']:
+        factor = scenario.flow_multiplier * bias.get(resolver.of_flow(flow), 1.0)
+        if flow.get('end') is None:
+            # The compiled file is cached on demand alone, so a default
+            # end cannot depend on the scenario's duration
+            raise ValueError(f"Flow '{flow.get('id')}' in {base_route_file} "
+                             f"needs an explicit end")
+        begin = float(flow.get('begin', 0.0))
+        end = float(flow.get('end'))
+
+        root.remove(flow)
+        segments = _profile_segments(profile, begin, end)
+        for k, (start, stop, multiplier) in enumerate(segments):
+            piece = ET.Element(flow.tag, dict(flow.attrib))
+            piece.extend(list(flow))
+            piece.tail = '\n    '
+            if len(segments) > 1:
+                piece.set('id', f"{flow.get('id')}_p{k}")
+                if piece.get('number') is not None:
+                    # Spread a fixed count over the segments by duration
+                    share = (stop - start) / (end - begin)
+                    piece.set('number', str(int(round(int(flow.get('number')) * share))))
+            piece.set('begin', f"{start:g}")
+            piece.set('end', f"{stop:g}")
+            _scale_flow(piece, factor * multiplier)
+            pieces.append((start, piece))
+
+    pieces.sort(key=lambda p: p[0])
+    root.extend(piece for _, piece in pieces)
+    if len(root):
+        root[-1].tail = '\n'
+
+    tree.write(output_file, encoding='UTF-8', xml_declaration=True)
+
+
+def compile_scenario_routes(config_file: str, scenario: TrafficScenario,
+                            cache_dir: Optional[str] = None,
+                            warmup: float = 0.0) -> str:
+    """
+    Route file for a scenario, compiled and cached on first use
+
+    Args:
+        config_file: Path to sumo.cfg (route and net file are read from it)
+        scenario: Scenario whose demand is compiled
+        cache_dir: Cache directory (default: cache/routes)
+        warmup: Warm-up seconds preceding the evaluated run (shifts the
+            demand profile)
+
+    Returns:
+        Path to the route file to run (the base file for neutral demand)
+    """
+    base_route_file = config_route_file(config_file)
+    if has_neutral_demand(scenario):
+        return base_route_file
+
+    root = ET.parse(config_file).getroot()
+    net_file = str(Path(config_file).parent / root.find('./input/net-file').get('value'))
+
+    key = json.dumps({
+        'version': ROUTE_COMPILER_VERSION,
+        'routes': file_digest(base_route_file),
+        'net': file_digest(net_file),
+        'warmup': warmup,
+        **demand_key(scenario)
+    }, sort_keys=True)
+    digest = hashlib.sha256(key.encode()).hexdigest()[:16]
+
+    cache_root = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+    name = Path(base_route_file).name.split('.')[0]
+    output = cache_root / f"{name}_{digest}.rou.xml"
+    if output.exists():
+        return str(output)
+
+    cache_root.mkdir(parents=True, exist_ok=True)
+    # Write then rename so parallel workers never read partial files
+    tmp_file = output.with_name(f".tmp{os.getpid()}_{output.name}")
+    compile_routes(base_route_file, net_file, scenario, str(tmp_file), warmup=warmup)
+    os.replace(tmp_file, output)
+
+    return str(output)
@@ -3,7 +3,7 @@ Traffic scenario generator for comprehensive testing.
 """
 
 from dataclasses import dataclass
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 
 @dataclass
@@ -25,6 +25,11 @@ class TrafficScenario:
     
     # Flow imbalance (optional)
     directional_bias: dict = None  # e.g., {'N': 1.5, 'S': 0.8, 'E': 1.0, 'W': 1.0}
+    
+    # Time-varying demand (optional): piecewise-constant (start_time, multiplier)
+    # breakpoints in seconds from the start of the evaluated run (after any
+    # warm-up), applied on top of flow_multiplier
+    demand_profile: Optional[List[Tuple[float, float]]] = None
 
 
 class ScenarioGenerator:
@@ -98,6 +103,20 @@ class ScenarioGenerator:
             directional_bias={'N': 1.5, 'S': 1.5, 'E': 0.5, 'W': 0.5}
         )
     
+    @staticmethod
+    def get_rush_hour_scenario() -> TrafficScenario:
+        """Demand ramping up to a 2x peak and back down"""
+        return TrafficScenario(
+            name="Rush Hour",
+            description="Demand ramps 1.0x -> 2.0x peak (t=120-240s) -> 1.2x, emergency at t=200s",
+            duration=360.0,
+            flow_multiplier=1.0,
+            emergency_events=[
+                EmergencyEvent(spawn_time=200.0, route="E_W", vehicle_type="ambulance")
+            ],
+            demand_profile=[(0.0, 1.0), (60.0, 1.5), (120.0, 2.0), (240.0, 1.2)]
+        )
+    
     @staticmethod
     def get_all_scenarios() -> List[TrafficScenario]:
         """Get all test scenarios"""
@@ -106,5 +125,6 @@ class ScenarioGenerator:
             ScenarioGenerator.get_single_emergency_scenario(),
             ScenarioGenerator.get_multiple_emergency_scenario(),
             ScenarioGenerator.get_peak_traffic_scenario(),
-            ScenarioGenerator.get_imbalanced_scenario()
+            ScenarioGenerator.get_imbalanced_scenario(),
+            ScenarioGenerator.get_rush_hour_scenario()
         ]
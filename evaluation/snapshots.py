@@ -0,0 +1,124 @@
+"""
+Warm-start snapshots for evaluation runs.
+
+Simulates the warm-up period (network filling under SUMO's own signal
+program) once per demand/seed, saves the SUMO state to disk, and lets every
+controller run start from that identical traffic.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+from simulation.sumo_interface import SUMOInterface
+from simulation.scheduler import DEFAULT_STAGE_RATES, MESO_STAGE_RATES
+from evaluation.scenarios import TrafficScenario
+from evaluation.route_compiler import compile_scenario_routes, demand_key
+
+
+class SnapshotCache:
+    """
+    On-disk cache of warmed-up SUMO states.
+    
+    Snapshots are keyed on everything that determines the warmed-up
+    traffic: SUMO config contents, scenario demand (flow_multiplier,
+    directional_bias, demand_profile), seed, warm-up length and SUMO step
+    length. Emergency events are not part of the key - they are spawned
+    after the warm-up.
+    """
+    
+    def __init__(self, config_file: str, cache_dir: str, backend: str = 'traci',
+                 mesoscopic: bool = False, step_length: Optional[float] = None):
+        """
+        Args:
+            config_file: Path to sumo.cfg
+            cache_dir: Directory for saved states
+            backend: SUMO backend used to create snapshots
+            mesoscopic: Warm up with the mesoscopic model (meso states are
+                cached separately from microscopic ones)
+            step_length: SUMO step length of the warm-up - the evaluated
+                runs' step length (None = the 'sumo' rate of
+                MESO_STAGE_RATES or DEFAULT_STAGE_RATES)
+        """
+        if step_length is None:
+            rates = MESO_STAGE_RATES if mesoscopic else DEFAULT_STAGE_RATES
+            step_length = 1.0 / rates['sumo']
+        
+        self.config_file = config_file
+        self.cache_dir = Path(cache_dir)
+        self.backend = backend
+        self.mesoscopic = mesoscopic
+        self.step_length = step_length
+    
+    def snapshot_path(self, scenario: TrafficScenario, seed: int,
+                      warmup: float) -> Path:
+        """Cache path for a (demand, seed, warm-up) combination"""
+        with open(self.config_file, 'rb') as f:
+            config_digest = hashlib.sha256(f.read()).hexdigest()
+        
+        key = json.dumps({
+            'config': config_digest,
+            **demand_key(scenario),
+            'seed': seed,
+            'warmup': warmup,
+            'mesoscopic': self.mesoscopic,
+            'step_length': self.step_length
+        }, sort_keys=True)
+        digest = hashlib.sha256(key.encode()).hexdigest()[:16]
+        
+        return self.cache_dir / f"warmup_{warmup:g}s_seed{seed}_{digest}.xml.gz"
+    
+    def get_or_create(self, scenario: TrafficScenario, seed: Optional[int],
+                      warmup: float, port: int = 8813,
+                      verbose: bool = True) -> Path:
+        """
+        Return snapshot path, simulating the warm-up if not cached yet
+        
+        Args:
+            scenario: Scenario whose demand is warmed up
+            seed: SUMO seed (required - a random warm-up cannot be reused)
+            warmup: Warm-up duration in seconds
+            port: TraCI port for the warm-up run
+            verbose: Print progress
+        
+        Returns:
+            Path to saved state file
+        """
+        if seed is None:
+            raise ValueError("Warm-start snapshots require a fixed seed")
+        
+        path = self.snapshot_path(scenario, seed, warmup)
+        if path.exists():
+            if verbose:
+                print(f"✓ Using cached warm-up snapshot: {path.name}")
+            return path
+        
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        
+        if verbose:
+            print(f"Simulating {warmup:.0f}s warm-up for {scenario.name} (seed={seed})...")
+        
+        sumo = SUMOInterface(self.config_file, use_gui=False, backend=self.backend,
+                             route_file=compile_scenario_routes(self.config_file, scenario,
+                                                                 warmup=warmup),
+                             step_length=self.step_length,
+                             mesoscopic=self.mesoscopic)
+        sumo.start(port=port, seed=seed)
+        
+        try:
+            for _ in range(int(round(warmup / sumo.step_length))):
+                sumo.step()
+            
+            # Write then rename so concurrent readers never see partial files
+            tmp_path = path.with_name(f".tmp{os.getpid()}_{path.name}")
+            sumo.save_state(str(tmp_path))
+            os.replace(tmp_path, path)
+        finally:
+            sumo.close()
+        
+        if verbose:
+            print(f"✓ Saved warm-up snapshot: {path.name}")
+        
+        return path
@@ -0,0 +1,89 @@
+"""
+Benchmark SUMO backends: TraCI socket vs in-process libsumo.
+
+Runs the same control-loop workload (step + bulk vehicle query + signal
+write) on sumo_networks/simple_4way with each backend and reports
+simulation steps per second.
+
+Usage:
+    python experiments/benchmark_backends.py [--steps 3000]
+"""
+
+import sys
+import time
+from pathlib import Path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from simulation.sumo_interface import SUMOInterface, SUPPORTED_BACKENDS
+
+
+def run_benchmark(backend: str, steps: int) -> dict:
+    """Run fixed number of steps on one backend and time the loop"""
+    config_file = project_root / "sumo_networks" / "simple_4way" / "sumo.cfg"
+
+    sumo = SUMOInterface(str(config_file), use_gui=False, backend=backend)
+    sumo.start()
+
+    signal_states = ["GGGrrrGGGrrr", "rrrGGGrrrGGG"]
+    vehicle_samples = 0
+
+    try:
+        start = time.perf_counter()
+
+        for step in range(steps):
+            sumo.step()
+            vehicles = sumo.get_all_vehicles()
+            vehicle_samples += len(vehicles)
+
+            # Alternate phases every 30s of simulated time
+            sumo.set_traffic_light_state(signal_states[(step // 300) % 2])
+
+        elapsed = time.perf_counter() - start
+    finally:
+        sumo.close()
+
+    return {
+        'backend': backend,
+        'steps': steps,
+        'elapsed': elapsed,
+        'steps_per_second': steps / elapsed if elapsed > 0 else 0.0,
+        'avg_vehicles': vehicle_samples / steps if steps > 0 else 0.0
+    }
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Compare SUMO backend throughput')
+    parser.add_argument('--steps', type=int, default=3000,
+                        help='Simulation steps per backend (default: 3000 = 300s)')
+    args = parser.parse_args()
+
+    print("="*70)
+    print("SUMO BACKEND BENCHMARK")
+    print("="*70)
+
+    results = []
+    for backend in SUPPORTED_BACKENDS:
+        print(f"\nRunning {backend} ({args.steps} steps)...")
+        try:
+            results.append(run_benchmark(backend, args.steps))
+        except ImportError as e:
+            print(f"✗ Skipping {backend}: {e}")
+
+    print(f"\n{'='*70}")
+    print(f"{'Backend':<10} {'Steps/s':>10} {'Elapsed (s)':>12} {'Avg vehicles':>14}")
+    print(f"{'-'*70}")
+    for r in results:
+        print(f"{r['backend']:<10} {r['steps_per_second']:>10.1f} "
+              f"{r['elapsed']:>12.2f} {r['avg_vehicles']:>14.1f}")
+
+    if len(results) == 2 and results[0]['steps_per_second'] > 0:
+        speedup = results[1]['steps_per_second'] / results[0]['steps_per_second']
+        print(f"\nlibsumo speedup over traci: {speedup:.2f}x")
+    print(f"{'='*70}\n")
+
+
+if __name__ == "__main__":
+    main()
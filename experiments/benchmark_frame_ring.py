@@ -0,0 +1,138 @@
+"""
+Benchmark frame hand-off from a render process to a detector process.
+
+A producer process renders 1280x720 VirtualCamera frames and passes them
+to the consumer either through a multiprocessing.Queue (each frame
+pickled, piped and unpickled) or through a SharedFrameRing (rendered
+straight into shared memory, read in place). The consumer stands in for
+the detector with a cheap per-frame reduction, so the numbers isolate the
+transport cost.
+
+Usage:
+    python experiments/benchmark_frame_ring.py [--frames 300] [--vehicles 200]
+"""
+
+import sys
+import time
+import multiprocessing as mp
+from pathlib import Path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+
+from simulation.camera_interface import VirtualCamera
+from simulation.frame_ring import SharedFrameRing, FrameRingReader
+from simulation.sumo_interface import VehicleFrame
+
+
+IMAGE_SIZE = (1280, 720)
+
+
+def _vehicles(num_vehicles: int, step: int) -> VehicleFrame:
+    rng = np.random.default_rng(step)
+    return VehicleFrame.from_columns(
+        ids=[f"veh_{i}" for i in range(num_vehicles)],
+        types=['car'] * num_vehicles,
+        lane_ids=['N_in_0_0'] * num_vehicles,
+        x=rng.uniform(-140, 140, num_vehicles),
+        y=rng.uniform(-140, 140, num_vehicles),
+        speed=np.zeros(num_vehicles),
+        angle=rng.uniform(0, 360, num_vehicles),
+        waiting_time=np.zeros(num_vehicles),
+        intersection_pos=(0.0, 0.0)
+    )
+
+
+def _produce_queue(frames: int, num_vehicles: int, queue):
+    camera = VirtualCamera(image_size=IMAGE_SIZE)
+    for step in range(frames):
+        # render_frame reuses one buffer; mp.Queue pickles it later on a
+        # feeder thread, so send a copy
+        queue.put((step, camera.render_frame(_vehicles(num_vehicles, step)).copy()))
+    queue.put(None)
+
+
+def _produce_ring(frames: int, num_vehicles: int, ring: SharedFrameRing):
+    camera = VirtualCamera(image_size=IMAGE_SIZE)
+    for step in range(frames):
+        with ring.writing(timestamp=step * 0.1) as slot:
+            camera.render_frame(_vehicles(num_vehicles, step), out=slot)
+    ring.close_writer()
+    ring.close()
+
+
+def run_queue(frames: int, num_vehicles: int) -> dict:
+    """Frames through a multiprocessing.Queue (bounded, so it also blocks)"""
+    queue = mp.Queue(maxsize=8)
+    producer = mp.Process(target=_produce_queue, args=(frames, num_vehicles, queue))
+
+    start = time.perf_counter()
+    producer.start()
+    received, receive_time = 0, 0.0
+    while True:
+        t0 = time.perf_counter()
+        item = queue.get()
+        receive_time += time.perf_counter() - t0
+        if item is None:
+            break
+        item[1].mean()
+        received += 1
+    elapsed = time.perf_counter() - start
+    producer.join()
+
+    return {'received': received, 'dropped': 0, 'elapsed': elapsed,
+            'receive_time': receive_time}
+
+
+def run_ring(frames: int, num_vehicles: int, slots: int) -> dict:
+    """Frames through a SharedFrameRing (drop-oldest, never blocks the producer)"""
+    with SharedFrameRing.create((IMAGE_SIZE[1], IMAGE_SIZE[0], 3), slots=slots) as ring:
+        reader = FrameRingReader(ring)
+        producer = mp.Process(target=_produce_ring, args=(frames, num_vehicles, ring))
+
+        start = time.perf_counter()
+        producer.start()
+        receive_time = 0.0
+        while True:
+            t0 = time.perf_counter()
+            frame = reader.next()
+            receive_time += time.perf_counter() - t0
+            if frame is None:
+                break
+            frame.image.mean()
+        elapsed = time.perf_counter() - start
+        producer.join()
+
+    return {'received': reader.received, 'dropped': reader.dropped,
+            'elapsed': elapsed, 'receive_time': receive_time}
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Frame hand-off benchmark')
+    parser.add_argument('--frames', type=int, default=300,
+                        help='Frames to render (default: 300)')
+    parser.add_argument('--vehicles', type=int, default=200,
+                        help='Vehicles per frame (default: 200)')
+    parser.add_argument('--slots', type=int, default=16,
+                        help='Ring slots (default: 16)')
+    args = parser.parse_args()
+
+    print("="*70)
+    print(f"FRAME HAND-OFF: {args.frames} frames @ {IMAGE_SIZE[0]}x{IMAGE_SIZE[1]}, "
+          f"{args.vehicles} vehicles")
+    print("="*70)
+
+    for name, result in [('mp.Queue (pickled)', run_queue(args.frames, args.vehicles)),
+                         ('SharedFrameRing', run_ring(args.frames, args.vehicles,
+                                                      args.slots))]:
+        print(f"  {name:20s} {result['received'] / result['elapsed']:7.1f} frames/s | "
+              f"received {result['received']:4d}, dropped {result['dropped']:4d} | "
+              f"consumer waiting {result['receive_time'] / result['elapsed']:5.1%}")
+    print("="*70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Accuracy versus latency of the detector backends on CPU.
+
+Runs VehicleDetector with eager PyTorch, ONNX Runtime FP32 and ONNX
+Runtime INT8 over the same frames and compares them with the torch path:
+
+    latency        median ms per frame (batch 1)
+    precision/     detections matched to torch's (same class, IoU >= 0.5),
+    recall         as a fraction of the backend's / of torch's detections
+    mean IoU       of the matched boxes
+    box / score    Pearson correlation of the raw model outputs - box
+    corr.          coordinates and class scores of every anchor - with
+                   torch's; meaningful even when a frame has no detections
+
+Usage:
+    python experiments/benchmark_onnx_detector.py [--model yolov8n.pt] [--images data/synthetic_renders]
+"""
+
+import sys
+import time
+from pathlib import Path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pandas as pd
+import torch
+
+from perception.detector import VehicleDetector
+from perception.onnx_export import (
+    export_onnx, letterbox, calibration_images, DEFAULT_CALIBRATION_DIR
+)
+
+
+BACKENDS = [
+    ('torch', dict(backend='torch')),
+    ('onnx fp32', dict(backend='onnx')),
+    ('onnx int8', dict(backend='onnx', int8=True)),
+]
+
+
+def _iou(a, b) -> float:
+    ix = max(0.0, min(a[2], b[2]) - max(a[0], b[0]))
+    iy = max(0.0, min(a[3], b[3]) - max(a[1], b[1]))
+    inter = ix * iy
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def match(reference, detections, iou_threshold: float = 0.5):
+    """Greedy same-class matching by confidence; returns matched IoUs"""
+    unmatched = list(reference)
+    ious = []
+    for det in sorted(detections, key=lambda d: -d.confidence):
+        candidates = [(_iou(det.bbox, ref.bbox), i) for i, ref in enumerate(unmatched)
+                      if ref.class_id == det.class_id]
+        if candidates:
+            best, i = max(candidates)
+            if best >= iou_threshold:
+                ious.append(best)
+                unmatched.pop(i)
+    return ious
+
+
+def raw_outputs(detector: VehicleDetector, inputs):
+    """Raw (1, 4 + classes, anchors) head outputs for letterboxed inputs"""
+    if detector.backend == 'torch':
+        module = detector.model.model.eval()
+        with torch.no_grad():
+            return [module(torch.from_numpy(x))[0].numpy() for x in inputs]
+
+    import onnxruntime
+    path = export_onnx(detector.model_name, imgsz=detector.imgsz, int8=detector.int8)
+    session = onnxruntime.InferenceSession(str(path), providers=['CPUExecutionProvider'])
+    name = session.get_inputs()[0].name
+    return [session.run(None, {name: x})[0] for x in inputs]
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Detector backend accuracy vs latency')
+    parser.add_argument('--model', default='yolov8n.pt', help='YOLOv8 model (default: yolov8n.pt)')
+    parser.add_argument('--images', default=str(DEFAULT_CALIBRATION_DIR),
+                        help='Evaluation frames (default: data/synthetic_renders)')
+    parser.add_argument('--conf', type=float, default=0.3,
+                        help='Confidence threshold (default: 0.3, as PerceptionPipeline)')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Timed passes over the frames (default: 5)')
+    parser.add_argument('--imgsz', type=int, default=640, help='Inference size (default: 640)')
+    args = parser.parse_args()
+
+    frames = list(calibration_images(Path(args.images)))
+    inputs = [letterbox(frame, args.imgsz) for frame in frames]
+    output_dir = project_root / "results" / "onnx_detector"
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    results = {}
+    for label, kwargs in BACKENDS:
+        detector = VehicleDetector(model_name=args.model, device='cpu',
+                                   imgsz=args.imgsz, **kwargs)
+        detector.detect(frames[0], conf_threshold=args.conf)  # Warm up
+
+        timings = []
+        for _ in range(args.repeat):
+            for frame in frames:
+                start = time.perf_counter()
+                detections = detector.detect(frame, conf_threshold=args.conf)
+                timings.append(time.perf_counter() - start)
+
+        results[label] = {
+            'latency': float(np.median(timings)),
+            'detections': [detector.detect(f, conf_threshold=args.conf) for f in frames],
+            'raw': np.concatenate(raw_outputs(detector, inputs), axis=-1)[0]
+        }
+
+    reference = results['torch']
+    rows = []
+    for label, _ in BACKENDS:
+        r = results[label]
+        ious = [match(ref, dets) for ref, dets in zip(reference['detections'],
+                                                      r['detections'])]
+        matched = sum(len(i) for i in ious)
+        found = sum(len(d) for d in r['detections'])
+        expected = sum(len(d) for d in reference['detections'])
+        rows.append({
+            'backend': label,
+            'latency_ms': r['latency'] * 1000,
+            'speedup': reference['latency'] / r['latency'],
+            'detections': found,
+            'precision': matched / found if found else np.nan,
+            'recall': matched / expected if expected else np.nan,
+            'mean_iou': float(np.mean(np.concatenate(ious))) if matched else np.nan,
+            'box_corr': float(np.corrcoef(reference['raw'][:4].ravel(),
+                                          r['raw'][:4].ravel())[0, 1]),
+            'score_corr': float(np.corrcoef(reference['raw'][4:].ravel(),
+                                            r['raw'][4:].ravel())[0, 1]),
+        })
+
+    df = pd.DataFrame(rows)
+    csv_path = output_dir / "report.csv"
+    df.to_csv(csv_path, index=False)
+
+    print(f"\n{'='*70}")
+    print(f"DETECTOR BACKENDS: {args.model}, {len(frames)} frames, conf {args.conf}")
+    print(f"{'='*70}")
+    print(f"  {'backend':10s} {'ms/frame':>9s} {'speedup':>8s} {'dets':>5s} "
+          f"{'prec':>5s} {'recall':>6s} {'IoU':>5s} {'box corr':>9s} {'score corr':>10s}")
+    for row in rows:
+        print(f"  {row['backend']:10s} {row['latency_ms']:9.1f} {row['speedup']:7.2f}x "
+              f"{row['detections']:5d} {row['precision']:5.2f} {row['recall']:6.2f} "
+              f"{row['mean_iou']:5.2f} {row['box_corr']:9.4f} {row['score_corr']:10.4f}")
+    print(f"\n✓ Report saved: {csv_path}")
+    print(f"{'='*70}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark how the control stack scales with the number of intersections.
+
+Generates (or reuses cached) grid / corridor networks of increasing size and
+runs one adaptive controller per intersection with NetworkEvaluator,
+reporting simulation throughput and per-intersection cost.
+
+Usage:
+    python experiments/benchmark_scaling.py [--sizes 1,4,9,25,49,100]
+        [--layout grid|corridor] [--duration 120] [--backend libsumo]
+"""
+
+import io
+import sys
+import contextlib
+from pathlib import Path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from simulation.network_generator import GridSpec, generate_network
+from simulation.sumo_interface import SUPPORTED_BACKENDS
+from evaluation.network_evaluator import NetworkEvaluator
+from evaluation.scenarios import TrafficScenario
+from control.signal_controller import IntegratedSignalController
+
+
+def grid_shape(num_intersections: int, layout: str):
+    """(rows, cols) for a layout; grids use the most square factorization"""
+    if layout == 'corridor':
+        return 1, num_intersections
+    rows = max(r for r in range(1, int(num_intersections ** 0.5) + 1)
+               if num_intersections % r == 0)
+    return rows, num_intersections // rows
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Control stack scaling benchmark')
+    parser.add_argument('--sizes', default='1,4,9,25,49,100',
+                        help='Comma-separated intersection counts (default: 1,4,9,25,49,100)')
+    parser.add_argument('--layout', choices=['grid', 'corridor'], default='grid')
+    parser.add_argument('--duration', type=float, default=120.0,
+                        help='Simulated seconds per run (default: 120)')
+    parser.add_argument('--demand', type=float, default=300.0,
+                        help='veh/h per boundary entry (default: 300)')
+    parser.add_argument('--backend', choices=SUPPORTED_BACKENDS, default='traci')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(',')]
+    scenario = TrafficScenario(
+        name="Scaling", description=f"{args.layout} scaling run",
+        duration=args.duration, flow_multiplier=1.0, emergency_events=[]
+    )
+
+    print("="*70)
+    print("SCALING BENCHMARK")
+    print("="*70)
+    print(f"Layout: {args.layout} | {args.duration:.0f}s simulated | backend: {args.backend}")
+
+    rows_out = []
+    for n in sizes:
+        rows, cols = grid_shape(n, args.layout)
+        spec = GridSpec(rows=rows, cols=cols, demand=args.demand,
+                        duration=args.duration + 60.0)
+        network_dir = generate_network(spec)
+
+        print(f"\nRunning {spec.name} ({n} intersections)...")
+        evaluator = NetworkEvaluator(str(network_dir / "sumo.cfg"), backend=args.backend)
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = evaluator.evaluate(IntegratedSignalController, "Adaptive",
+                                         scenario, verbose=False, seed=args.seed)
+        summary = NetworkEvaluator.summarize(results)
+        rows_out.append((spec.name, n, summary))
+
+    print(f"\n{'='*70}")
+    print(f"{'Network':<12} {'TLS':>5} {'Steps/s':>9} {'Wall (s)':>9} "
+          f"{'RT factor':>10} {'ms/TLS/step':>12} {'Avg wait':>9}")
+    print(f"{'-'*70}")
+    for name, n, s in rows_out:
+        steps_per_second = s['steps_per_second']
+        realtime = s['wall_time'] and args.duration / s['wall_time']
+        per_tls_ms = 1000.0 / steps_per_second / n if steps_per_second > 0 else 0.0
+        print(f"{name:<12} {n:>5d} {steps_per_second:>9.1f} {s['wall_time']:>9.2f} "
+              f"{realtime:>9.1f}x {per_tls_ms:>12.3f} {s['avg_waiting_time']:>9.2f}")
+    print(f"{'='*70}\n")
+
+
+if __name__ == "__main__":
+    main()
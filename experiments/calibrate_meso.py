@@ -0,0 +1,121 @@
+"""
+Calibrate the mesoscopic fast mode against microscopic runs.
+
+Runs every controller on every scenario twice with the same seed - once
+microscopic (0.1 s steps, per-vehicle perception) and once mesoscopic
+(1 s steps, edge-aggregate perception) - and reports per-metric ratios,
+whether meso preserves the controller ranking, and the speedup. Use the
+ratios to read meso screening results; confirm finalists microscopically.
+
+Usage:
+    python experiments/calibrate_meso.py [--backend libsumo] [--workers 4]
+"""
+
+import sys
+from pathlib import Path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from itertools import combinations
+from evaluation.evaluator import TrafficControlEvaluator
+from evaluation.scenarios import ScenarioGenerator
+from simulation.sumo_interface import SUPPORTED_BACKENDS
+from experiments.final_evaluation import create_controllers
+import numpy as np
+import pandas as pd
+
+
+CALIBRATED_METRICS = ['avg_waiting_time', 'avg_queue_length',
+                      'avg_stopped_vehicles', 'total_phase_changes']
+
+
+def rank_agreement(micro: dict, meso: dict, metric: str) -> float:
+    """Fraction of controller pairs ordered the same way by both modes"""
+    pairs = list(combinations(micro, 2))
+    if not pairs:
+        return 1.0
+    agree = sum(
+        np.sign(getattr(micro[a], metric) - getattr(micro[b], metric))
+        == np.sign(getattr(meso[a], metric) - getattr(meso[b], metric))
+        for a, b in pairs
+    )
+    return agree / len(pairs)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Mesoscopic vs microscopic calibration')
+    parser.add_argument('--backend', choices=SUPPORTED_BACKENDS, default='traci',
+                        help='SUMO backend (default: traci)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Process pool size (default: CPU count)')
+    parser.add_argument('--seed', type=int, default=42,
+                        help='Seed of the first scenario (default: 42)')
+    args = parser.parse_args()
+
+    config_file = str(project_root / "sumo_networks" / "simple_4way" / "sumo.cfg")
+    intersection_config = str(project_root / "config" / "intersection_config.yaml")
+    output_dir = project_root / "results" / "meso_calibration"
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    scenarios = ScenarioGenerator.get_all_scenarios()
+
+    print("="*70)
+    print("MESOSCOPIC MODE CALIBRATION")
+    print("="*70)
+
+    results = {}
+    for mode in ('micro', 'meso'):
+        print(f"\nRunning {mode}scopic evaluations...")
+        evaluator = TrafficControlEvaluator(config_file, intersection_config,
+                                            backend=args.backend,
+                                            mesoscopic=(mode == 'meso'))
+        results[mode] = evaluator.evaluate_parallel(
+            scenarios, create_controllers, max_workers=args.workers,
+            base_seed=args.seed
+        )
+
+    rows = []
+    for scenario in scenarios:
+        micro, meso = results['micro'][scenario.name], results['meso'][scenario.name]
+        for controller_name in micro:
+            row = {'Scenario': scenario.name, 'Controller': controller_name}
+            for metric in CALIBRATED_METRICS:
+                micro_value = getattr(micro[controller_name], metric)
+                meso_value = getattr(meso[controller_name], metric)
+                row[f'{metric} micro'] = micro_value
+                row[f'{metric} meso'] = meso_value
+                row[f'{metric} ratio'] = meso_value / micro_value if micro_value else np.nan
+            row['speedup'] = (micro[controller_name].wall_time
+                              / max(meso[controller_name].wall_time, 1e-9))
+            rows.append(row)
+
+    df = pd.DataFrame(rows)
+    csv_path = output_dir / "calibration.csv"
+    df.to_csv(csv_path, index=False)
+
+    print(f"\n{'='*70}")
+    print("MESO/MICRO RATIO PER METRIC (mean ± std over all runs)")
+    print(f"{'='*70}")
+    for metric in CALIBRATED_METRICS:
+        ratios = df[f'{metric} ratio'].dropna()
+        print(f"  {metric:24s} {ratios.mean():6.2f} ± {ratios.std():5.2f}")
+    print(f"  {'wall-clock speedup':24s} {df['speedup'].mean():6.1f}x")
+
+    print(f"\n{'='*70}")
+    print("CONTROLLER RANKING AGREEMENT (fraction of concordant pairs)")
+    print(f"{'='*70}")
+    for scenario in scenarios:
+        micro, meso = results['micro'][scenario.name], results['meso'][scenario.name]
+        agreement = {m: rank_agreement(micro, meso, m)
+                     for m in ('avg_waiting_time', 'avg_queue_length')}
+        print(f"  {scenario.name:22s} wait: {agreement['avg_waiting_time']:4.2f} | "
+              f"queue: {agreement['avg_queue_length']:4.2f}")
+
+    print(f"\n✓ Calibration table saved: {csv_path}")
+    print(f"{'='*70}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -18,6 +18,11 @@ import numpy as np
 import pandas as pd
 
 
+# Scenario i runs with seed BASE_SEED + i, serially and in parallel, so
+# every controller on a scenario faces the same demand in both modes
+BASE_SEED = 42
+
+
 def create_controllers():
     """
     Factory function to create fresh controller instances.
@@ -35,7 +40,53 @@ def create_controllers():
     ]
 
 
+def run_serial(evaluator, scenarios, controller_factory=create_controllers,
+               base_seed=BASE_SEED, warmup=0.0, verbose=True):
+    """
+    Run every (scenario, controller) pair one after another in this process
+    
+    Seeds match TrafficControlEvaluator.evaluate_parallel, so both modes
+    produce the same metrics.
+    
+    Returns:
+        {scenario_name: {controller_name: PerformanceMetrics}}
+    """
+    all_results = {}
+    
+    for scenario_idx, scenario in enumerate(scenarios):
+        all_results[scenario.name] = {}
+        
+        # Create fresh controller instances for this scenario
+        # This ensures clean state - no reliance on reset()
+        for controller, name in controller_factory():
+            # No reset needed - brand new instance
+            all_results[scenario.name][name] = evaluator.evaluate_controller(
+                controller, name, scenario, verbose=verbose,
+                seed=base_seed + scenario_idx,
+                warmup=warmup
+            )
+    
+    return all_results
+
+
 def main():
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Final controller × scenario evaluation')
+    parser.add_argument('--serial', action='store_true',
+                        help='Run experiments one after another in this process')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Process pool size for parallel runs (default: CPU count)')
+    parser.add_argument('--backend', choices=['traci', 'libsumo'], default='traci',
+                        help='SUMO backend (default: traci)')
+    parser.add_argument('--warmup', type=float, default=0.0,
+                        help='Warm-up seconds simulated once per scenario and '
+                             'loaded from a snapshot for every run (default: 0)')
+    parser.add_argument('--pipelined', action='store_true',
+                        help='Overlap SUMO stepping with perception/control '
+                             '(one-step actuation delay)')
+    args = parser.parse_args()
+    
     print("="*70)
     print(" INTELLIGENT TRAFFIC LIGHT CONTROL SYSTEM")
     print(" FINAL COMPREHENSIVE EVALUATION")
@@ -48,7 +99,9 @@ def main():
     output_dir.mkdir(parents=True, exist_ok=True)
     
     # Initialize evaluator
-    evaluator = TrafficControlEvaluator(config_file, intersection_config)
+    evaluator = TrafficControlEvaluator(config_file, intersection_config,
+                                        backend=args.backend,
+                                        pipelined=args.pipelined)
     
     # Get test scenarios
     scenarios = [
@@ -61,22 +114,14 @@ def main():
     print(f"Total experiments: {3 * len(scenarios)}\n")
     
     # Run all experiments
-    all_results = {}
-    
-    for scenario in scenarios:
-        all_results[scenario.name] = {}
-        
-        # Create fresh controller instances for this scenario
-        # This ensures clean state - no reliance on reset()
-        controllers = create_controllers()
-        
-        for controller, name in controllers:
-            # No reset needed - brand new instance
-            metrics = evaluator.evaluate_controller(
-                controller, name, scenario, verbose=True
-            )
-            
-            all_results[scenario.name][name] = metrics
+    if args.serial:
+        all_results = run_serial(evaluator, scenarios, warmup=args.warmup)
+    else:
+        # One SUMO instance per (scenario, controller) pair on a process pool
+        all_results = evaluator.evaluate_parallel(
+            scenarios, create_controllers, max_workers=args.workers,
+            base_seed=BASE_SEED, warmup=args.warmup
+        )
     
     # Generate comprehensive comparison
     print(f"\n{'='*70}")
@@ -3,8 +3,12 @@ Perception module - Day 1 architecture (frozen interfaces).
 
 Exports:
     - PerceivedVehicle: Frozen output dataclass
+    - PerceivedFrame: Columnar (struct-of-arrays) perception output
+    - DetectionBatch: Columnar detector output
     - PerceptionAdapter: Abstract base for all perception implementations
     - SumoPerceptionAdapter: Ground truth perception
+    - ReplayPerceptionAdapter: Ground truth replayed from a recorded trace
+    - LaneAggregatePerceptionAdapter: Lane states from SUMO lane aggregates
     - VisionPerceptionAdapter: ML vision (Day 5)
     - LaneMapper: Lane geometry and assignment
     - EmergencyVehicleDetector: Unified emergency detection
@@ -12,10 +16,14 @@ Exports:
 
 # Frozen interfaces (Days 1-5)
 from perception.types import PerceivedVehicle
+from perception.perceived_frame import PerceivedFrame
+from perception.detection_batch import DetectionBatch
 from perception.base import PerceptionAdapter
 
 # Perception adapters
 from perception.sumo_adapter import SumoPerceptionAdapter
+from perception.replay_adapter import ReplayPerceptionAdapter
+from perception.lane_aggregate_adapter import LaneAggregatePerceptionAdapter
 from perception.vision_adapter import VisionPerceptionAdapter
 
 # Supporting modules
@@ -25,16 +33,23 @@ from perception.emergency_detection import EmergencyVehicleDetector
 # ML vision components (for Day 5 implementation)
 from perception.perception_pipeline import PerceptionPipeline
 from perception.detector import VehicleDetector
+from perception.batching_detector import BatchingDetector
+from perception.lane_roi_detector import LaneROIDetector
+from perception.keyframe_policy import KeyframePolicy
 from perception.tracker import ByteTracker
 from perception.distance_estimator import KalmanDistanceEstimator
 
 __all__ = [
     # Core interfaces
     'PerceivedVehicle',
+    'PerceivedFrame',
+    'DetectionBatch',
     'PerceptionAdapter',
     
     # Adapters
     'SumoPerceptionAdapter',
+    'ReplayPerceptionAdapter',
+    'LaneAggregatePerceptionAdapter',
     'VisionPerceptionAdapter',
     
     # Supporting
@@ -44,6 +59,9 @@ __all__ = [
     # ML components
     'PerceptionPipeline',
     'VehicleDetector',
+    'BatchingDetector',
+    'LaneROIDetector',
+    'KeyframePolicy',
     'ByteTracker',
     'KalmanDistanceEstimator',
 ]
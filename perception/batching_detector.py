@@ -0,0 +1,195 @@
+"""
+Adaptive micro-batching front end for VehicleDetector.
+
+Several cameras (or intersections) submit frames from their own threads;
+a single inference thread groups whatever is queued into one batch and
+runs it as one detect_batch() call. A batch is dispatched as soon as it
+reaches max_batch_size, or once its oldest frame has waited max_wait
+seconds - so under light load a frame waits at most max_wait, and under
+heavy load batches fill up and the per-frame model cost drops.
+
+Results go back to each caller through a concurrent.futures.Future.
+
+Usage:
+    service = BatchingDetector(VehicleDetector(device='cpu'), max_batch_size=8)
+    future = service.submit(frame)          # from any camera thread
+    detections = future.result()
+    ...
+    service.close()
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from perception.detection_batch import DetectionBatch
+
+
+@dataclass
+class _Request:
+    """A frame waiting for inference"""
+    frame: np.ndarray
+    conf_threshold: float
+    future: Future
+    submitted: float  # perf_counter
+
+
+_STOP = object()
+
+
+class BatchingDetector:
+    """
+    Detector service that batches concurrent detect requests.
+
+    detect() has the signature of VehicleDetector.detect, so it can be
+    handed to PerceptionPipeline as a shared detector.
+    """
+
+    def __init__(self, detector, max_batch_size: int = 8, max_wait: float = 0.010,
+                 conf_threshold: float = 0.3):
+        """
+        Args:
+            detector: VehicleDetector (anything with detect_batch(frames, conf_threshold))
+            max_batch_size: Largest batch passed to the model
+            max_wait: Longest time (s) the oldest queued frame waits for
+                the batch to fill
+            conf_threshold: Default confidence threshold for submit()
+        """
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be >= 1, got {max_batch_size}")
+
+        self.detector = detector
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.conf_threshold = conf_threshold
+
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()  # Orders submit() against close()
+
+        # Statistics
+        self._batches = 0
+        self._frames = 0
+        self._max_batch = 0
+        self._total_wait = 0.0
+        self._total_inference = 0.0
+
+        self._thread = threading.Thread(target=self._run, name="batching-detector",
+                                        daemon=True)
+        self._thread.start()
+
+    def submit(self, frame: np.ndarray,
+               conf_threshold: Optional[float] = None) -> Future:
+        """
+        Queue one RGB frame (H, W, 3) for detection
+
+        The frame is not copied: keep it unchanged until the future is done.
+
+        Returns:
+            Future resolving to the frame's DetectionBatch
+        """
+        future = Future()
+        request = _Request(
+            frame=frame,
+            conf_threshold=self.conf_threshold if conf_threshold is None else conf_threshold,
+            future=future,
+            submitted=time.perf_counter()
+        )
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("submit() on a closed BatchingDetector")
+            self._queue.put(request)
+        return future
+
+    def detect(self, frame: np.ndarray,
+               conf_threshold: Optional[float] = None) -> DetectionBatch:
+        """Blocking detect: submit() and wait for the result"""
+        return self.submit(frame, conf_threshold).result()
+
+    def _next_batch(self) -> Optional[List[_Request]]:
+        """Block for a first request, then gather more until full or its deadline"""
+        first = self._queue.get()
+        if first is _STOP:
+            return None
+
+        batch = [first]
+        deadline = first.submitted + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                request = (self._queue.get(timeout=remaining) if remaining > 0
+                           else self._queue.get_nowait())
+            except queue.Empty:
+                break
+            if request is _STOP:
+                self._queue.put(_STOP)  # Finish this batch, stop after it
+                break
+            batch.append(request)
+        return batch
+
+    def _run(self):
+        """Inference thread: one detect_batch() call per batch"""
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+
+            batch = [r for r in batch if r.future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            # One model call at the loosest threshold, then each request's own
+            threshold = min(r.conf_threshold for r in batch)
+            start = time.perf_counter()
+            try:
+                results = self.detector.detect_batch([r.frame for r in batch],
+                                                     conf_threshold=threshold)
+            except Exception as e:
+                for request in batch:
+                    request.future.set_exception(e)
+                continue
+            finished = time.perf_counter()
+
+            for request, detections in zip(batch, results):
+                if request.conf_threshold > threshold:
+                    detections = detections.filter_confidence(request.conf_threshold)
+                request.future.set_result(detections)
+
+            self._batches += 1
+            self._frames += len(batch)
+            self._max_batch = max(self._max_batch, len(batch))
+            self._total_wait += sum(start - r.submitted for r in batch)
+            self._total_inference += finished - start
+
+    def close(self):
+        """Finish queued requests and stop the inference thread"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def get_statistics(self) -> dict:
+        """Batching statistics for monitoring"""
+        batches = max(self._batches, 1)
+        frames = max(self._frames, 1)
+        return {
+            'batches': self._batches,
+            'frames': self._frames,
+            'avg_batch_size': self._frames / batches,
+            'max_batch_size': self._max_batch,
+            'avg_queue_wait': self._total_wait / frames,
+            'avg_inference_per_frame': self._total_inference / frames
+        }
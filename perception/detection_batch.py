@@ -0,0 +1,130 @@
+"""
+Columnar detector output.
+
+DetectionBatch holds one frame's detections as arrays - boxes (N, 4),
+confidences and class ids - straight from the model's output tensors.
+Class filtering, confidence splits and IoU matching in ByteTracker work
+on whole arrays, without a Python object per detection. Indexing and
+iterating yield Detection objects for callers that need them.
+"""
+from dataclasses import dataclass
+from typing import Iterable, List, Tuple
+
+import numpy as np
+
+
+@dataclass
+class Detection:
+    """Single detection from YOLOv8"""
+    bbox: Tuple[float, float, float, float]  # x1, y1, x2, y2
+    confidence: float
+    class_id: int
+    class_name: str
+
+
+@dataclass
+class DetectionBatch:
+    """
+    Struct-of-arrays equivalent of List[Detection] for one frame.
+    """
+    boxes: np.ndarray        # (N, 4) float - x1, y1, x2, y2 in pixels
+    confidences: np.ndarray  # (N,) float
+    class_ids: np.ndarray    # (N,) int64
+    class_names: np.ndarray  # (N,) object
+
+    def __len__(self) -> int:
+        return len(self.confidences)
+
+    def __getitem__(self, i: int) -> Detection:
+        """Materialize a single row as a Detection"""
+        return Detection(
+            bbox=tuple(self.boxes[i].tolist()),
+            confidence=float(self.confidences[i]),
+            class_id=int(self.class_ids[i]),
+            class_name=self.class_names[i]
+        )
+
+    def __iter__(self):
+        for i in range(len(self.confidences)):
+            yield self[i]
+
+    @property
+    def centers(self) -> np.ndarray:
+        """(N, 2) box centers in pixels"""
+        return (self.boxes[:, :2] + self.boxes[:, 2:]) / 2
+
+    def select(self, index) -> 'DetectionBatch':
+        """Rows selected by a boolean mask or an index array"""
+        return DetectionBatch(
+            boxes=self.boxes[index],
+            confidences=self.confidences[index],
+            class_ids=self.class_ids[index],
+            class_names=self.class_names[index]
+        )
+
+    def filter_classes(self, class_ids: Iterable[int]) -> 'DetectionBatch':
+        """Rows whose class id is in class_ids"""
+        keep = np.fromiter(class_ids, dtype=np.int64)
+        return self.select(np.isin(self.class_ids, keep))
+
+    def filter_confidence(self, threshold: float) -> 'DetectionBatch':
+        """Rows with confidence >= threshold"""
+        return self.select(self.confidences >= threshold)
+
+    def to_detections(self) -> List[Detection]:
+        """Materialize every row (for legacy callers)"""
+        return list(self)
+
+    @classmethod
+    def from_detections(cls, detections: List) -> 'DetectionBatch':
+        """Build batch from Detection-like objects"""
+        if not detections:
+            return cls.empty()
+
+        class_names = np.empty(len(detections), dtype=object)
+        class_names[:] = [d.class_name for d in detections]
+
+        return cls(
+            boxes=np.array([d.bbox for d in detections], dtype=np.float64).reshape(-1, 4),
+            confidences=np.array([d.confidence for d in detections], dtype=np.float64),
+            class_ids=np.array([d.class_id for d in detections], dtype=np.int64),
+            class_names=class_names
+        )
+
+    @classmethod
+    def empty(cls) -> 'DetectionBatch':
+        """Batch with zero detections"""
+        return cls(
+            boxes=np.empty((0, 4)),
+            confidences=np.empty(0),
+            class_ids=np.empty(0, dtype=np.int64),
+            class_names=np.empty(0, dtype=object)
+        )
+
+
+def box_iou_matrix(boxes1: np.ndarray, boxes2: np.ndarray) -> np.ndarray:
+    """
+    Pairwise IoU of two sets of x1, y1, x2, y2 boxes
+
+    Args:
+        boxes1: (M, 4) boxes
+        boxes2: (N, 4) boxes
+
+    Returns:
+        (M, N) IoU matrix (0 where boxes do not overlap or have no area)
+    """
+    boxes1 = np.asarray(boxes1, dtype=np.float64).reshape(-1, 4)
+    boxes2 = np.asarray(boxes2, dtype=np.float64).reshape(-1, 4)
+
+    top_left = np.maximum(boxes1[:, None, :2], boxes2[None, :, :2])
+    bottom_right = np.minimum(boxes1[:, None, 2:], boxes2[None, :, 2:])
+    wh = np.clip(bottom_right - top_left, 0.0, None)
+    inter = wh[..., 0] * wh[..., 1]
+
+    area1 = (boxes1[:, 2] - boxes1[:, 0]) * (boxes1[:, 3] - boxes1[:, 1])
+    area2 = (boxes2[:, 2] - boxes2[:, 0]) * (boxes2[:, 3] - boxes2[:, 1])
+    union = area1[:, None] + area2[None, :] - inter
+
+    iou = np.zeros_like(inter)
+    np.divide(inter, union, out=iou, where=union > 0)
+    return iou
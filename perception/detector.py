@@ -1,22 +1,22 @@
 """
 YOLOv8-based vehicle detector.
 Detects vehicles, trucks, and emergency vehicles from camera frames.
+
+Backends:
+    - 'torch': eager PyTorch on mps / cuda / cpu
+    - 'onnx': ONNX Runtime on an exported (optionally INT8) model, for
+      CPU-only boxes; see perception.onnx_export
 """
 
 import numpy as np
 from ultralytics import YOLO
-from typing import List, Tuple, Dict
-from dataclasses import dataclass
+from typing import List, Tuple, Dict, Optional
 import torch
 
+from perception.detection_batch import Detection, DetectionBatch
+
 
-@dataclass
-class Detection:
-    """Single detection from YOLOv8"""
-    bbox: Tuple[float, float, float, float]  # x1, y1, x2, y2
-    confidence: float
-    class_id: int
-    class_name: str
+SUPPORTED_DETECTOR_BACKENDS = ('torch', 'onnx')
 
 
 class VehicleDetector:
@@ -25,14 +25,28 @@ class VehicleDetector:
     Uses pretrained COCO model for vehicle detection.
     """
     
-    def __init__(self, model_name: str = 'yolov8n.pt', device: str = 'mps'):
+    def __init__(self, model_name: str = 'yolov8n.pt', device: str = 'mps',
+                 backend: str = 'torch', int8: bool = False, imgsz: int = 640,
+                 export_dir: Optional[str] = None):
         """
         Initialize detector
         
         Args:
             model_name: YOLOv8 model variant ('yolov8n.pt', 'yolov8s.pt', etc.)
             device: Device to run on ('mps' for M4 Mac, 'cuda' for GPU, 'cpu')
+            backend: 'torch' or 'onnx' (ONNX Runtime; export cached under cache/onnx)
+            int8: With the onnx backend, use the INT8 model calibrated on
+                data/synthetic_renders
+            imgsz: Inference size (baked into the ONNX export)
+            export_dir: ONNX export cache (None = cache/onnx)
         """
+        if backend not in SUPPORTED_DETECTOR_BACKENDS:
+            raise ValueError(
+                f"backend must be one of {SUPPORTED_DETECTOR_BACKENDS}, got '{backend}'"
+            )
+        if int8 and backend != 'onnx':
+            raise ValueError("int8 requires backend='onnx'")
+        
         # Check device availability
         if device == 'mps' and not torch.backends.mps.is_available():
             print("⚠ MPS not available, falling back to CPU")
@@ -42,11 +56,28 @@ class VehicleDetector:
             device = 'cpu'
         
         self.device = device
-        print(f"Loading YOLOv8 model on {device}...")
+        self.model_name = model_name
+        self.backend = backend
+        self.int8 = int8
+        self.imgsz = imgsz
         
-        # Load YOLO model
-        self.model = YOLO(model_name)
-        self.model.to(device)
+        if backend == 'onnx':
+            from perception.onnx_export import export_onnx
+            
+            precision = "INT8" if int8 else "FP32"
+            print(f"Loading YOLOv8 model ({precision} ONNX Runtime) on {device}...")
+            onnx_path = export_onnx(model_name, imgsz=imgsz, int8=int8,
+                                    export_dir=export_dir)
+            self.model = YOLO(str(onnx_path), task='detect')
+            # ONNX models are placed per call, not with .to()
+            self._predict_args = {'device': device, 'imgsz': imgsz}
+        else:
+            print(f"Loading YOLOv8 model on {device}...")
+            
+            # Load YOLO model
+            self.model = YOLO(model_name)
+            self.model.to(device)
+            self._predict_args = {'imgsz': imgsz}
         
         # COCO classes for vehicles
         # 2: car, 3: motorcycle, 5: bus, 7: truck
@@ -57,87 +88,82 @@ class VehicleDetector:
             5: 'bus',
             7: 'truck'
         }
+        # class id -> name, for naming a whole batch in one indexing step
+        self._class_name_lookup = np.full(
+            max(self.vehicle_classes | self.class_names.keys()) + 1, 'vehicle', dtype=object
+        )
+        for cls_id, name in self.class_names.items():
+            self._class_name_lookup[cls_id] = name
         
         print(f"✓ YOLOv8 loaded successfully")
     
-    def detect(self, frame: np.ndarray, conf_threshold: float = 0.3) -> List[Detection]:
+    def detect(self, frame: np.ndarray, conf_threshold: float = 0.3,
+               imgsz: Optional[int] = None) -> DetectionBatch:
         """
         Detect vehicles in frame
         
         Args:
             frame: RGB image (H, W, 3)
             conf_threshold: Confidence threshold for detections
+            imgsz: Inference size for this call (None = the detector's);
+                must be a multiple of 32
             
         Returns:
-            List of Detection objects
+            DetectionBatch (iterates as Detection objects)
         """
-        # Run inference
-        results = self.model(frame, conf=conf_threshold, verbose=False)[0]
-        
-        detections = []
-        
-        # Parse results
-        if results.boxes is not None:
-            boxes = results.boxes.xyxy.cpu().numpy()  # x1, y1, x2, y2
-            confidences = results.boxes.conf.cpu().numpy()
-            class_ids = results.boxes.cls.cpu().numpy().astype(int)
-            
-            for bbox, conf, cls_id in zip(boxes, confidences, class_ids):
-                # Filter for vehicle classes
-                if cls_id in self.vehicle_classes:
-                    detection = Detection(
-                        bbox=tuple(bbox),
-                        confidence=float(conf),
-                        class_id=int(cls_id),
-                        class_name=self.class_names.get(cls_id, 'vehicle')
-                    )
-                    detections.append(detection)
-        
-        return detections
+        results = self.model(frame, conf=conf_threshold, verbose=False,
+                             **self._call_args(imgsz))[0]
+        return self._to_batch(results)
     
     def detect_batch(self, frames: List[np.ndarray], 
-                    conf_threshold: float = 0.3) -> List[List[Detection]]:
+                    conf_threshold: float = 0.3,
+                    imgsz: Optional[int] = None) -> List[DetectionBatch]:
         """
         Detect vehicles in batch of frames
         
         Args:
             frames: List of RGB images
             conf_threshold: Confidence threshold
+            imgsz: Inference size for this call (None = the detector's)
             
         Returns:
-            List of detection lists (one per frame)
+            List of DetectionBatch (one per frame)
         """
-        results_batch = self.model(frames, conf=conf_threshold, verbose=False)
-        
-        all_detections = []
-        for results in results_batch:
-            detections = []
-            if results.boxes is not None:
-                boxes = results.boxes.xyxy.cpu().numpy()
-                confidences = results.boxes.conf.cpu().numpy()
-                class_ids = results.boxes.cls.cpu().numpy().astype(int)
-                
-                for bbox, conf, cls_id in zip(boxes, confidences, class_ids):
-                    if cls_id in self.vehicle_classes:
-                        detection = Detection(
-                            bbox=tuple(bbox),
-                            confidence=float(conf),
-                            class_id=int(cls_id),
-                            class_name=self.class_names.get(cls_id, 'vehicle')
-                        )
-                        detections.append(detection)
-            
-            all_detections.append(detections)
-        
-        return all_detections
+        results_batch = self.model(frames, conf=conf_threshold, verbose=False,
+                                   **self._call_args(imgsz))
+        return [self._to_batch(results) for results in results_batch]
+    
+    def _call_args(self, imgsz: Optional[int]) -> dict:
+        """Predict arguments, with a per-call inference size"""
+        if imgsz is None:
+            return self._predict_args
+        return {**self._predict_args, 'imgsz': imgsz}
+    
+    def _to_batch(self, results) -> DetectionBatch:
+        """Vehicle-class rows of one ultralytics result"""
+        if results.boxes is None or len(results.boxes) == 0:
+            return DetectionBatch.empty()
+        
+        # One device-to-host copy: x1, y1, x2, y2, conf, cls per row
+        data = results.boxes.data.cpu().numpy()
+        class_ids = data[:, -1].astype(np.int64)
+        keep = np.isin(class_ids, np.fromiter(self.vehicle_classes, dtype=np.int64))
+        class_ids = class_ids[keep]
+        
+        return DetectionBatch(
+            boxes=data[keep, :4],
+            confidences=data[keep, -2],
+            class_ids=class_ids,
+            class_names=self._class_name_lookup[class_ids]
+        )
     
-    def visualize(self, frame: np.ndarray, detections: List[Detection]) -> np.ndarray:
+    def visualize(self, frame: np.ndarray, detections: DetectionBatch) -> np.ndarray:
         """
         Draw detections on frame
         
         Args:
             frame: RGB image
-            detections: List of detections
+            detections: DetectionBatch (or List[Detection])
             
         Returns:
             Annotated frame
@@ -67,6 +67,27 @@ class KalmanDistanceEstimator:
         
         return (x, y, vx, vy)
     
+    def predict(self, track_id: int) -> Tuple[float, float, float, float]:
+        """
+        Advance a track's estimate one step without a measurement
+        
+        Used for frames the detector skips; the position covariance grows
+        until the next update().
+        
+        Returns:
+            (x, y, vx, vy): Predicted position and velocity
+        """
+        kf = self.filters[track_id]
+        kf.predict()
+        x, vx, y, vy = kf.x.flatten()
+        
+        return (x, y, vx, vy)
+    
+    def position_std(self, track_id: int) -> float:
+        """Larger of the x / y position standard deviations (meters)"""
+        P = self.filters[track_id].P
+        return float(np.sqrt(max(P[0, 0], P[2, 2])))
+    
     def _create_filter(self, initial_position: Tuple[float, float]) -> KalmanFilter:
         """
         Create Kalman filter for constant velocity model
@@ -9,6 +9,8 @@ Date: 2026-02-14
 """
 from typing import Set
 
+import numpy as np
+
 
 class EmergencyVehicleDetector:
     """
@@ -53,6 +55,19 @@ class EmergencyVehicleDetector:
         """
         return vtype in EmergencyVehicleDetector.GT_EMERGENCY_TYPES
     
+    @staticmethod
+    def is_emergency_gt_array(vtypes: np.ndarray) -> np.ndarray:
+        """
+        Vectorized is_emergency_gt for a column of vType IDs.
+        
+        Args:
+            vtypes: (N,) array of SUMO vehicle type IDs
+        
+        Returns:
+            (N,) bool array
+        """
+        return np.isin(vtypes, list(EmergencyVehicleDetector.GT_EMERGENCY_TYPES))
+    
     @staticmethod
     def is_emergency_vision(class_name: str) -> bool:
         """
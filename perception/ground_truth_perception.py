@@ -7,6 +7,8 @@ from typing import List, Tuple
 from dataclasses import dataclass
 import numpy as np
 
+from perception.perceived_frame import PerceivedFrame
+
 
 @dataclass
 class PerceivedVehicle:
@@ -64,3 +66,35 @@ class GroundTruthPerception:
             ))
         
         return perceived
+    
+    def process_vehicle_frame(self, vehicle_frame) -> PerceivedFrame:
+        """Columnar variant of process_sumo_vehicles for a VehicleFrame"""
+        if len(vehicle_frame) == 0:
+            return PerceivedFrame.empty()
+        
+        # Assign lanes and stop-line distances for all vehicles at once
+        lane_ids = self.lane_mapper.assign_lanes(vehicle_frame.x, vehicle_frame.y)
+        dists = self.lane_mapper.get_distances_to_stop_line(
+            vehicle_frame.x, vehicle_frame.y, lane_ids
+        )
+        
+        # Velocity from SUMO (convert angle to vx, vy)
+        angle_rad = np.radians(vehicle_frame.angle)
+        velocities = np.column_stack((
+            vehicle_frame.speed * np.sin(angle_rad),
+            vehicle_frame.speed * np.cos(angle_rad)
+        ))
+        
+        return PerceivedFrame(
+            track_ids=np.fromiter(
+                (hash(vid) % 100000 for vid in vehicle_frame.ids),
+                dtype=np.int64, count=len(vehicle_frame)
+            ),
+            class_names=vehicle_frame.types,
+            is_emergency=np.isin(vehicle_frame.types, list(self.emergency_types)),
+            confidences=np.ones(len(vehicle_frame)),
+            positions=vehicle_frame.positions,
+            velocities=velocities,
+            lane_ids=lane_ids,
+            distances_to_stop_line=dists
+        )
@@ -0,0 +1,52 @@
+"""
+Keyframe scheduling for the perception pipeline.
+
+With a keyframe policy, PerceptionPipeline runs the detector only every
+k-th frame and propagates tracks with their motion model in between.
+The interval adapts to the scene: it drops while a vehicle is close to
+its stop line (where queue and arrival estimates matter most) and to
+every frame while an emergency vehicle is in view. A keyframe is also
+forced as soon as any track's position uncertainty exceeds a threshold.
+
+Usage:
+    policy = KeyframePolicy(max_interval=5)
+    pipeline = PerceptionPipeline(..., keyframe_policy=policy)
+"""
+
+from dataclasses import dataclass
+from typing import List
+
+from perception.types import PerceivedVehicle
+
+
+@dataclass
+class KeyframePolicy:
+    """Detector scheduling parameters (intervals in frames)"""
+    max_interval: int = 5              # Interval for a calm scene
+    stop_line_interval: int = 2        # Vehicle within stop_line_distance
+    emergency_interval: int = 1        # Emergency vehicle in view
+    stop_line_distance: float = 15.0   # Meters before the stop line
+    uncertainty_threshold: float = 2.5  # Meters (position std) forcing a keyframe
+
+    def __post_init__(self):
+        for name in ('max_interval', 'stop_line_interval', 'emergency_interval'):
+            if getattr(self, name) < 1:
+                raise ValueError(f"{name} must be >= 1, got {getattr(self, name)}")
+
+    def interval(self, vehicles: List[PerceivedVehicle]) -> int:
+        """
+        Frames until the next keyframe, given the latest perception output
+
+        Args:
+            vehicles: Perceived vehicles of the current frame
+
+        Returns:
+            Interval in frames (1 = detect every frame)
+        """
+        interval = self.max_interval
+        for vehicle in vehicles:
+            if vehicle.is_emergency:
+                interval = min(interval, self.emergency_interval)
+            if 0.0 <= vehicle.distance_to_stop_line < self.stop_line_distance:
+                interval = min(interval, self.stop_line_interval)
+        return interval
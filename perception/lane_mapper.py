@@ -4,11 +4,12 @@ Determines which lane each vehicle occupies based on position.
 """
 
 import numpy as np
-import yaml
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass
 from pathlib import Path
 
+from simulation.geometry_cache import load_intersection_config
+
 
 @dataclass
 class LaneInfo:
@@ -28,16 +29,20 @@ class LaneMapper:
     Uses geometric rules to assign vehicles to specific lanes.
     """
     
-    def __init__(self, config_path: str):
+    def __init__(self, config_path: Union[str, dict]):
         """
         Initialize lane mapper
         
         Args:
-            config_path: Path to intersection_config.yaml
+            config_path: Path to intersection_config.yaml, or an already
+                loaded config dict with the same schema (e.g. from
+                SignalizedIntersection.lane_mapper_config())
         """
-        # Load configuration
-        with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
+        # Load configuration (parsed once, then served from the geometry cache)
+        if isinstance(config_path, dict):
+            config = config_path
+        else:
+            config = load_intersection_config(config_path)
         
         self.intersection_center = (
             config['intersection']['center']['x'],
@@ -58,6 +63,31 @@ class LaneMapper:
                 stop_line=(lane_data['stop_line']['x'], lane_data['stop_line']['y'])
             )
         
+        # Lookup tables for vectorized assignment: [approach][lane_index] -> lane
+        self._approach_order = ['N', 'S', 'E', 'W']
+        self._lane_table = np.empty((4, 3), dtype=object)
+        for a_idx, approach in enumerate(self._approach_order):
+            for lane_index in range(3):
+                lane_id = f"{approach}_in_{lane_index}"
+                self._lane_table[a_idx, lane_index] = lane_id if lane_id in self.lanes else None
+        
+        # Per-lane stop-line geometry indexed by lane code (last row = no lane):
+        # distance = sign * (coord - stop), coord = x if axis == 0 else y
+        self._lane_codes = {lane_id: i for i, lane_id in enumerate(self.lanes)}
+        direction_geometry = {
+            'north': (1, 1.0), 'south': (1, -1.0),
+            'east': (0, 1.0), 'west': (0, -1.0)
+        }
+        self._stop_axis = np.zeros(len(self.lanes) + 1, dtype=int)
+        self._stop_sign = np.zeros(len(self.lanes) + 1)
+        self._stop_coord = np.zeros(len(self.lanes) + 1)
+        for lane_id, code in self._lane_codes.items():
+            lane = self.lanes[lane_id]
+            axis, sign = direction_geometry.get(lane.direction, (0, -1.0))  # west
+            self._stop_axis[code] = axis
+            self._stop_sign[code] = sign
+            self._stop_coord[code] = lane.stop_line[axis]
+        
         print(f"✓ Loaded {len(self.lanes)} lane definitions")
     
     def assign_lane(self, position: Tuple[float, float], 
@@ -150,6 +180,106 @@ class LaneMapper:
         
         return distance
     
+    def assign_lanes(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """
+        Vectorized assign_lane for many positions at once
+        
+        Args:
+            x, y: (N,) arrays of SUMO world coordinates
+            
+        Returns:
+            (N,) object array of lane IDs (None where not in any lane)
+        """
+        cx, cy = self.intersection_center
+        dx = np.asarray(x, dtype=np.float64) - cx
+        dy = np.asarray(y, dtype=np.float64) - cy
+        
+        # Same rules as assign_lane: dominant axis picks E/W or N/S
+        east_west = np.abs(dx) > np.abs(dy)
+        approach_idx = np.where(
+            east_west,
+            np.where(dx > 0, 2, 3),   # E, W
+            np.where(dy > 0, 0, 1)    # N, S
+        )
+        lane_offset = np.select(
+            [approach_idx == 0, approach_idx == 1, approach_idx == 2],
+            [dx, -dx, -dy],
+            default=dy
+        )
+        
+        # int() truncates toward zero; negatives clamp to 0 either way
+        lane_index = np.clip(np.trunc(lane_offset / self.lane_width + 1.5), 0, 2).astype(int)
+        
+        return self._lane_table[approach_idx, lane_index]
+    
+    def get_distances_to_stop_line(self, x: np.ndarray, y: np.ndarray,
+                                   lane_ids: np.ndarray) -> np.ndarray:
+        """
+        Vectorized get_distance_to_stop_line
+        
+        Args:
+            x, y: (N,) arrays of positions
+            lane_ids: (N,) lane IDs from assign_lanes (None allowed)
+            
+        Returns:
+            (N,) distances in meters; -1.0 where lane is None/unknown
+        """
+        no_lane = len(self.lanes)
+        codes = np.fromiter(
+            (self._lane_codes.get(lane_id, no_lane) for lane_id in lane_ids),
+            dtype=int, count=len(lane_ids)
+        )
+        
+        coord = np.where(self._stop_axis[codes] == 0, x, y)
+        distances = self._stop_sign[codes] * (coord - self._stop_coord[codes])
+        distances[codes == no_lane] = -1.0
+        
+        return distances
+    
+    def approach_bounds(self, margin: float = 0.0) -> Dict[str, Tuple[float, float, float, float]]:
+        """
+        World-space bounding rectangle of each approach's lanes
+
+        Each lane spans its stop line to its entry line along the approach
+        and, across it, the band of offsets assign_lane maps to its lane
+        index (lane 1 centered on the approach axis).
+
+        Args:
+            margin: Meters added on every side (e.g. half a vehicle length,
+                so vehicles straddling the lane edges are covered)
+
+        Returns:
+            approach ('N', 'S', 'E', 'W') -> (x_min, y_min, x_max, y_max)
+        """
+        cx, cy = self.intersection_center
+        w = self.lane_width
+        bounds: Dict[str, Tuple[float, float, float, float]] = {}
+
+        for lane in self.lanes.values():
+            # Offsets from the axis covered by this lane index
+            lo, hi = (lane.lane_index - 1.5) * w, (lane.lane_index - 0.5) * w
+            along = sorted((lane.stop_line, lane.entry_line),
+                           key=lambda p: p[1] if lane.approach in 'NS' else p[0])
+
+            # Inverse of assign_lane's lane_offset for each approach
+            if lane.approach == 'N':
+                rect = (cx + lo, along[0][1], cx + hi, along[1][1])
+            elif lane.approach == 'S':
+                rect = (cx - hi, along[0][1], cx - lo, along[1][1])
+            elif lane.approach == 'E':
+                rect = (along[0][0], cy - hi, along[1][0], cy - lo)
+            else:  # W
+                rect = (along[0][0], cy + lo, along[1][0], cy + hi)
+
+            if lane.approach in bounds:
+                old = bounds[lane.approach]
+                rect = (min(old[0], rect[0]), min(old[1], rect[1]),
+                        max(old[2], rect[2]), max(old[3], rect[3]))
+            bounds[lane.approach] = rect
+
+        return {approach: (x0 - margin, y0 - margin, x1 + margin, y1 + margin)
+                for approach, (x0, y0, x1, y1) in bounds.items()}
+
     def get_lane_info(self, lane_id: str) -> Optional[LaneInfo]:
         """Get lane information by ID"""
         return self.lanes.get(lane_id)
@@ -0,0 +1,287 @@
+"""
+Lane-ROI cropped detection.
+
+Only the approach lanes in intersection_config.yaml feed the controller,
+yet the detector sees the whole camera frame - mostly grass and the
+outbound roads. LaneROIDetector cuts each approach's lanes (LaneMapper
+geometry, mapped to pixels with the camera scale) out of the frame, packs
+the crops into one mosaic image and runs the detector once on it, at the
+same pixels-per-meter the full frame would have been detected at. Boxes
+are mapped back to full-frame coordinates.
+
+The crops are packed rather than passed as a batch: YOLO letterboxes
+every batch entry to the full inference size, so four thin lane strips
+would cost more than the frame they came from.
+
+Vehicles outside the approach lanes (inside the junction box, on
+outbound roads) are not detected.
+
+Usage:
+    roi_detector = LaneROIDetector(VehicleDetector(device='cpu'), lane_mapper,
+                                   camera_scale=camera.scale,
+                                   intersection_center=camera.intersection_center)
+    detections = roi_detector.detect(frame)   # DetectionBatch, frame pixels
+"""
+
+import itertools
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from perception.detection_batch import DetectionBatch
+from perception.lane_mapper import LaneMapper
+
+
+# Model stride: inference sizes are rounded up to a multiple of it
+STRIDE = 32
+
+# Gap between packed crops, filled like letterbox padding
+MOSAIC_FILL = 114
+
+
+@dataclass
+class ROILayout:
+    """Where each approach crop sits in the frame and in the mosaic"""
+    approaches: List[str]
+    frame_rects: np.ndarray   # (T, 4) int - x0, y0, x1, y1 in the frame
+    mosaic_rects: np.ndarray  # (T, 4) int - x0, y0, x1, y1 in the mosaic
+    mosaic_size: Tuple[int, int]  # (width, height)
+    frame_size: Tuple[int, int]   # (width, height)
+
+    @property
+    def pixel_fraction(self) -> float:
+        """Mosaic area as a fraction of the frame area"""
+        return (self.mosaic_size[0] * self.mosaic_size[1] /
+                (self.frame_size[0] * self.frame_size[1]))
+
+
+def pack_tiles(sizes: List[Tuple[int, int]],
+               gap: int = STRIDE) -> Tuple[List[Tuple[int, int]], Tuple[int, int]]:
+    """
+    Shelf-pack rectangles into a small canvas
+
+    Tiles are sorted by height and placed left to right in shelves. Every
+    shelf width a subset of the tiles could fill exactly is tried, and the
+    smallest canvas wins (few tiles, so this is cheap).
+
+    Args:
+        sizes: (width, height) per tile
+        gap: Empty pixels between neighbouring tiles
+
+    Returns:
+        (x, y) top-left per tile, and the canvas (width, height)
+    """
+    if not sizes:
+        return [], (0, 0)
+
+    order = sorted(range(len(sizes)), key=lambda i: -sizes[i][1])
+    widest = max(w for w, _ in sizes)
+    candidates = {
+        sum(sizes[i][0] for i in subset) + gap * (len(subset) - 1)
+        for r in range(1, len(sizes) + 1)
+        for subset in itertools.combinations(range(len(sizes)), r)
+    }
+
+    best = None
+    for shelf_width in sorted(c for c in candidates if c >= widest):
+        positions = [None] * len(sizes)
+        x = y = shelf_height = used_width = 0
+        for i in order:
+            w, h = sizes[i]
+            if x > 0 and x + w > shelf_width:
+                y += shelf_height + gap
+                x = shelf_height = 0
+            positions[i] = (x, y)
+            used_width = max(used_width, x + w)
+            shelf_height = max(shelf_height, h)
+            x += w + gap
+        canvas = (used_width, y + shelf_height)
+        if best is None or canvas[0] * canvas[1] < best[1][0] * best[1][1]:
+            best = (positions, canvas)
+
+    return best
+
+
+class LaneROIDetector:
+    """
+    Runs a detector on the approach lanes only.
+
+    detect() has the signature of VehicleDetector.detect (plus the image
+    center), so PerceptionPipeline can use it in place of the detector.
+    """
+
+    def __init__(self, detector, lane_mapper: LaneMapper, camera_scale: float,
+                 intersection_center: Tuple[float, float], margin: float = 6.0,
+                 gap: int = STRIDE, duplicate_overlap: float = 0.7):
+        """
+        Args:
+            detector: VehicleDetector (anything with
+                detect(frame, conf_threshold, imgsz) and an imgsz attribute)
+            lane_mapper: Lane geometry the ROIs are derived from
+            camera_scale: Pixels per meter
+            intersection_center: World point at the image center
+            margin: Meters around the lanes kept in each crop (half the
+                longest vehicle, so straddling vehicles stay whole)
+            gap: Pixels between crops in the mosaic
+            duplicate_overlap: Boxes from different crops overlapping by
+                more than this fraction of the smaller box are one vehicle
+        """
+        self.detector = detector
+        self.lane_mapper = lane_mapper
+        self.camera_scale = camera_scale
+        self.intersection_center = intersection_center
+        self.margin = margin
+        self.gap = gap
+        self.duplicate_overlap = duplicate_overlap
+
+        # Layout and mosaic buffer, rebuilt when the frame geometry changes
+        self._layout_key = None
+        self._layout: Optional[ROILayout] = None
+        self._mosaic: Optional[np.ndarray] = None
+
+    def roi_rects(self, frame_size: Tuple[int, int],
+                  image_center: Tuple[int, int]) -> Dict[str, Tuple[int, int, int, int]]:
+        """
+        Pixel rectangle of each approach, clipped to the frame
+
+        Args:
+            frame_size: (width, height)
+            image_center: Pixel of intersection_center
+
+        Returns:
+            approach -> (x0, y0, x1, y1); approaches out of view are omitted
+        """
+        width, height = frame_size
+        cx, cy = self.intersection_center
+        rects = {}
+        for approach, (x0, y0, x1, y1) in self.lane_mapper.approach_bounds(self.margin).items():
+            # World -> image (Y flipped), inverse of PerceptionPipeline._image_to_world
+            px0 = math.floor(image_center[0] + (x0 - cx) * self.camera_scale)
+            px1 = math.ceil(image_center[0] + (x1 - cx) * self.camera_scale)
+            py0 = math.floor(image_center[1] - (y1 - cy) * self.camera_scale)
+            py1 = math.ceil(image_center[1] - (y0 - cy) * self.camera_scale)
+
+            px0, px1 = max(px0, 0), min(px1, width)
+            py0, py1 = max(py0, 0), min(py1, height)
+            if px1 > px0 and py1 > py0:
+                rects[approach] = (px0, py0, px1, py1)
+        return rects
+
+    def layout(self, frame_size: Tuple[int, int],
+               image_center: Tuple[int, int]) -> ROILayout:
+        """Packed layout for a frame geometry (cached)"""
+        key = (tuple(frame_size), tuple(image_center))
+        if key != self._layout_key:
+            rects = self.roi_rects(frame_size, image_center)
+            approaches = list(rects)
+            frame_rects = np.array([rects[a] for a in approaches], dtype=np.int64).reshape(-1, 4)
+            sizes = [(x1 - x0, y1 - y0) for x0, y0, x1, y1 in frame_rects.tolist()]
+            positions, mosaic_size = pack_tiles(sizes, self.gap)
+
+            mosaic_rects = np.array(
+                [(x, y, x + w, y + h) for (x, y), (w, h) in zip(positions, sizes)],
+                dtype=np.int64
+            ).reshape(-1, 4)
+            self._layout = ROILayout(approaches, frame_rects, mosaic_rects,
+                                     mosaic_size, tuple(frame_size))
+            self._mosaic = np.full((mosaic_size[1], mosaic_size[0], 3), MOSAIC_FILL,
+                                   dtype=np.uint8)
+            self._layout_key = key
+        return self._layout
+
+    def build_mosaic(self, frame: np.ndarray,
+                     image_center: Optional[Tuple[int, int]] = None) -> np.ndarray:
+        """
+        Copy the approach crops of frame into the (reused) mosaic buffer
+
+        The returned array is overwritten by the next call.
+        """
+        height, width = frame.shape[:2]
+        if image_center is None:
+            image_center = (width // 2, height // 2)
+        layout = self.layout((width, height), image_center)
+
+        for (fx0, fy0, fx1, fy1), (mx0, my0, mx1, my1) in zip(layout.frame_rects.tolist(),
+                                                              layout.mosaic_rects.tolist()):
+            self._mosaic[my0:my1, mx0:mx1] = frame[fy0:fy1, fx0:fx1]
+        return self._mosaic
+
+    def inference_size(self, layout: ROILayout) -> int:
+        """Mosaic inference size at the full frame's pixels-per-meter"""
+        ratio = self.detector.imgsz / max(layout.frame_size)
+        return max(STRIDE, math.ceil(max(layout.mosaic_size) * ratio / STRIDE) * STRIDE)
+
+    def detect(self, frame: np.ndarray, conf_threshold: float = 0.3,
+               image_center: Optional[Tuple[int, int]] = None) -> DetectionBatch:
+        """
+        Detect vehicles in the approach lanes of frame
+
+        Args:
+            frame: RGB image (H, W, 3)
+            conf_threshold: Confidence threshold for detections
+            image_center: Pixel of intersection_center (None = frame center)
+
+        Returns:
+            DetectionBatch in full-frame pixel coordinates
+        """
+        height, width = frame.shape[:2]
+        if image_center is None:
+            image_center = (width // 2, height // 2)
+        layout = self.layout((width, height), image_center)
+        if not layout.approaches:
+            return DetectionBatch.empty()
+
+        mosaic = self.build_mosaic(frame, image_center)
+        detections = self.detector.detect(mosaic, conf_threshold=conf_threshold,
+                                          imgsz=self.inference_size(layout))
+        return self._to_frame(detections, layout)
+
+    def _to_frame(self, detections: DetectionBatch, layout: ROILayout) -> DetectionBatch:
+        """Map mosaic boxes back to the frame; drop gap boxes and duplicates"""
+        if len(detections) == 0:
+            return detections
+
+        # Crop of each box = the one containing its center
+        centers = detections.centers
+        rects = layout.mosaic_rects
+        inside = ((centers[:, None, 0] >= rects[None, :, 0]) &
+                  (centers[:, None, 0] < rects[None, :, 2]) &
+                  (centers[:, None, 1] >= rects[None, :, 1]) &
+                  (centers[:, None, 1] < rects[None, :, 3]))
+        detections = detections.select(inside.any(axis=1))
+        tile = inside[inside.any(axis=1)].argmax(axis=1)
+
+        boxes = np.clip(detections.boxes,
+                        np.tile(rects[tile, :2], 2), np.tile(rects[tile, 2:], 2))
+        offset = layout.frame_rects[tile, :2] - rects[tile, :2]
+        detections.boxes = (boxes + np.tile(offset, 2)).astype(detections.boxes.dtype)
+
+        return detections.select(~self._duplicates(detections.boxes, tile))
+
+    def _duplicates(self, boxes: np.ndarray, tile: np.ndarray) -> np.ndarray:
+        """
+        Mask of boxes repeating a vehicle already found in another crop
+
+        Where crops overlap (near the junction) a vehicle can be seen
+        twice, once cut off at a crop edge. Of each overlapping pair from
+        different crops, the larger (less truncated) box is kept.
+        """
+        area = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+        order = np.argsort(-area, kind='stable')
+        b, t, a = boxes[order], tile[order], area[order]
+
+        wh = np.clip(np.minimum(b[:, None, 2:], b[None, :, 2:]) -
+                     np.maximum(b[:, None, :2], b[None, :, :2]), 0, None)
+        inter = wh[..., 0] * wh[..., 1]
+        smaller = np.minimum(a[:, None], a[None, :])
+        overlap = np.zeros_like(inter, dtype=np.float64)
+        np.divide(inter, smaller, out=overlap, where=smaller > 0)
+
+        duplicate_pair = (overlap > self.duplicate_overlap) & (t[:, None] != t[None, :])
+        suppressed = np.triu(duplicate_pair, k=1).any(axis=0)
+
+        mask = np.zeros(len(boxes), dtype=bool)
+        mask[order] = suppressed
+        return mask
@@ -0,0 +1,151 @@
+"""
+Perception from mesoscopic edge aggregates.
+
+SUMO's mesoscopic model has no lanes or continuous positions - a vehicle is
+only known to be queued on an edge segment. This module turns per-edge
+aggregates (vehicle count, halting count, mean speed) into a PerceivedFrame
+the unchanged state estimator can consume: each edge's vehicles are spread
+over its lanes, halted vehicles packed at jam spacing from the stop line
+and moving ones spread over the rest of the lane.
+
+Pseudo-vehicles get track IDs by slot (lane, queue position), so a queue
+that persists keeps the same IDs and accumulates waiting time in the lane
+tracker like real stopped vehicles.
+"""
+import numpy as np
+from typing import Dict, List
+
+from perception.perceived_frame import PerceivedFrame
+from simulation.intersections import SignalizedIntersection
+from simulation.sumo_interface import EdgeAggregates
+
+
+# Stop-line spacing of queued vehicles (car length 5 m + minGap 2.5 m)
+JAM_SPACING = 7.5
+
+# Track ID layout: lane_slot * TRACK_ID_STRIDE + offset
+TRACK_ID_STRIDE = 1000
+_MOVING_OFFSET = 500
+
+
+class MesoPerception:
+    """
+    Aggregate perception for one SignalizedIntersection in a meso run.
+
+    Exposes process_edge_aggregates(); pass incoming_edges to
+    SUMOInterface.subscribe_edges() so the aggregates line up.
+    """
+
+    def __init__(self, intersection: SignalizedIntersection):
+        """
+        Args:
+            intersection: Discovered intersection (lanes, stop lines)
+        """
+        self.intersection = intersection
+        self._emergency_track_ids: Dict[str, int] = {}  # below TRACK_ID_STRIDE
+
+        # Incoming edge -> local lane IDs (lane 0 first)
+        edge_lanes: Dict[str, List[str]] = {}
+        for sumo_lane, local_id in intersection.sumo_to_local.items():
+            edge_id = sumo_lane.rpartition('_')[0]
+            edge_lanes.setdefault(edge_id, []).append(local_id)
+        self.incoming_edges = sorted(edge_lanes)
+        self._edge_lanes = [
+            sorted(edge_lanes[e], key=lambda l: int(l.rsplit('_', 1)[1]))
+            for e in self.incoming_edges
+        ]
+
+        # Per local lane: stop point, unit vector towards the stop line, length
+        self._lane_slot = {l: i for i, l in enumerate(intersection.local_lane_ids)}
+        self._geometry = {}
+        for lane_id in intersection.local_lane_ids:
+            stop = np.array(intersection.stop_lines[lane_id])
+            entry = np.array(intersection.entry_points[lane_id])
+            length = float(np.linalg.norm(stop - entry))
+            self._geometry[lane_id] = (stop, (stop - entry) / max(length, 1e-9), length)
+
+    def process_edge_aggregates(self, aggregates: EdgeAggregates) -> PerceivedFrame:
+        """
+        Convert this intersection's edge aggregates to a PerceivedFrame
+
+        Args:
+            aggregates: Rows for self.incoming_edges, in that order
+
+        Returns:
+            PerceivedFrame of pseudo-vehicles with local lane IDs
+        """
+        lanes, distances, speeds, track_ids, classes, emergency = [], [], [], [], [], []
+
+        for row, lane_ids in enumerate(self._edge_lanes):
+            count = int(aggregates.vehicle_count[row])
+            if count == 0:
+                continue
+            halting = min(int(aggregates.halting_count[row]), count)
+            moving = count - halting
+            # Edge mean speed averages halted vehicles in
+            moving_speed = aggregates.mean_speed[row] * count / moving if moving else 0.0
+
+            # Emergency vehicles are reported separately; take them out of
+            # the moving vehicles first
+            emergency_vehicles = aggregates.emergency_vehicles[row]
+            from_moving = min(len(emergency_vehicles), moving)
+            moving -= from_moving
+            halting -= min(len(emergency_vehicles) - from_moving, halting)
+
+            num_lanes = len(lane_ids)
+            for i, lane_id in enumerate(lane_ids):
+                lane_halting = halting // num_lanes + (i < halting % num_lanes)
+                lane_moving = moving // num_lanes + (i < moving % num_lanes)
+                _, _, length = self._geometry[lane_id]
+                base_id = (self._lane_slot[lane_id] + 1) * TRACK_ID_STRIDE
+
+                queue_end = lane_halting * JAM_SPACING
+                for k in range(lane_halting):
+                    lanes.append(lane_id)
+                    distances.append((k + 0.5) * JAM_SPACING)
+                    speeds.append(0.0)
+                    track_ids.append(base_id + k)
+
+                free = max(length - queue_end, 0.0)
+                for k in range(lane_moving):
+                    lanes.append(lane_id)
+                    distances.append(queue_end + free * (k + 0.5) / lane_moving)
+                    speeds.append(moving_speed)
+                    track_ids.append(base_id + _MOVING_OFFSET + k)
+
+                classes.extend(['car'] * (lane_halting + lane_moving))
+                emergency.extend([False] * (lane_halting + lane_moving))
+
+            # Emergency vehicles: behind the queue of the edge's first lane
+            track_map = self._emergency_track_ids
+            for k, (vid, vtype) in enumerate(emergency_vehicles):
+                lanes.append(lane_ids[0])
+                distances.append((-(-halting // num_lanes) + k + 0.5) * JAM_SPACING)
+                speeds.append(moving_speed if k < from_moving else 0.0)
+                track_ids.append(track_map.setdefault(vid, len(track_map) + 1))
+                classes.append(vtype)
+                emergency.append(True)
+
+        if not lanes:
+            return PerceivedFrame.empty()
+
+        distances = np.array(distances, dtype=np.float64)
+        speeds = np.array(speeds, dtype=np.float64)
+        stops = np.array([self._geometry[l][0] for l in lanes])
+        directions = np.array([self._geometry[l][1] for l in lanes])
+
+        lane_array = np.empty(len(lanes), dtype=object)
+        lane_array[:] = lanes
+        class_array = np.empty(len(classes), dtype=object)
+        class_array[:] = classes
+
+        return PerceivedFrame(
+            track_ids=np.array(track_ids, dtype=np.int64),
+            class_names=class_array,
+            is_emergency=np.array(emergency, dtype=bool),
+            confidences=np.ones(len(lanes)),
+            positions=stops - directions * distances[:, None],
+            velocities=directions * speeds[:, None],
+            lane_ids=lane_array,
+            distances_to_stop_line=distances
+        )
@@ -0,0 +1,222 @@
+"""
+ONNX export and INT8 quantization of YOLOv8 detectors, with an on-disk cache.
+
+VehicleDetector(backend='onnx') runs the detector through ONNX Runtime
+instead of eager PyTorch. Exporting (and, for int8=True, calibrating and
+quantizing) takes seconds to minutes, so the resulting .onnx files are
+kept under cache/onnx, keyed on a hash of the weights file and the export
+settings. Later detectors load the cached file directly.
+
+INT8 uses ONNX Runtime static quantization (QDQ, per-channel weights)
+calibrated on rendered frames, data/synthetic_renders by default. The
+detection head's box/class decoding stays in float; quantizing it costs
+far more accuracy than it saves time.
+
+Requires the optional packages onnx and onnxruntime.
+
+Usage:
+    path = export_onnx("yolov8n.pt", int8=True)
+    model = YOLO(str(path), task='detect')
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Iterator, Optional
+
+import cv2
+import numpy as np
+
+
+# Bump when the export or quantization settings change
+ONNX_EXPORT_VERSION = 1
+
+DEFAULT_EXPORT_DIR = Path(__file__).parent.parent / "cache" / "onnx"
+DEFAULT_CALIBRATION_DIR = Path(__file__).parent.parent / "data" / "synthetic_renders"
+
+
+def _require_onnxruntime():
+    """Import onnxruntime, with an actionable error if it is missing"""
+    try:
+        import onnx  # noqa: F401 - needed by the exporter and quantizer
+        import onnxruntime
+    except ImportError as e:
+        raise ImportError(
+            "ONNX detector backend requested but onnx/onnxruntime are not "
+            "installed (pip install onnx onnxruntime)"
+        ) from e
+    return onnxruntime
+
+
+def _source_digest(model_name: str) -> str:
+    """Hash of the weights (or model YAML) file, or of the name if not local"""
+    path = Path(model_name)
+    h = hashlib.sha256()
+    if path.is_file():
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                h.update(chunk)
+    else:
+        h.update(model_name.encode())  # Resolved (downloaded) by ultralytics
+    return h.hexdigest()[:16]
+
+
+def export_path(model_name: str, imgsz: int = 640, int8: bool = False,
+                export_dir: Optional[Path] = None) -> Path:
+    """Cache location of an export (whether or not it exists yet)"""
+    export_dir = Path(export_dir) if export_dir is not None else DEFAULT_EXPORT_DIR
+    stem = Path(model_name).stem
+    suffix = "_int8" if int8 else ""
+    return export_dir / (f"{stem}_v{ONNX_EXPORT_VERSION}_{_source_digest(model_name)}"
+                         f"_{imgsz}{suffix}.onnx")
+
+
+def export_onnx(model_name: str, imgsz: int = 640, int8: bool = False,
+                export_dir: Optional[Path] = None,
+                calibration_dir: Optional[Path] = None,
+                rebuild: bool = False) -> Path:
+    """
+    ONNX file for a YOLOv8 model, exported (and quantized) on first use
+
+    Args:
+        model_name: YOLOv8 weights or model YAML ('yolov8n.pt', ...)
+        imgsz: Square inference size baked into the export
+        int8: Return the statically quantized INT8 model
+        export_dir: Cache directory (default cache/onnx)
+        calibration_dir: Images for INT8 calibration (default data/synthetic_renders)
+        rebuild: Ignore a cached file and export again
+
+    Returns:
+        Path of the cached .onnx file
+    """
+    _require_onnxruntime()
+    path = export_path(model_name, imgsz, int8, export_dir)
+    if path.exists() and not rebuild:
+        return path
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    if int8:
+        fp32_path = export_onnx(model_name, imgsz, False, export_dir, rebuild=rebuild)
+        _atomic_build(path, lambda tmp: quantize_int8(
+            fp32_path, tmp, calibration_dir or DEFAULT_CALIBRATION_DIR, imgsz
+        ))
+        return path
+
+    from ultralytics import YOLO
+
+    def build(tmp: Path):
+        # The exporter writes next to the weights (the working directory
+        # for YAML models); export a private copy of local weights so the
+        # user's directory is left alone
+        with tempfile.TemporaryDirectory() as scratch:
+            source = model_name
+            if Path(model_name).is_file():
+                source = shutil.copy(model_name, scratch)
+            exported = YOLO(source).export(
+                format='onnx', imgsz=imgsz, dynamic=True, simplify=False,
+                verbose=False
+            )
+            shutil.move(str(exported), tmp)
+
+    _atomic_build(path, build)
+    return path
+
+
+def _atomic_build(path: Path, build):
+    """Run build(tmp_path), then move the result into place"""
+    tmp_path = path.with_name(f".tmp{os.getpid()}_{path.name}")
+    try:
+        build(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def letterbox(image: np.ndarray, imgsz: int = 640) -> np.ndarray:
+    """
+    RGB (H, W, 3) uint8 -> (1, 3, imgsz, imgsz) float32 model input
+
+    Same preprocessing as the ultralytics predictor: aspect-preserving
+    resize, centered gray (114) padding, scaling to [0, 1].
+    """
+    h, w = image.shape[:2]
+    scale = min(imgsz / h, imgsz / w)
+    new_w, new_h = round(w * scale), round(h * scale)
+    resized = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+
+    top = (imgsz - new_h) // 2
+    left = (imgsz - new_w) // 2
+    canvas = np.full((imgsz, imgsz, 3), 114, dtype=np.uint8)
+    canvas[top:top + new_h, left:left + new_w] = resized
+    return (canvas.transpose(2, 0, 1)[None].astype(np.float32) / 255.0)
+
+
+def calibration_images(calibration_dir: Path) -> Iterator[np.ndarray]:
+    """RGB frames for calibration (PNG/JPG files, sorted by name)"""
+    files = sorted(p for p in Path(calibration_dir).iterdir()
+                   if p.suffix.lower() in ('.png', '.jpg', '.jpeg'))
+    if not files:
+        raise ValueError(f"No calibration images in {calibration_dir}")
+    for file in files:
+        yield cv2.cvtColor(cv2.imread(str(file)), cv2.COLOR_BGR2RGB)
+
+
+def quantize_int8(fp32_path: Path, output_path: Path, calibration_dir: Path,
+                  imgsz: int = 640):
+    """
+    Static INT8 quantization of an exported YOLOv8 model
+
+    Convolutions (including the detection head's) are quantized; the
+    head's decoding nodes (DFL softmax, sigmoid, box arithmetic, concat)
+    stay float. Model metadata (class names, stride) is carried over so
+    ultralytics can load the result like the float model.
+    """
+    onnxruntime = _require_onnxruntime()
+    import onnx
+    from onnxruntime.quantization import (
+        CalibrationDataReader, QuantFormat, QuantType, quantize_static
+    )
+    from onnxruntime.quantization.shape_inference import quant_pre_process
+
+    input_name = onnxruntime.InferenceSession(
+        str(fp32_path), providers=['CPUExecutionProvider']
+    ).get_inputs()[0].name
+
+    class _Reader(CalibrationDataReader):
+        def __init__(self):
+            self._batches = ({input_name: letterbox(image, imgsz)}
+                             for image in calibration_images(calibration_dir))
+
+        def get_next(self):
+            return next(self._batches, None)
+
+    with tempfile.TemporaryDirectory() as scratch:
+        # Constant folding and shape inference first, so conv biases are
+        # initializers the quantizer can fold
+        prepared_path = os.path.join(scratch, "prepared.onnx")
+        quant_pre_process(str(fp32_path), prepared_path, skip_symbolic_shape=True)
+
+        model = onnx.load(prepared_path)
+        head = max(int(n.name.split('/')[1].split('.')[1]) for n in model.graph.node
+                   if n.name.startswith('/model.'))
+        float_nodes = [n.name for n in model.graph.node
+                       if n.name.startswith(f'/model.{head}/') and n.op_type != 'Conv']
+
+        quantize_static(
+            prepared_path, str(output_path), _Reader(),
+            quant_format=QuantFormat.QDQ,
+            per_channel=True,
+            activation_type=QuantType.QUInt8,
+            weight_type=QuantType.QInt8,
+            nodes_to_exclude=float_nodes
+        )
+
+    model = onnx.load(str(fp32_path))
+    quantized = onnx.load(str(output_path))
+    if not quantized.metadata_props:
+        for prop in model.metadata_props:
+            quantized.metadata_props.add(key=prop.key, value=prop.value)
+        onnx.save(quantized, str(output_path))
@@ -0,0 +1,113 @@
+"""
+Columnar perception output.
+
+PerceivedFrame carries the same information as a List[PerceivedVehicle],
+stored as one NumPy array per field. Perception adapters can produce it
+and state estimation can consume it without creating (and validating) a
+Python object per vehicle. Iterating yields frozen PerceivedVehicle
+objects for callers that need the per-vehicle interface.
+"""
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from perception.types import PerceivedVehicle
+
+
+@dataclass
+class PerceivedFrame:
+    """
+    Struct-of-arrays equivalent of List[PerceivedVehicle].
+    
+    Field Guarantees (per row, same as PerceivedVehicle):
+        - lane_ids[i] is None when the vehicle is not in an approach lane,
+          and then distances_to_stop_line[i] == -1.0
+        - confidences in [0, 1]
+    """
+    track_ids: np.ndarray               # (N,) int64
+    class_names: np.ndarray             # (N,) object
+    is_emergency: np.ndarray            # (N,) bool
+    confidences: np.ndarray             # (N,) float64
+    positions: np.ndarray               # (N, 2) float64 - world (x, y)
+    velocities: np.ndarray              # (N, 2) float64 - world (vx, vy)
+    lane_ids: np.ndarray                # (N,) object - str or None
+    distances_to_stop_line: np.ndarray  # (N,) float64
+    bboxes: Optional[np.ndarray] = None  # (N, 4) float64, None = all zero
+    
+    def __len__(self) -> int:
+        return len(self.track_ids)
+    
+    def __getitem__(self, i: int) -> PerceivedVehicle:
+        """Materialize a single row as a validated PerceivedVehicle"""
+        bbox = (0, 0, 0, 0) if self.bboxes is None else tuple(self.bboxes[i].tolist())
+        lane_id = self.lane_ids[i]
+        
+        return PerceivedVehicle(
+            track_id=int(self.track_ids[i]),
+            class_name=self.class_names[i],
+            is_emergency=bool(self.is_emergency[i]),
+            confidence=float(self.confidences[i]),
+            position=(float(self.positions[i, 0]), float(self.positions[i, 1])),
+            velocity=(float(self.velocities[i, 0]), float(self.velocities[i, 1])),
+            lane_id=lane_id,
+            distance_to_stop_line=float(self.distances_to_stop_line[i]),
+            bbox=bbox
+        )
+    
+    def __iter__(self):
+        for i in range(len(self.track_ids)):
+            yield self[i]
+    
+    @property
+    def speeds(self) -> np.ndarray:
+        """(N,) speed magnitude in m/s"""
+        return np.sqrt(self.velocities[:, 0]**2 + self.velocities[:, 1]**2)
+    
+    def to_vehicles(self) -> List[PerceivedVehicle]:
+        """Materialize every row (for legacy callers)"""
+        return list(self)
+    
+    @classmethod
+    def from_vehicles(cls, vehicles: List) -> 'PerceivedFrame':
+        """
+        Build frame from PerceivedVehicle-like objects.
+        
+        Accepts any objects with the PerceivedVehicle attributes, including
+        the legacy ground_truth_perception.PerceivedVehicle.
+        """
+        if not vehicles:
+            return cls.empty()
+        
+        lane_ids = np.empty(len(vehicles), dtype=object)
+        lane_ids[:] = [v.lane_id for v in vehicles]
+        class_names = np.empty(len(vehicles), dtype=object)
+        class_names[:] = [v.class_name for v in vehicles]
+        
+        return cls(
+            track_ids=np.array([v.track_id for v in vehicles], dtype=np.int64),
+            class_names=class_names,
+            is_emergency=np.array([v.is_emergency for v in vehicles], dtype=bool),
+            confidences=np.array([v.confidence for v in vehicles], dtype=np.float64),
+            positions=np.array([v.position for v in vehicles], dtype=np.float64),
+            velocities=np.array([v.velocity for v in vehicles], dtype=np.float64),
+            lane_ids=lane_ids,
+            distances_to_stop_line=np.array(
+                [v.distance_to_stop_line for v in vehicles], dtype=np.float64
+            ),
+            bboxes=np.array([v.bbox for v in vehicles], dtype=np.float64)
+        )
+    
+    @classmethod
+    def empty(cls) -> 'PerceivedFrame':
+        """Frame with zero vehicles"""
+        return cls(
+            track_ids=np.empty(0, dtype=np.int64),
+            class_names=np.empty(0, dtype=object),
+            is_emergency=np.empty(0, dtype=bool),
+            confidences=np.empty(0),
+            positions=np.empty((0, 2)),
+            velocities=np.empty((0, 2)),
+            lane_ids=np.empty(0, dtype=object),
+            distances_to_stop_line=np.empty(0)
+        )
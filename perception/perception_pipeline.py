@@ -12,13 +12,19 @@ from perception.emergency_detection import EmergencyVehicleDetector
 from perception.detector import VehicleDetector
 from perception.tracker import ByteTracker, Track
 from perception.lane_mapper import LaneMapper
+from perception.lane_roi_detector import LaneROIDetector
 from perception.distance_estimator import KalmanDistanceEstimator
+from perception.keyframe_policy import KeyframePolicy
 
 
 class PerceptionPipeline:
     """
     Complete perception pipeline.
     Frame → Detections → Tracks → Lane Assignment → Structured Output
+    
+    With a KeyframePolicy the detector runs only on keyframes; in between,
+    tracks are propagated by the tracker's and Kalman filters' motion
+    models (Track.predicted).
     """
     
     def __init__(self,
@@ -26,7 +32,11 @@ class PerceptionPipeline:
                  camera_scale: float,
                  intersection_center: Tuple[float, float],
                  model_name: str = 'yolov8n.pt',
-                 device: str = 'mps'):
+                 device: str = 'mps',
+                 detector=None,
+                 lane_roi: bool = False,
+                 roi_margin: float = 6.0,
+                 keyframe_policy: Optional[KeyframePolicy] = None):
         """
         Initialize perception pipeline
         
@@ -36,14 +46,40 @@ class PerceptionPipeline:
             intersection_center: Center of intersection in world coords
             model_name: YOLOv8 model
             device: Computing device
+            detector: Shared detector, e.g. a BatchingDetector serving
+                several cameras (None = own VehicleDetector from
+                model_name/device)
+            lane_roi: Detect only in the approach-lane crops (LaneROIDetector);
+                needs a VehicleDetector, not a BatchingDetector
+            roi_margin: Meters kept around the lanes in each crop
+            keyframe_policy: Run the detector only on keyframes chosen by
+                this policy (None = detect every frame)
         """
+        if lane_roi and detector is not None and not hasattr(detector, 'imgsz'):
+            # The crop mosaic is inferred at its own size: detect(..., imgsz=)
+            raise ValueError(
+                f"lane_roi needs a detector with an imgsz (e.g. VehicleDetector), "
+                f"got {type(detector).__name__}"
+            )
+        
         print("Initializing Perception Pipeline...")
         
         # Initialize components
-        self.detector = VehicleDetector(model_name=model_name, device=device)
+        self.detector = detector or VehicleDetector(model_name=model_name, device=device)
         self.tracker = ByteTracker(track_thresh=0.5, track_buffer=30, match_thresh=0.8)
         self.lane_mapper = LaneMapper(config_path)
         self.distance_estimator = KalmanDistanceEstimator(dt=0.1)
+        self.roi_detector = LaneROIDetector(
+            self.detector, self.lane_mapper, camera_scale, intersection_center,
+            margin=roi_margin
+        ) if lane_roi else None
+        
+        # Keyframe scheduling
+        self.keyframe_policy = keyframe_policy
+        self._interval = 1
+        self._frames_since_keyframe = 0
+        self.frames = 0
+        self.keyframes = 0
         
         # Camera parameters
         self.camera_scale = camera_scale
@@ -63,24 +99,40 @@ class PerceptionPipeline:
         Returns:
             List of perceived vehicles with complete information
         """
-        # 1. Detect vehicles
-        detections = self.detector.detect(frame, conf_threshold=0.3)
+        self.frames += 1
         
-        # 2. Track vehicles
-        tracks = self.tracker.update(detections)
+        if self._is_keyframe():
+            self.keyframes += 1
+            self._frames_since_keyframe = 0
+            
+            # 1. Detect vehicles (approach-lane crops only with lane_roi)
+            if self.roi_detector is not None:
+                detections = self.roi_detector.detect(frame, conf_threshold=0.3,
+                                                      image_center=image_center)
+            else:
+                detections = self.detector.detect(frame, conf_threshold=0.3)
+            
+            # 2. Track vehicles (DetectionBatch arrays, no per-detection objects)
+            tracks = self.tracker.update(detections)
+        else:
+            # 1-2. No detection: propagate tracks by their motion model
+            tracks = self.tracker.predict()
         
         # 3. Process each track
         perceived_vehicles = []
         for track in tracks:
-            # Convert bbox center to world coordinates
-            world_pos = self._image_to_world(track.bbox, image_center)
-            
             # Estimate velocity in world coordinates
             world_vel = self._velocity_to_world(track.velocity)
             
-            # Update Kalman filter
-            smoothed_x, smoothed_y, smooth_vx, smooth_vy = \
-                self.distance_estimator.update(track.track_id, world_pos)
+            # Update Kalman filter (predict only for propagated tracks)
+            if track.predicted and track.track_id in self.distance_estimator.filters:
+                smoothed_x, smoothed_y, smooth_vx, smooth_vy = \
+                    self.distance_estimator.predict(track.track_id)
+            else:
+                # Convert bbox center to world coordinates
+                world_pos = self._image_to_world(track.bbox, image_center)
+                smoothed_x, smoothed_y, smooth_vx, smooth_vy = \
+                    self.distance_estimator.update(track.track_id, world_pos)
             
             # Assign to lane
             lane_id = self.lane_mapper.assign_lane((smoothed_x, smoothed_y))
@@ -112,8 +164,38 @@ class PerceptionPipeline:
             )
             perceived_vehicles.append(vehicle)
         
+        if self.keyframe_policy is not None:
+            self._interval = self.keyframe_policy.interval(perceived_vehicles)
+        
         return perceived_vehicles
     
+    def _is_keyframe(self) -> bool:
+        """Whether this frame runs the detector"""
+        self._frames_since_keyframe += 1
+        if self.keyframe_policy is None or self.keyframes == 0:
+            return True
+        if self._frames_since_keyframe >= self._interval:
+            return True
+        
+        # Keyframe early once any track's position estimate is too uncertain;
+        # unconfirmed tracks (no Kalman filter yet) have no motion estimate
+        threshold = self.keyframe_policy.uncertainty_threshold
+        filters = self.distance_estimator.filters
+        return any(
+            track.track_id not in filters or
+            self.distance_estimator.position_std(track.track_id) > threshold
+            for track in self.tracker.tracked_tracks
+        )
+    
+    def get_statistics(self) -> dict:
+        """Detector scheduling statistics"""
+        return {
+            'frames': self.frames,
+            'keyframes': self.keyframes,
+            'keyframe_ratio': self.keyframes / max(self.frames, 1),
+            'current_interval': self._interval
+        }
+    
     def _image_to_world(self, bbox: Tuple[float, float, float, float],
                        image_center: Tuple[int, int]) -> Tuple[float, float]:
         """Convert bounding box center from image to world coordinates"""
@@ -183,3 +265,7 @@ class PerceptionPipeline:
         """Reset pipeline state"""
         self.tracker.reset()
         self.distance_estimator.reset()
+        self._interval = 1
+        self._frames_since_keyframe = 0
+        self.frames = 0
+        self.keyframes = 0
@@ -8,12 +8,13 @@ Author: Architecture Review Day 1
 Date: 2026-02-14
 """
 import numpy as np
-from typing import List, Dict
+from typing import List, Dict, Optional
 from perception.base import PerceptionAdapter
 from perception.types import PerceivedVehicle
+from perception.perceived_frame import PerceivedFrame
 from perception.emergency_detection import EmergencyVehicleDetector
 from perception.lane_mapper import LaneMapper
-from simulation.sumo_interface import SUMOInterface
+from simulation.sumo_interface import SUMOInterface, VehicleFrame
 
 
 class SumoPerceptionAdapter(PerceptionAdapter):
@@ -117,6 +118,37 @@ class SumoPerceptionAdapter(PerceptionAdapter):
         
         return perceived
     
+    def perceive_frame(self, timestamp: float,
+                       vehicle_frame: Optional[VehicleFrame] = None) -> PerceivedFrame:
+        """
+        Columnar variant of perceive().
+        
+        Same information as perceive(), computed with array operations and
+        returned as a PerceivedFrame, so no per-vehicle objects are built.
+        
+        Args:
+            timestamp: Current simulation time (seconds)
+            vehicle_frame: Already-fetched SUMO frame for this step
+                (None = query SUMO)
+        
+        Returns:
+            PerceivedFrame with one row per vehicle
+        """
+        self._perceive_call_count += 1
+        
+        if vehicle_frame is None:
+            vehicle_frame = self.sumo.get_vehicle_frame()
+        
+        if len(vehicle_frame) == 0:
+            return PerceivedFrame.empty()
+        
+        track_ids = np.fromiter(
+            (self._get_track_id(vid) for vid in vehicle_frame.ids),
+            dtype=np.int64, count=len(vehicle_frame)
+        )
+        
+        return vehicle_frame_to_perceived(vehicle_frame, track_ids, self.lane_mapper)
+    
     def reset(self):
         """Reset track ID mapping for new simulation episode."""
         self._track_id_map.clear()
@@ -147,3 +179,49 @@ class SumoPerceptionAdapter(PerceptionAdapter):
             self._next_track_id += 1
         
         return self._track_id_map[sumo_vehicle_id]
+
+
+def vehicle_frame_to_perceived(vehicle_frame: VehicleFrame,
+                               track_ids: np.ndarray,
+                               lane_mapper: LaneMapper,
+                               lane_ids: Optional[np.ndarray] = None) -> PerceivedFrame:
+    """
+    Ground-truth conversion of a SUMO VehicleFrame to a PerceivedFrame.
+    
+    Shared by the live adapter and trace replay so both produce identical
+    output for identical input.
+    
+    Args:
+        vehicle_frame: SUMO vehicle state (one row per vehicle)
+        track_ids: (N,) integer track ID per row
+        lane_mapper: Lane geometry and assignment logic
+        lane_ids: Known intersection lane per row (None = assign from
+            position with lane_mapper)
+    
+    Returns:
+        PerceivedFrame with one row per vehicle
+    """
+    # Lane assignment and stop-line distance for all vehicles at once
+    if lane_ids is None:
+        lane_ids = lane_mapper.assign_lanes(vehicle_frame.x, vehicle_frame.y)
+    distances = lane_mapper.get_distances_to_stop_line(
+        vehicle_frame.x, vehicle_frame.y, lane_ids
+    )
+    
+    # Convert velocity from speed+angle to Cartesian (vx, vy)
+    angle_rad = np.radians(vehicle_frame.angle)
+    velocities = np.column_stack((
+        vehicle_frame.speed * np.sin(angle_rad),
+        vehicle_frame.speed * np.cos(angle_rad)
+    ))
+    
+    return PerceivedFrame(
+        track_ids=track_ids,
+        class_names=vehicle_frame.types,
+        is_emergency=EmergencyVehicleDetector.is_emergency_gt_array(vehicle_frame.types),
+        confidences=np.ones(len(vehicle_frame)),
+        positions=vehicle_frame.positions,
+        velocities=velocities,
+        lane_ids=lane_ids,
+        distances_to_stop_line=distances
+    )
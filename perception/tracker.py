@@ -1,6 +1,7 @@
 """
 ByteTrack object tracker.
 Associates detections across frames to track vehicles.
+Consumes DetectionBatch arrays directly; IoU matching is vectorized.
 """
 
 import numpy as np
@@ -9,6 +10,8 @@ from dataclasses import dataclass
 from collections import defaultdict
 import lap  # Linear assignment
 
+from perception.detection_batch import DetectionBatch, box_iou_matrix
+
 
 @dataclass  
 class Track:
@@ -21,6 +24,7 @@ class Track:
     hits: int  # Number of successful associations
     time_since_update: int  # Frames since last update
     velocity: Tuple[float, float] = (0.0, 0.0)  # dx, dy per frame
+    predicted: bool = False  # bbox propagated by predict(), not detected
 
 
 class ByteTracker:
@@ -52,21 +56,26 @@ class ByteTracker:
         self.frame_id = 0
         self.track_id_count = 0
     
-    def update(self, detections: List) -> List[Track]:
+    def update(self, detections: DetectionBatch) -> List[Track]:
         """
         Update tracker with new detections
         
         Args:
-            detections: List of Detection objects from detector
+            detections: DetectionBatch from detector (a List[Detection]
+                is converted)
             
         Returns:
             List of active tracks
         """
+        if not isinstance(detections, DetectionBatch):
+            detections = DetectionBatch.from_detections(detections)
+        
         self.frame_id += 1
         
         # Split detections by confidence
-        high_conf_dets = [d for d in detections if d.confidence >= self.track_thresh]
-        low_conf_dets = [d for d in detections if d.confidence < self.track_thresh]
+        high_mask = detections.confidences >= self.track_thresh
+        high_conf_dets = detections.select(high_mask)
+        low_conf_dets = detections.select(~high_mask)
         
         # Predict existing tracks
         for track in self.tracked_tracks:
@@ -74,33 +83,28 @@ class ByteTracker:
         
         # First association with high confidence detections
         matches, unmatched_tracks, unmatched_dets = self._associate(
-            self.tracked_tracks, high_conf_dets, self.match_thresh
+            self.tracked_tracks, high_conf_dets.boxes, self.match_thresh
         )
         
         # Update matched tracks
         for track_idx, det_idx in matches:
-            track = self.tracked_tracks[track_idx]
-            det = high_conf_dets[det_idx]
-            self._update_track(track, det)
+            self._update_track(self.tracked_tracks[track_idx], high_conf_dets, det_idx)
         
         # Second association with low confidence detections
         if len(unmatched_tracks) > 0 and len(low_conf_dets) > 0:
             unmatched_track_objs = [self.tracked_tracks[i] for i in unmatched_tracks]
             matches_low, unmatched_tracks_low, _ = self._associate(
-                unmatched_track_objs, low_conf_dets, 0.5
+                unmatched_track_objs, low_conf_dets.boxes, 0.5
             )
             
             for track_idx, det_idx in matches_low:
-                track = unmatched_track_objs[track_idx]
-                det = low_conf_dets[det_idx]
-                self._update_track(track, det)
+                self._update_track(unmatched_track_objs[track_idx], low_conf_dets, det_idx)
             
             unmatched_tracks = [unmatched_tracks[i] for i in unmatched_tracks_low]
         
         # Initialize new tracks from unmatched high-confidence detections
         for det_idx in unmatched_dets:
-            det = high_conf_dets[det_idx]
-            new_track = self._init_track(det)
+            new_track = self._init_track(high_conf_dets, det_idx)
             self.tracked_tracks.append(new_track)
         
         # Move unmatched tracks to lost
@@ -109,8 +113,9 @@ class ByteTracker:
             self.lost_tracks.append(track)
         
         # Remove lost tracks exceeding buffer
+        lost = set(unmatched_tracks)
         self.tracked_tracks = [t for i, t in enumerate(self.tracked_tracks) 
-                             if i not in unmatched_tracks]
+                             if i not in lost]
         
         # Remove old lost tracks
         self.lost_tracks = [t for t in self.lost_tracks 
@@ -120,97 +125,102 @@ class ByteTracker:
         active_tracks = [t for t in self.tracked_tracks if t.hits >= 2]
         return active_tracks
     
-    def _associate(self, tracks: List[Track], detections: List, 
+    def predict(self) -> List[Track]:
+        """
+        Advance tracker one frame without detections
+        
+        For frames the detector skips (keyframe mode): tracked boxes move
+        by their per-frame velocity and are marked predicted until the
+        next update() matches them to a detection.
+        
+        Returns:
+            List of active tracks
+        """
+        self.frame_id += 1
+        
+        for track in self.tracked_tracks:
+            dx, dy = track.velocity
+            x1, y1, x2, y2 = track.bbox
+            track.bbox = (x1 + dx, y1 + dy, x2 + dx, y2 + dy)
+            track.time_since_update += 1
+            track.predicted = True
+        
+        return [t for t in self.tracked_tracks if t.hits >= 2]
+    
+    def _associate(self, tracks: List[Track], boxes: np.ndarray,
                   thresh: float) -> Tuple[List, List, List]:
         """
-        Associate tracks with detections using IoU
+        Associate tracks with detection boxes (N, 4) using IoU
         
         Returns:
             matches: List of (track_idx, det_idx) pairs
             unmatched_tracks: List of track indices
             unmatched_dets: List of detection indices
         """
-        if len(tracks) == 0 or len(detections) == 0:
-            return [], list(range(len(tracks))), list(range(len(detections)))
+        if len(tracks) == 0 or len(boxes) == 0:
+            return [], list(range(len(tracks))), list(range(len(boxes)))
         
-        # Compute IoU matrix
-        iou_matrix = np.zeros((len(tracks), len(detections)))
-        for t_idx, track in enumerate(tracks):
-            for d_idx, det in enumerate(detections):
-                iou_matrix[t_idx, d_idx] = self._iou(track.bbox, det.bbox)
+        # IoU matrix in one vectorized step
+        track_boxes = np.array([track.bbox for track in tracks], dtype=np.float64)
+        iou_matrix = box_iou_matrix(track_boxes, boxes)
         
         # Hungarian algorithm for assignment
-        if iou_matrix.size > 0:
-            # Use lap for linear assignment (faster than scipy)
-            # Cost matrix = 1 - IoU (minimize cost = maximize IoU)
-            cost_matrix = 1 - iou_matrix
-            _, x, y = lap.lapjv(cost_matrix, extend_cost=True, cost_limit=1 - thresh)
-            
-            matches = [[ix, mx] for ix, mx in enumerate(x) if mx >= 0 and iou_matrix[ix, mx] >= thresh]
-        else:
-            matches = []
-        
-        # Find unmatched tracks and detections
-        unmatched_tracks = [i for i in range(len(tracks)) 
-                          if i not in [m[0] for m in matches]]
-        unmatched_dets = [i for i in range(len(detections)) 
-                        if i not in [m[1] for m in matches]]
+        # Use lap for linear assignment (faster than scipy)
+        # Cost matrix = 1 - IoU (minimize cost = maximize IoU)
+        cost_matrix = 1 - iou_matrix
+        _, x, _ = lap.lapjv(cost_matrix, extend_cost=True, cost_limit=1 - thresh)
         
-        return matches, unmatched_tracks, unmatched_dets
-    
-    def _iou(self, bbox1: Tuple[float, float, float, float],
-            bbox2: Tuple[float, float, float, float]) -> float:
-        """Calculate IoU between two bounding boxes"""
-        x1_min, y1_min, x1_max, y1_max = bbox1
-        x2_min, y2_min, x2_max, y2_max = bbox2
-        
-        # Intersection
-        inter_x_min = max(x1_min, x2_min)
-        inter_y_min = max(y1_min, y2_min)
-        inter_x_max = min(x1_max, x2_max)
-        inter_y_max = min(y1_max, y2_max)
-        
-        if inter_x_max < inter_x_min or inter_y_max < inter_y_min:
-            return 0.0
+        track_idx = np.flatnonzero(x >= 0)
+        det_idx = x[track_idx]
+        good = iou_matrix[track_idx, det_idx] >= thresh
+        track_idx, det_idx = track_idx[good], det_idx[good]
+        matches = [[int(t), int(d)] for t, d in zip(track_idx, det_idx)]
         
-        inter_area = (inter_x_max - inter_x_min) * (inter_y_max - inter_y_min)
-        
-        # Union
-        bbox1_area = (x1_max - x1_min) * (y1_max - y1_min)
-        bbox2_area = (x2_max - x2_min) * (y2_max - y2_min)
-        union_area = bbox1_area + bbox2_area - inter_area
+        # Find unmatched tracks and detections
+        track_matched = np.zeros(len(tracks), dtype=bool)
+        track_matched[track_idx] = True
+        det_matched = np.zeros(len(boxes), dtype=bool)
+        det_matched[det_idx] = True
         
-        return inter_area / union_area if union_area > 0 else 0.0
+        return (matches, np.flatnonzero(~track_matched).tolist(),
+                np.flatnonzero(~det_matched).tolist())
     
-    def _init_track(self, detection) -> Track:
-        """Initialize new track from detection"""
+    def _init_track(self, detections: DetectionBatch, i: int) -> Track:
+        """Initialize new track from row i of detections"""
         self.track_id_count += 1
         
         return Track(
             track_id=self.track_id_count,
-            bbox=detection.bbox,
-            confidence=detection.confidence,
-            class_name=detection.class_name,
+            bbox=tuple(detections.boxes[i].tolist()),
+            confidence=float(detections.confidences[i]),
+            class_name=detections.class_names[i],
             age=1,
             hits=1,
             time_since_update=0,
             velocity=(0.0, 0.0)
         )
     
-    def _update_track(self, track: Track, detection):
-        """Update existing track with new detection"""
-        # Calculate velocity
+    def _update_track(self, track: Track, detections: DetectionBatch, i: int):
+        """Update existing track with row i of detections"""
+        bbox = tuple(detections.boxes[i].tolist())
+        
+        # Calculate velocity over the frames since the last detection,
+        # undoing any predict() drift since then
+        steps = max(track.time_since_update, 1)
         old_center = self._bbox_center(track.bbox)
-        new_center = self._bbox_center(detection.bbox)
-        velocity = (new_center[0] - old_center[0], new_center[1] - old_center[1])
+        new_center = self._bbox_center(bbox)
+        last_x = old_center[0] - track.velocity[0] * (steps - 1)
+        last_y = old_center[1] - track.velocity[1] * (steps - 1)
+        velocity = ((new_center[0] - last_x) / steps, (new_center[1] - last_y) / steps)
         
         # Update track
-        track.bbox = detection.bbox
-        track.confidence = detection.confidence
+        track.bbox = bbox
+        track.confidence = float(detections.confidences[i])
         track.age += 1
         track.hits += 1
         track.time_since_update = 0
         track.velocity = velocity
+        track.predicted = False
     
     def _bbox_center(self, bbox: Tuple[float, float, float, float]) -> Tuple[float, float]:
         """Get center point of bounding box"""
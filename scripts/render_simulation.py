@@ -2,17 +2,21 @@
 """
 Offscreen SUMO simulation renderer with Adaptive + Emergency controller.
 
-Renders simulation to PNG sequence and creates MP4 video.
+Streams rendered frames straight into an MP4 encoder (ffmpeg stdin or
+cv2.VideoWriter), or writes a PNG sequence and encodes it afterwards.
+With --output trace nothing is drawn: the run is recorded to an annotated
+trace for parallel offline rendering with scripts/render_trace.py.
 Works headlessly on macOS.
 
 Corrected Day 3.5: Fixed to use SumoPerceptionAdapter instead of removed GroundTruthPerception
 
 Usage:
-    python scripts/render_simulation.py
+    python scripts/render_simulation.py [--output stream|png|trace] [--encoder auto|ffmpeg|opencv]
 
 Output:
-    output/frames/frame_XXXXXX.png
     output/adaptive_emergency_demo.mp4
+    output/frames/frame_XXXXXX.png (--output png only)
+    output/adaptive_emergency_demo.npz (--output trace only)
 """
 
 import sys
@@ -26,6 +30,9 @@ sys.path.insert(0, str(project_root))
 
 from simulation.sumo_interface import SUMOInterface
 from simulation.annotated_camera import AnnotatedCamera
+from simulation.scheduler import MultiRateScheduler
+from simulation.trace import TraceRecorder
+from simulation.video_writer import StreamingVideoWriter, SUPPORTED_ENCODERS
 from perception.sumo_adapter import SumoPerceptionAdapter
 from perception.lane_mapper import LaneMapper
 from state_estimation.state_estimator import TrafficStateEstimator
@@ -35,14 +42,24 @@ from control.signal_controller import IntegratedSignalController
 class SimulationRenderer:
     """Renders SUMO simulation with controller to video"""
     
-    def __init__(self, duration: float = 120.0):
+    def __init__(self, duration: float = 120.0, output: str = 'stream',
+                 encoder: str = 'auto'):
         """
         Initialize renderer
         
         Args:
             duration: Simulation duration in seconds
+            output: 'stream' (encode frames as they are rendered), 'png'
+                (write a PNG sequence, encode with ffmpeg afterwards) or
+                'trace' (record an annotated trace, render nothing)
+            encoder: Streaming encoder ('auto', 'ffmpeg' or 'opencv')
         """
+        if output not in ('stream', 'png', 'trace'):
+            raise ValueError(f"output must be 'stream', 'png' or 'trace', got '{output}'")
+        
         self.duration = duration
+        self.output = output
+        self.encoder = encoder
         
         # Paths
         self.config_file = str(project_root / "sumo_networks" / "simple_4way" / "sumo.cfg")
@@ -52,16 +69,23 @@ class SimulationRenderer:
         self.output_dir = project_root / "output"
         self.frames_dir = self.output_dir / "frames"
         self.video_path = self.output_dir / "adaptive_emergency_demo.mp4"
+        self.trace_path = self.output_dir / "adaptive_emergency_demo.npz"
         
         # Create output directories
-        self.frames_dir.mkdir(parents=True, exist_ok=True)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        if output == 'png':
+            self.frames_dir.mkdir(parents=True, exist_ok=True)
         
         print("="*70)
         print("OFFSCREEN SIMULATION RENDERER")
         print("="*70)
         print(f"Duration: {duration}s")
-        print(f"Frames dir: {self.frames_dir}")
-        print(f"Video output: {self.video_path}")
+        if output == 'png':
+            print(f"Frames dir: {self.frames_dir}")
+        if output == 'trace':
+            print(f"Trace output: {self.trace_path}")
+        else:
+            print(f"Video output: {self.video_path}")
         print("="*70)
     
     def render(self):
@@ -96,8 +120,32 @@ class SimulationRenderer:
         emergency_spawned = False
         emergency_spawn_time = 60.0
         
+        # Rendering runs every SUMO step (10 fps video); perception, state
+        # estimation and control run at their own rates
+        scheduler = MultiRateScheduler(base_rate=10.0, rates={
+            'state_estimation': 2.0,
+            'control': 1.0
+        })
+        intersection_state = None
+        signal_state = None
+        status = None
+        
         frame_count = 0
-        steps = int(self.duration * 10)  # 0.1s per step
+        steps = int(round(self.duration / scheduler.step_length))
+        
+        # Streaming: frames go to the encoder thread as they are rendered
+        video = None
+        if self.output == 'stream':
+            video = StreamingVideoWriter(str(self.video_path), camera.image_size,
+                                         fps=1.0 / scheduler.step_length,
+                                         encoder=self.encoder)
+            print(f"  Streaming to {video.encoder} encoder")
+        
+        # Trace: record what each frame would show, draw it later in parallel
+        recorder = None
+        if self.output == 'trace':
+            recorder = TraceRecorder(str(self.trace_path), sumo.intersection_pos,
+                                     step_length=scheduler.step_length)
         
         print(f"\n2. Rendering {steps} frames ({self.duration}s)...")
         start_time = time_module.time()
@@ -107,6 +155,7 @@ class SimulationRenderer:
                 # Advance simulation
                 sumo.step()
                 current_time = sumo.get_current_time()
+                due = scheduler.tick()
                 
                 # Spawn emergency vehicle
                 if not emergency_spawned and current_time >= emergency_spawn_time:
@@ -114,27 +163,33 @@ class SimulationRenderer:
                     sumo.add_emergency_vehicle(route_id="N_S", vtype="ambulance")
                     emergency_spawned = True
                 
-                # === PERCEPTION (for controller) ===
-                # Use frozen perception interface: .perceive(timestamp)
-                perceived_vehicles = perception.perceive(current_time)
-                
-                # === STATE ESTIMATION ===
-                intersection_state = state_estimator.update(perceived_vehicles, current_time)
-                
-                # === CONTROL ===
-                # Controller returns SUMO signal state string (12 chars)
-                signal_state = controller.update(intersection_state, current_time)
+                if 'state_estimation' in due:
+                    # === PERCEPTION (for controller) ===
+                    # Use frozen perception interface: .perceive(timestamp)
+                    perceived_vehicles = perception.perceive(current_time)
+                    
+                    # === STATE ESTIMATION ===
+                    intersection_state = state_estimator.update(
+                        perceived_vehicles, current_time, dt=due['state_estimation']
+                    )
                 
-                # Apply signal to SUMO
-                sumo.set_traffic_light_state(signal_state)
+                if 'control' in due:
+                    # === CONTROL ===
+                    # Controller returns SUMO signal state string (12 chars)
+                    signal_state = controller.update(
+                        intersection_state, current_time, dt=due['control']
+                    )
+                    
+                    # Apply signal to SUMO (held until the next control update)
+                    sumo.set_traffic_light_state(signal_state)
+                    
+                    # Get controller status for annotations
+                    status = controller.get_status()
                 
                 # === RENDERING (separate from perception) ===
                 # Get raw SUMO vehicles for rendering (VehicleInfo objects)
                 sumo_vehicles = sumo.get_all_vehicles()
                 
-                # Get controller status for annotations
-                status = controller.get_status()
-                
                 # Prepare stats for overlay
                 stats = {
                     'vehicles': intersection_state.total_vehicles,
@@ -144,16 +199,30 @@ class SimulationRenderer:
                 if status['emergency_distance']:
                     stats['emergency_distance'] = status['emergency_distance']
                 
-                # Save annotated frame (single write per timestep)
-                frame_filename = self.frames_dir / f"frame_{frame_count:06d}.png"
-                camera.save_annotated_frame(
-                    vehicles=sumo_vehicles,
-                    signal_state=signal_state,
-                    controller_mode=status['mode'],
-                    current_time=current_time,
-                    stats=stats,
-                    filename=str(frame_filename)
-                )
+                if recorder is not None:
+                    recorder.record(current_time, sumo.get_vehicle_frame(),
+                                    signal_state=signal_state,
+                                    controller_mode=status['mode'],
+                                    stats=stats)
+                elif video is not None:
+                    video.write(camera.render_annotated_frame(
+                        vehicles=sumo_vehicles,
+                        signal_state=signal_state,
+                        controller_mode=status['mode'],
+                        current_time=current_time,
+                        stats=stats
+                    ))
+                else:
+                    # Save annotated frame (single write per timestep)
+                    frame_filename = self.frames_dir / f"frame_{frame_count:06d}.png"
+                    camera.save_annotated_frame(
+                        vehicles=sumo_vehicles,
+                        signal_state=signal_state,
+                        controller_mode=status['mode'],
+                        current_time=current_time,
+                        stats=stats,
+                        filename=str(frame_filename)
+                    )
                 
                 frame_count += 1
                 
@@ -167,15 +236,28 @@ class SimulationRenderer:
                           f"Time: {current_time:5.1f}s | "
                           f"ETA: {eta:4.0f}s")
             
+            if video is not None:
+                video.close()  # Waits for the encoder to drain
+            if recorder is not None:
+                recorder.close()
+            
             elapsed_total = time_module.time() - start_time
             print(f"\n✓ Rendered {frame_count} frames in {elapsed_total:.1f}s")
             print(f"  Average: {elapsed_total/frame_count:.3f}s per frame")
             
         finally:
+            if video is not None:
+                video.close()
             sumo.close()
         
-        # Create video
-        self._create_video(frame_count)
+        if recorder is not None:
+            print(f"\n✓ Trace saved: {self.trace_path} ({len(recorder)} steps)")
+            print(f"  Render with: python scripts/render_trace.py {self.trace_path}")
+        elif video is not None:
+            self._report_video(frame_count)
+        else:
+            # Create video
+            self._create_video(frame_count)
     
     def _create_video(self, frame_count: int):
         """Create MP4 video from frames using ffmpeg"""
@@ -214,19 +296,22 @@ class SimulationRenderer:
                 check=True
             )
             
-            # Check file size
-            size_mb = self.video_path.stat().st_size / (1024 * 1024)
-            
-            print(f"\n✓ Video created successfully!")
-            print(f"  Path: {self.video_path}")
-            print(f"  Size: {size_mb:.1f} MB")
-            print(f"  Duration: {self.duration}s @ 10 fps")
-            print(f"  Frames: {frame_count}")
+            self._report_video(frame_count)
             
         except subprocess.CalledProcessError as e:
             print(f"✗ ffmpeg failed:")
             print(e.stderr)
     
+    def _report_video(self, frame_count: int):
+        """Print path and size of the finished video"""
+        size_mb = self.video_path.stat().st_size / (1024 * 1024)
+        
+        print(f"\n✓ Video created successfully!")
+        print(f"  Path: {self.video_path}")
+        print(f"  Size: {size_mb:.1f} MB")
+        print(f"  Duration: {self.duration}s @ 10 fps")
+        print(f"  Frames: {frame_count}")
+    
     def cleanup_frames(self):
         """Optional: Delete frames after video creation"""
         print(f"\n4. Cleaning up frames...")
@@ -245,17 +330,27 @@ def main():
     )
     parser.add_argument('--duration', type=float, default=120.0,
                        help='Simulation duration in seconds (default: 120)')
+    parser.add_argument('--output', choices=['stream', 'png', 'trace'], default='stream',
+                       help='Stream frames into the encoder, write a PNG sequence '
+                            'first, or record a trace for scripts/render_trace.py '
+                            '(default: stream)')
+    parser.add_argument('--encoder', choices=SUPPORTED_ENCODERS, default='auto',
+                       help='Streaming encoder (default: ffmpeg if installed, else opencv)')
     parser.add_argument('--cleanup', action='store_true',
-                       help='Delete frames after creating video')
+                       help='Delete frames after creating video (--output png)')
     
     args = parser.parse_args()
     
-    renderer = SimulationRenderer(duration=args.duration)
+    renderer = SimulationRenderer(duration=args.duration, output=args.output,
+                                  encoder=args.encoder)
     renderer.render()
     
     if args.cleanup:
         renderer.cleanup_frames()
     
+    if args.output == 'trace':
+        return
+    
     print("\n" + "="*70)
     print("✓ RENDERING COMPLETE")
     print("="*70)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Render a recorded run to video on all cores.
+
+Record the run first (simulation only, nothing drawn):
+    python scripts/render_simulation.py --output trace
+
+then split its frames across a process pool and join the segments:
+    python scripts/render_trace.py output/adaptive_emergency_demo.npz [--workers 8]
+
+Output:
+    The trace path with a .mp4 suffix, unless --output is given
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from simulation.offline_renderer import render_trace
+from simulation.trace import TraceReader
+from simulation.video_writer import SUPPORTED_ENCODERS
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Render a recorded trace to video in parallel')
+    parser.add_argument('trace', help='Annotated trace (render_simulation.py --output trace)')
+    parser.add_argument('--output', default=None,
+                        help='Video file (default: trace path with .mp4 suffix)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Process pool size (default: CPU count)')
+    parser.add_argument('--segments', type=int, default=None,
+                        help='Frame ranges to split into (default: one per worker)')
+    parser.add_argument('--encoder', choices=SUPPORTED_ENCODERS, default='auto',
+                        help='Segment encoder (default: ffmpeg if installed, else opencv)')
+    args = parser.parse_args()
+
+    output = Path(args.output) if args.output else Path(args.trace).with_suffix('.mp4')
+    trace = TraceReader(args.trace)
+    workers = args.workers or os.cpu_count()
+
+    print("="*70)
+    print("PARALLEL TRACE RENDERER")
+    print("="*70)
+    print(f"Trace: {args.trace} ({len(trace)} frames)")
+    if not trace.has_annotations:
+        print("  (no signal/mode annotations recorded - overlays show defaults)")
+    print(f"Workers: {workers}")
+    print(f"Video output: {output}")
+    print("="*70)
+
+    start = time.perf_counter()
+    render_trace(args.trace, str(output), workers=workers, segments=args.segments,
+                 encoder=args.encoder)
+    elapsed = time.perf_counter() - start
+
+    size_mb = output.stat().st_size / (1024 * 1024)
+    print(f"\n✓ Rendered {len(trace)} frames in {elapsed:.1f}s "
+          f"({len(trace) / elapsed:.1f} frames/s)")
+    print(f"  Path: {output}")
+    print(f"  Size: {size_mb:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,11 +7,21 @@ Corrected Day 3.5: Fixed to use frozen perception interface
 
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont
-from typing import List, Tuple, Dict, Optional
+from typing import List, Tuple, Dict, Optional, Union
 import cv2
+from functools import lru_cache
 
 from simulation.camera_interface import VirtualCamera
-from simulation.sumo_interface import VehicleInfo
+from simulation.sumo_interface import VehicleInfo, VehicleFrame
+
+
+@lru_cache(maxsize=None)
+def _overlay_font(size: int):
+    """Overlay font of the given size (loaded once per size)"""
+    try:
+        return ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", size)
+    except:
+        return ImageFont.load_default()
 
 
 class AnnotatedCamera(VirtualCamera):
@@ -20,7 +30,7 @@ class AnnotatedCamera(VirtualCamera):
     """
     
     def render_annotated_frame(self, 
-                               vehicles: List[VehicleInfo],
+                               vehicles: Union[List[VehicleInfo], VehicleFrame],
                                signal_state: str,
                                controller_mode: str,
                                current_time: float,
@@ -29,7 +39,7 @@ class AnnotatedCamera(VirtualCamera):
         Render frame with annotations
         
         Args:
-            vehicles: List of SUMO VehicleInfo objects
+            vehicles: SUMO vehicles (VehicleInfo list or VehicleFrame)
             signal_state: SUMO signal state string (12 chars)
             controller_mode: "NORMAL" or "EMERGENCY"
             current_time: Simulation time in seconds
@@ -136,23 +146,14 @@ class AnnotatedCamera(VirtualCamera):
             ], fill=color, outline=(0, 0, 0), width=3)
             
             # Draw approach label
-            try:
-                font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 14)
-            except:
-                font = ImageFont.load_default()
-            
             draw.text((pos[0] - 5, pos[1] - 5), approach, 
-                     fill=(255, 255, 255), font=font)
+                     fill=(255, 255, 255), font=_overlay_font(14))
     
     def _draw_info_overlay(self, draw: ImageDraw.Draw, 
                           mode: str, time: float, stats: Dict):
         """Draw information overlay at top of frame"""
-        try:
-            font_large = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 24)
-            font_small = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 16)
-        except:
-            font_large = ImageFont.load_default()
-            font_small = ImageFont.load_default()
+        font_large = _overlay_font(24)
+        font_small = _overlay_font(16)
         
         # Semi-transparent background
         overlay_height = 100
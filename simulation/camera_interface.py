@@ -1,14 +1,29 @@
 """
 Virtual camera rendering from SUMO simulation.
 Converts vehicle positions to image coordinates for perception models.
+
+The static scenery (roads, lane markings, stop lines) is rendered once per
+camera configuration and cached; each frame copies it into a reused
+buffer and draws only the vehicles.
 """
 
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Optional, Union
 import cv2
 
-from simulation.sumo_interface import VehicleInfo
+from simulation.sumo_interface import VehicleInfo, VehicleFrame
+
+
+BACKGROUND_COLOR = (50, 50, 50)
+
+# Vehicle corners as (length, width) signs around the center
+_CORNER_SIGNS = np.array([(-1, -1), (1, -1), (1, 1), (-1, 1)], dtype=np.float64)
+
+# Front indicator: octagon of radius 3 px
+_INDICATOR_OFFSETS = 3.0 * np.stack(
+    (np.cos(np.arange(8) * np.pi / 4), np.sin(np.arange(8) * np.pi / 4)), axis=-1
+)
 
 
 class VirtualCamera:
@@ -52,6 +67,12 @@ class VirtualCamera:
             'fire_truck': (255, 100, 0),  # Orange-red
             'default': (200, 200, 200)
         }
+        
+        # Static layer and reused frame buffer, rebuilt when the camera
+        # configuration changes
+        self._background_key = None
+        self._background: np.ndarray = None
+        self._frame: np.ndarray = None
     
     def world_to_image(self, x: float, y: float) -> Tuple[int, int]:
         """
@@ -73,29 +94,58 @@ class VirtualCamera:
         
         return (px, py)
     
-    def render_frame(self, vehicles: List[VehicleInfo]) -> np.ndarray:
+    def render_frame(self, vehicles: Union[List[VehicleInfo], VehicleFrame],
+                     out: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Render current simulation state as image
         
         Args:
-            vehicles: List of vehicles to render
+            vehicles: Vehicles to render (list or columnar VehicleFrame)
+            out: (H, W, 3) uint8 array to render into, e.g. a shared
+                memory frame slot (None = the camera's own buffer)
         
         Returns:
-            RGB image as numpy array (H, W, 3)
+            RGB image as numpy array (H, W, 3). Without `out` the array is
+            the camera's reused frame buffer: it is overwritten by the next
+            render, so copy it to keep it.
         """
-        # Create blank canvas
-        img = Image.new('RGB', self.image_size, color=(50, 50, 50))
-        draw = ImageDraw.Draw(img)
-        
-        # Draw road structure
-        self._draw_roads(draw)
-        
-        # Draw each vehicle
-        for vehicle in vehicles:
-            self._draw_vehicle(draw, vehicle)
-        
-        # Convert to numpy array
-        return np.array(img)
+        # Static scenery, then only the dynamic vehicles on top
+        background = self.background
+        if out is None:
+            frame = self._frame
+        elif out.shape != background.shape or out.dtype != np.uint8:
+            raise ValueError(f"out must be a {background.shape} uint8 array, "
+                             f"got {out.shape} {out.dtype}")
+        else:
+            frame = out
+        np.copyto(frame, background)
+        
+        if isinstance(vehicles, VehicleFrame):
+            self._draw_vehicles(frame, vehicles.x, vehicles.y,
+                                vehicles.angle, vehicles.types)
+        else:
+            self._draw_vehicles(
+                frame,
+                np.array([v.position[0] for v in vehicles], dtype=np.float64),
+                np.array([v.position[1] for v in vehicles], dtype=np.float64),
+                np.array([v.angle for v in vehicles], dtype=np.float64),
+                np.array([v.type for v in vehicles], dtype=object)
+            )
+        
+        return frame
+    
+    @property
+    def background(self) -> np.ndarray:
+        """Static road layer (H, W, 3) for the current camera configuration"""
+        key = (tuple(self.image_size), self.view_range,
+               tuple(self.intersection_center), self.scale)
+        if key != self._background_key:
+            img = Image.new('RGB', self.image_size, color=BACKGROUND_COLOR)
+            self._draw_roads(ImageDraw.Draw(img))
+            self._background = np.array(img)
+            self._frame = np.empty_like(self._background)
+            self._background_key = key
+        return self._background
     
     def _draw_roads(self, draw: ImageDraw.Draw):
         """Draw road lanes and intersection"""
@@ -164,66 +214,56 @@ class VirtualCamera:
             (center_px[0] - stop_distance_px, center_px[1] + road_width_px // 2)
         ], fill=stop_line_color, width=3)
     
-    def _draw_vehicle(self, draw: ImageDraw.Draw, vehicle: VehicleInfo):
-        """Draw a single vehicle"""
-        # Get vehicle dimensions
-        length, width = self.vehicle_sizes.get(
-            vehicle.type, 
-            self.vehicle_sizes['default']
-        )
-        
-        # Get color
-        color = self.vehicle_colors.get(
-            vehicle.type,
-            self.vehicle_colors['default']
-        )
-        
-        # Convert to pixels
-        length_px = length * self.scale
-        width_px = width * self.scale
-        
-        # Get position
-        center_px = self.world_to_image(vehicle.position[0], vehicle.position[1])
-        
-        # Create rotated rectangle
-        angle_rad = np.radians(vehicle.angle - 90)  # Adjust for SUMO's angle convention
-        
-        # Calculate corner offsets
-        cos_a = np.cos(angle_rad)
-        sin_a = np.sin(angle_rad)
-        
-        half_l = length_px / 2
-        half_w = width_px / 2
-        
-        corners = [
-            (-half_l, -half_w),
-            (half_l, -half_w),
-            (half_l, half_w),
-            (-half_l, half_w)
-        ]
-        
-        # Rotate and translate corners
-        rotated_corners = []
-        for dx, dy in corners:
-            rx = dx * cos_a - dy * sin_a
-            ry = dx * sin_a + dy * cos_a
-            rotated_corners.append((
-                int(center_px[0] + rx),
-                int(center_px[1] + ry)
-            ))
-        
-        # Draw vehicle
-        draw.polygon(rotated_corners, fill=color, outline=(255, 255, 255))
-        
-        # Draw directional indicator (front of vehicle)
-        front_x = center_px[0] + half_l * cos_a
-        front_y = center_px[1] + half_l * sin_a
-        draw.ellipse([
-            front_x - 3, front_y - 3,
-            front_x + 3, front_y + 3
-        ], fill=(255, 255, 0))
+    def _draw_vehicles(self, frame: np.ndarray, x: np.ndarray, y: np.ndarray,
+                       angle: np.ndarray, types: np.ndarray):
+        """
+        Draw all vehicles into the frame buffer
+        
+        Corner polygons for every vehicle are computed at once; each color
+        class is then rasterized with a single cv2.fillPoly call. fillPoly
+        fills overlapping contours even-odd, which is fine here: SUMO
+        vehicles do not overlap.
+        """
+        if len(x) == 0:
+            return
+        
+        # Per-vehicle size and color via the distinct types present
+        type_names, type_index = np.unique(types.astype(str), return_inverse=True)
+        default_size = self.vehicle_sizes['default']
+        sizes = np.array([self.vehicle_sizes.get(t, default_size) for t in type_names])
+        half_l = sizes[type_index, 0] * self.scale / 2
+        half_w = sizes[type_index, 1] * self.scale / 2
+        
+        # Vehicle centers in pixels (flip Y axis for image coordinates)
+        cx = self.image_size[0] / 2 + (x - self.intersection_center[0]) * self.scale
+        cy = self.image_size[1] / 2 - (y - self.intersection_center[1]) * self.scale
+        
+        # Rotated corners, (N, 4, 2); SUMO angles are clockwise from north
+        angle_rad = np.radians(angle - 90)
+        cos_a = np.cos(angle_rad)[:, None]
+        sin_a = np.sin(angle_rad)[:, None]
+        dx = _CORNER_SIGNS[:, 0] * half_l[:, None]
+        dy = _CORNER_SIGNS[:, 1] * half_w[:, None]
+        corners = np.stack((cx[:, None] + dx * cos_a - dy * sin_a,
+                            cy[:, None] + dx * sin_a + dy * cos_a), axis=-1)
+        corners = np.rint(corners).astype(np.int32)
+        
+        # Bodies: one fillPoly per color, then all outlines at once
+        default_color = self.vehicle_colors['default']
+        colors = [self.vehicle_colors.get(t, default_color) for t in type_names]
+        for color in set(colors):
+            type_ids = [i for i, c in enumerate(colors) if c == color]
+            cv2.fillPoly(frame, corners[np.isin(type_index, type_ids)], color)
+        cv2.polylines(frame, corners, True, (255, 255, 255), 1)
+        
+        # Directional indicators (front of vehicle) as small polygons
+        front_x = cx + half_l * cos_a[:, 0]
+        front_y = cy + half_l * sin_a[:, 0]
+        dots = np.rint(np.stack((front_x, front_y), axis=-1)[:, None, :]
+                       + _INDICATOR_OFFSETS).astype(np.int32)
+        cv2.fillPoly(frame, dots, (255, 255, 0))
     
-    def save_frame(self, vehicles: List[VehicleInfo], filename: str):
+    def save_frame(self, vehicles: Union[List[VehicleInfo], VehicleFrame], filename: str):
         """Render and save frame to file"""
         frame = self.render_frame(vehicles)
         cv2.imwrite(filename, cv2.cvtColor(frame, cv2.COLOR_RGB2BGR))
\ No newline at end of file
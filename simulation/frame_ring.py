@@ -0,0 +1,345 @@
+"""
+Shared-memory ring buffer of camera frames.
+
+One producer (renderer or capture process) writes fixed-size RGB frames
+into preallocated slots of a multiprocessing.shared_memory block; any
+number of consumer processes (detectors) read them in place. Frames are
+never pickled or copied through a pipe - a reader gets a NumPy view of the
+slot, and the producer can render straight into the slot it is filling.
+
+Backpressure is drop-oldest: the producer never waits. The slot after the
+newest frame may be being overwritten at any time, so a ring of `slots`
+slots keeps the newest slots - 1 frames readable. When a reader falls
+further behind, the frames it missed are counted as dropped and it
+continues at the oldest readable frame. Every slot carries the sequence
+number of the frame in it (a seqlock), so a reader can check after
+processing whether the slot was overwritten meanwhile.
+
+Several detector processes can share the stream with
+FrameRingReader(worker_index=k, num_workers=n): reader k takes the frames
+whose sequence number is k modulo n.
+
+Usage:
+    ring = SharedFrameRing.create((720, 1280, 3), slots=8)      # producer
+    with ring.writing(timestamp) as slot:
+        camera.render_frame(vehicles, out=slot)
+
+    reader = FrameRingReader(SharedFrameRing.attach(ring.name))  # consumer
+    frame = reader.next(timeout=1.0)
+    detections = detector.detect(frame.image)
+    if not frame.valid():
+        ...  # overwritten during detection - discard
+"""
+
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+_MAGIC = 0x46524D52494E4701  # "FRMRING" + layout version 1
+
+# Header fields (int64)
+_H_MAGIC, _H_HEIGHT, _H_WIDTH, _H_CHANNELS, _H_SLOTS, _H_HEAD, _H_CLOSED = range(7)
+_HEADER_FIELDS = 8
+
+# Slot sequence markers
+_EMPTY = -1
+_WRITING = -2
+
+_ALIGN = 64
+
+
+def _aligned(n: int) -> int:
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+@dataclass
+class SharedFrame:
+    """A frame read from the ring: a view into its slot, not a copy"""
+    seq: int
+    timestamp: float
+    image: np.ndarray
+    _slot_seq: np.ndarray
+    _slot: int
+
+    def valid(self) -> bool:
+        """True while the slot still holds this frame (check after use)"""
+        return int(self._slot_seq[self._slot]) == self.seq
+
+
+class SharedFrameRing:
+    """
+    Fixed-size frame slots in one shared memory block.
+
+    Single writer: write() / writing() must only be called from one
+    process. The creator owns the block and unlinks it in unlink().
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        """Use create() or attach()"""
+        self._shm = shm
+        self.owner = owner
+
+        header = np.ndarray((_HEADER_FIELDS,), dtype=np.int64, buffer=shm.buf)
+        if header[_H_MAGIC] != _MAGIC:
+            raise ValueError(f"Shared memory '{shm.name}' is not a frame ring")
+        self._header = header
+
+        self.slots = int(header[_H_SLOTS])
+        self.frame_shape = (int(header[_H_HEIGHT]), int(header[_H_WIDTH]),
+                            int(header[_H_CHANNELS]))
+
+        offset = _aligned(_HEADER_FIELDS * 8)
+        self._slot_seq = np.ndarray((self.slots,), dtype=np.int64,
+                                    buffer=shm.buf, offset=offset)
+        offset = _aligned(offset + self.slots * 8)
+        self._slot_time = np.ndarray((self.slots,), dtype=np.float64,
+                                     buffer=shm.buf, offset=offset)
+        offset = _aligned(offset + self.slots * 8)
+        self._frames = np.ndarray((self.slots,) + self.frame_shape, dtype=np.uint8,
+                                  buffer=shm.buf, offset=offset)
+
+        self._writing_seq: Optional[int] = None
+
+    @staticmethod
+    def _size(frame_shape: Tuple[int, int, int], slots: int) -> int:
+        return (_aligned(_HEADER_FIELDS * 8) + 2 * _aligned(slots * 8)
+                + slots * int(np.prod(frame_shape)))
+
+    @classmethod
+    def create(cls, frame_shape: Tuple[int, ...], slots: int = 8,
+               name: Optional[str] = None) -> 'SharedFrameRing':
+        """
+        Allocate a new ring
+
+        Args:
+            frame_shape: (height, width) or (height, width, channels) of uint8 frames
+            slots: Frames held; readers further behind drop frames
+            name: Shared memory name (None = generated)
+        """
+        if len(frame_shape) == 2:
+            frame_shape = tuple(frame_shape) + (1,)
+        if len(frame_shape) != 3 or slots < 2:
+            raise ValueError(f"Need (H, W[, C]) frames and >= 2 slots, "
+                             f"got {frame_shape} x {slots}")
+
+        shm = shared_memory.SharedMemory(name=name, create=True,
+                                         size=cls._size(frame_shape, slots))
+        header = np.ndarray((_HEADER_FIELDS,), dtype=np.int64, buffer=shm.buf)
+        header[:] = 0
+        header[[_H_HEIGHT, _H_WIDTH, _H_CHANNELS]] = frame_shape
+        header[_H_SLOTS] = slots
+        header[_H_HEAD] = -1
+        np.ndarray((slots,), dtype=np.int64, buffer=shm.buf,
+                   offset=_aligned(_HEADER_FIELDS * 8))[:] = _EMPTY
+        header[_H_MAGIC] = _MAGIC  # Last: the ring is complete
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> 'SharedFrameRing':
+        """
+        Open an existing ring by name (e.g. in a detector process)
+
+        Before Python 3.13 attaching registers the block with the resource
+        tracker, which removes it when the tracker exits. Processes started
+        through multiprocessing share the creator's tracker, so that is the
+        creator's unlink; start readers that way, not as unrelated programs.
+        """
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, owner=False)
+
+    def __reduce__(self):
+        # Pickles as its name, so a ring can be passed to a worker process
+        return SharedFrameRing.attach, (self.name,)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def head(self) -> int:
+        """Sequence number of the newest complete frame (-1 before the first)"""
+        return int(self._header[_H_HEAD])
+
+    @property
+    def closed(self) -> bool:
+        """True once the writer has called close_writer()"""
+        return bool(self._header[_H_CLOSED])
+
+    # === Writer ===
+
+    def begin_write(self) -> np.ndarray:
+        """
+        Claim the next slot (overwriting the oldest frame)
+
+        Returns:
+            Writable view of the slot; fill it, then call end_write()
+        """
+        if self._writing_seq is not None:
+            raise RuntimeError("begin_write() called twice without end_write()")
+        seq = self.head + 1
+        slot = seq % self.slots
+        self._slot_seq[slot] = _WRITING
+        self._writing_seq = seq
+        return self._frames[slot]
+
+    def end_write(self, timestamp: float) -> int:
+        """
+        Publish the slot claimed by begin_write()
+
+        Returns:
+            Sequence number of the published frame
+        """
+        seq = self._writing_seq
+        if seq is None:
+            raise RuntimeError("end_write() without begin_write()")
+        slot = seq % self.slots
+        self._slot_time[slot] = timestamp
+        self._slot_seq[slot] = seq
+        self._header[_H_HEAD] = seq
+        self._writing_seq = None
+        return seq
+
+    @contextmanager
+    def writing(self, timestamp: float):
+        """begin_write() / end_write() as a context; yields the slot view"""
+        slot = self.begin_write()
+        try:
+            yield slot
+        except BaseException:
+            # Leave the slot marked as being written; readers skip it
+            self._writing_seq = None
+            raise
+        self.end_write(timestamp)
+
+    def write(self, frame: np.ndarray, timestamp: float) -> int:
+        """Copy a frame into the next slot; returns its sequence number"""
+        slot = self.begin_write()
+        try:
+            slot[...] = frame.reshape(slot.shape)
+        except BaseException:
+            self._writing_seq = None
+            raise
+        return self.end_write(timestamp)
+
+    def close_writer(self):
+        """Tell readers no more frames will come (they drain, then stop)"""
+        self._header[_H_CLOSED] = 1
+
+    # === Reader access ===
+
+    def _frame(self, seq: int) -> Optional[SharedFrame]:
+        """The frame with this sequence number, if its slot still holds it"""
+        slot = seq % self.slots
+        if int(self._slot_seq[slot]) != seq:
+            return None
+        frame = SharedFrame(seq=seq, timestamp=float(self._slot_time[slot]),
+                            image=self._frames[slot],
+                            _slot_seq=self._slot_seq, _slot=slot)
+        return frame if frame.valid() else None
+
+    # === Lifetime ===
+
+    def close(self):
+        """Release this process's mapping (views into it become invalid)"""
+        self._header = self._slot_seq = self._slot_time = self._frames = None
+        self._shm.close()
+
+    def unlink(self):
+        """Free the shared memory block (creator only, after readers detach)"""
+        if self.owner:
+            self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        self.unlink()
+
+
+class FrameRingReader:
+    """
+    One consumer's cursor into a SharedFrameRing.
+
+    next() returns frames in sequence order, starting at the oldest
+    readable one. If the writer has overwritten frames this reader had not
+    reached yet, they are skipped and counted in `dropped`.
+    """
+
+    def __init__(self, ring: SharedFrameRing, worker_index: int = 0,
+                 num_workers: int = 1, poll_interval: float = 0.0005):
+        """
+        Args:
+            ring: Attached ring
+            worker_index: This reader's share of the frames (0..num_workers-1)
+            num_workers: Readers splitting the stream between them
+            poll_interval: Sleep between checks while waiting for a frame (s)
+        """
+        if not 0 <= worker_index < num_workers:
+            raise ValueError(f"worker_index {worker_index} not in [0, {num_workers})")
+        self.ring = ring
+        self.worker_index = worker_index
+        self.num_workers = num_workers
+        self.poll_interval = poll_interval
+
+        self.cursor = -1  # Last sequence number returned
+        self.received = 0
+        self.dropped = 0
+
+    def _first_own(self, seq: int) -> int:
+        """Smallest sequence number >= seq that belongs to this reader"""
+        return seq + (self.worker_index - seq) % self.num_workers
+
+    def next(self, timeout: Optional[float] = None) -> Optional[SharedFrame]:
+        """
+        Next frame for this reader
+
+        Args:
+            timeout: Seconds to wait for a frame (None = until one arrives
+                or the writer closes)
+
+        Returns:
+            SharedFrame, or None on timeout / after the writer closed and
+            every remaining frame was read
+        """
+        ring = self.ring
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            head = ring.head
+            oldest = max(head - ring.slots + 2, 0)  # Slot of head + 1 may be mid-write
+            seq = self._first_own(max(self.cursor + 1, oldest))
+
+            if seq <= head:
+                frame = ring._frame(seq)
+                if frame is not None:
+                    if self.received:
+                        self.dropped += len(range(self._first_own(self.cursor + 1),
+                                                  seq, self.num_workers))
+                    self.received += 1
+                    self.cursor = seq
+                    return frame
+                continue  # Overwritten while we looked; head has moved on
+
+            if ring.closed and ring.head == head:
+                return None
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            time.sleep(self.poll_interval)
+
+    def __iter__(self):
+        """Frames until the writer closes the ring"""
+        while True:
+            frame = self.next()
+            if frame is None:
+                return
+            yield frame
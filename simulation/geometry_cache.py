@@ -0,0 +1,194 @@
+"""
+Compiled network geometry with an on-disk cache.
+
+Parsing network.net.xml (sumolib) and intersection_config.yaml (PyYAML) is
+the bulk of SUMOInterface / LaneMapper start-up, and every evaluation run -
+in every pool worker - used to repeat it. This module compiles the parts
+the pipeline actually uses into plain Python/NumPy objects and pickles them
+under cache/geometry, keyed on a hash of the source file. Later loads
+unpickle the compiled model; loads within one process are memoized.
+
+Usage:
+    network = load_network("sumo_networks/simple_4way/network.net.xml")
+    network.nodes['center']          # (x, y)
+    network.stop_lines['N_in_0']     # (x, y) end of lane at the junction
+
+    config = load_intersection_config("config/intersection_config.yaml")
+"""
+
+import hashlib
+import os
+import pickle
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+# Bump when CompiledNetwork or the compile step changes
+GEOMETRY_CACHE_VERSION = 1
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / "cache" / "geometry"
+
+# In-process memo: (kind, resolved path, digest) -> compiled object
+_memo: Dict[Tuple[str, str, str], object] = {}
+
+
+@dataclass
+class CompiledNetwork:
+    """
+    Static geometry of a SUMO network (non-internal lanes only).
+
+    Coordinates are SUMO world coordinates (after the net's location offset).
+    """
+    net_file: str
+    source_digest: str
+    nodes: Dict[str, Tuple[float, float]]
+    node_types: Dict[str, str]
+    lane_shapes: Dict[str, np.ndarray]                  # lane -> (K, 2) polyline
+    lane_lengths: Dict[str, float]
+    lane_widths: Dict[str, float]
+    stop_lines: Dict[str, Tuple[float, float]]          # lane -> last shape point
+    incoming_lanes: Dict[str, List[str]]                # node -> lanes ending there
+    traffic_lights: Dict[str, List[Tuple[str, str, int]]] = field(default_factory=dict)
+    bounds: Tuple[float, float, float, float] = (0.0, 0.0, 0.0, 0.0)
+    location_offset: Tuple[float, float] = (0.0, 0.0)
+
+    def node_position(self, node_id: str) -> Tuple[float, float]:
+        """(x, y) of a node, KeyError if unknown"""
+        return self.nodes[node_id]
+
+    def controlled_lanes(self, tls_id: str) -> List[str]:
+        """Incoming lanes of a traffic light in link-index order (deduplicated)"""
+        lanes = []
+        for in_lane, _, _ in sorted(self.traffic_lights[tls_id], key=lambda c: c[2]):
+            if in_lane not in lanes:
+                lanes.append(in_lane)
+        return lanes
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 of a file's contents"""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def compile_network(net_file: str, digest: Optional[str] = None) -> CompiledNetwork:
+    """Parse a .net.xml with sumolib and extract the geometry we use"""
+    import sumolib
+
+    net = sumolib.net.readNet(net_file)
+
+    nodes = {}
+    node_types = {}
+    for node in net.getNodes():
+        x, y = node.getCoord()[:2]
+        nodes[node.getID()] = (float(x), float(y))
+        node_types[node.getID()] = node.getType()
+
+    lane_shapes = {}
+    lane_lengths = {}
+    lane_widths = {}
+    stop_lines = {}
+    incoming_lanes: Dict[str, List[str]] = {node_id: [] for node_id in nodes}
+    for edge in net.getEdges():
+        to_node = edge.getToNode().getID()
+        for lane in edge.getLanes():
+            lane_id = lane.getID()
+            shape = np.array([p[:2] for p in lane.getShape()], dtype=np.float64)
+            lane_shapes[lane_id] = shape
+            lane_lengths[lane_id] = float(lane.getLength())
+            lane_widths[lane_id] = float(lane.getWidth())
+            stop_lines[lane_id] = (float(shape[-1, 0]), float(shape[-1, 1]))
+            incoming_lanes[to_node].append(lane_id)
+
+    traffic_lights = {
+        tls.getID(): [
+            (in_lane.getID(), out_lane.getID(), int(link_index))
+            for in_lane, out_lane, link_index in tls.getConnections()
+        ]
+        for tls in net.getTrafficLights()
+    }
+
+    return CompiledNetwork(
+        net_file=str(net_file),
+        source_digest=digest or file_digest(net_file),
+        nodes=nodes,
+        node_types=node_types,
+        lane_shapes=lane_shapes,
+        lane_lengths=lane_lengths,
+        lane_widths=lane_widths,
+        stop_lines=stop_lines,
+        incoming_lanes=incoming_lanes,
+        traffic_lights=traffic_lights,
+        bounds=tuple(float(v) for v in net.getBoundary()),
+        location_offset=tuple(float(v) for v in net.getLocationOffset())
+    )
+
+
+def load_network(net_file: str, cache_dir: Optional[str] = None) -> CompiledNetwork:
+    """
+    Compiled geometry for a .net.xml, from cache when the file is unchanged
+
+    Args:
+        net_file: Path to network.net.xml
+        cache_dir: Cache directory (default: <project>/cache/geometry)
+    """
+    return _load_cached('net', net_file, cache_dir, compile_network)
+
+
+def load_intersection_config(config_path: str,
+                             cache_dir: Optional[str] = None) -> dict:
+    """
+    Parsed intersection_config.yaml, from cache when the file is unchanged
+
+    The returned dict is shared between callers in a process - do not mutate.
+    """
+    def _parse(path, digest):
+        import yaml
+        with open(path, 'r') as f:
+            return yaml.safe_load(f)
+
+    return _load_cached('yaml', config_path, cache_dir, _parse)
+
+
+def _load_cached(kind: str, source: str, cache_dir: Optional[str], compile_fn):
+    """Memo -> on-disk pickle -> compile, keyed on the source file digest"""
+    source_path = Path(source).resolve()
+    digest = file_digest(str(source_path))
+
+    memo_key = (kind, str(source_path), digest)
+    if memo_key in _memo:
+        return _memo[memo_key]
+
+    cache_root = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+    cache_file = cache_root / (
+        f"{source_path.name.replace('.', '_')}_v{GEOMETRY_CACHE_VERSION}_{digest[:16]}.pkl"
+    )
+
+    compiled = None
+    if cache_file.exists():
+        try:
+            with open(cache_file, 'rb') as f:
+                compiled = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            compiled = None  # Corrupt or stale - rebuild below
+
+    if compiled is None:
+        compiled = compile_fn(str(source_path), digest)
+        try:
+            cache_root.mkdir(parents=True, exist_ok=True)
+            # Write then rename so concurrent workers never read partial files
+            tmp_file = cache_file.with_name(f".tmp{os.getpid()}_{cache_file.name}")
+            with open(tmp_file, 'wb') as f:
+                pickle.dump(compiled, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, cache_file)
+        except OSError:
+            pass  # Read-only checkout: still works, just uncached
+
+    _memo[memo_key] = compiled
+    return compiled
@@ -0,0 +1,187 @@
+"""
+Signalized intersection discovery.
+
+Builds one SignalizedIntersection per traffic light in a compiled network:
+its incoming SUMO lanes grouped into N/S/E/W approaches, the local lane IDs
+the rest of the stack uses ('N_in_0', ...), a LaneMapper configuration,
+and the translation from the controllers' canonical 12-character signal
+state to the TLS's own link order.
+
+Canonical signal state (see control.signal_phases.SignalPhase):
+    index 0-2 = N lanes 0-2, 3-5 = E, 6-8 = S, 9-11 = W
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from simulation.geometry_cache import CompiledNetwork
+
+
+APPROACHES = ('N', 'S', 'E', 'W')
+
+APPROACH_DIRECTIONS = {'N': 'north', 'S': 'south', 'E': 'east', 'W': 'west'}
+
+# Offset of each approach's lanes in the canonical 12-character state
+CANONICAL_OFFSETS = {'N': 0, 'E': 3, 'S': 6, 'W': 9}
+CANONICAL_LANES_PER_APPROACH = 3
+
+
+@dataclass
+class SignalizedIntersection:
+    """One traffic light and the lanes it controls"""
+    tls_id: str
+    center: Tuple[float, float]
+    sumo_to_local: Dict[str, str]           # SUMO incoming lane -> 'N_in_0'
+    stop_lines: Dict[str, Tuple[float, float]]  # local lane -> stop point
+    entry_points: Dict[str, Tuple[float, float]]  # local lane -> upstream end
+    link_canonical_index: List[int]          # per TLS link -> canonical char index
+    lane_width: float = 3.2
+    local_lane_ids: List[str] = field(default_factory=list)
+
+    @property
+    def num_links(self) -> int:
+        return len(self.link_canonical_index)
+
+    def to_sumo_state(self, canonical_state: str) -> str:
+        """Translate a canonical 12-char controller state to this TLS's links"""
+        return ''.join(canonical_state[i] for i in self.link_canonical_index)
+
+    def lane_mapper_config(self) -> dict:
+        """Configuration in the intersection_config.yaml schema for LaneMapper"""
+        lanes = {}
+        for local_id in self.local_lane_ids:
+            approach, _, index = local_id.split('_')
+            approach_lanes = [l for l in self.local_lane_ids if l.startswith(approach + '_')]
+            is_left = len(approach_lanes) >= 3 and int(index) == len(approach_lanes) - 1
+            entry = self.entry_points[local_id]
+            stop = self.stop_lines[local_id]
+            lanes[local_id] = {
+                'direction': APPROACH_DIRECTIONS[approach],
+                'approach': approach,
+                'lane_index': int(index),
+                'type': 'left_turn' if is_left else 'through',
+                'entry_line': {'x': entry[0], 'y': entry[1]},
+                'stop_line': {'x': stop[0], 'y': stop[1]}
+            }
+
+        return {
+            'intersection': {
+                'center': {'x': self.center[0], 'y': self.center[1]},
+                'lane_width': self.lane_width,
+                'lanes': lanes
+            }
+        }
+
+
+def approach_of(shape: np.ndarray, center: Tuple[float, float]) -> str:
+    """Approach an incoming lane comes from, by its upstream end vs center"""
+    dx = shape[0, 0] - center[0]
+    dy = shape[0, 1] - center[1]
+    if abs(dx) > abs(dy):
+        return 'E' if dx > 0 else 'W'
+    return 'N' if dy > 0 else 'S'
+
+
+def discover_intersections(network: CompiledNetwork) -> List[SignalizedIntersection]:
+    """
+    Find every traffic light in the network and map its incoming lanes
+
+    Lanes are numbered per approach in SUMO order (0 = rightmost). Each
+    approach may have at most one incoming edge.
+
+    Raises:
+        ValueError: If a TLS has two incoming edges from the same approach
+    """
+    intersections = []
+
+    for tls_id in sorted(network.traffic_lights):
+        connections = network.traffic_lights[tls_id]
+        controlled = network.controlled_lanes(tls_id)
+
+        if tls_id in network.nodes:
+            center = network.nodes[tls_id]
+        else:
+            # Joined TLS: use the centroid of its stop lines
+            points = np.array([network.stop_lines[l] for l in controlled])
+            center = (float(points[:, 0].mean()), float(points[:, 1].mean()))
+
+        sumo_to_local = {}
+        edge_approach = {}
+        for lane_id in controlled:
+            edge_id, _, lane_index = lane_id.rpartition('_')
+            approach = approach_of(network.lane_shapes[lane_id], center)
+
+            previous = edge_approach.setdefault(approach, edge_id)
+            if previous != edge_id:
+                raise ValueError(
+                    f"TLS '{tls_id}': edges '{previous}' and '{edge_id}' both "
+                    f"approach from {approach}"
+                )
+            sumo_to_local[lane_id] = f"{approach}_in_{lane_index}"
+
+        local_ids = sorted(
+            sumo_to_local.values(),
+            key=lambda l: (APPROACHES.index(l[0]), int(l.rsplit('_', 1)[1]))
+        )
+        local_to_sumo = {v: k for k, v in sumo_to_local.items()}
+
+        link_canonical_index = [0] * (max(c[2] for c in connections) + 1)
+        for in_lane, _, link_index in connections:
+            local_id = sumo_to_local[in_lane]
+            lane_index = min(int(local_id.rsplit('_', 1)[1]), CANONICAL_LANES_PER_APPROACH - 1)
+            link_canonical_index[link_index] = CANONICAL_OFFSETS[local_id[0]] + lane_index
+
+        intersections.append(SignalizedIntersection(
+            tls_id=tls_id,
+            center=center,
+            sumo_to_local=sumo_to_local,
+            stop_lines={l: network.stop_lines[local_to_sumo[l]] for l in local_ids},
+            entry_points={
+                l: tuple(network.lane_shapes[local_to_sumo[l]][0].tolist())
+                for l in local_ids
+            },
+            link_canonical_index=link_canonical_index,
+            lane_width=float(np.mean([network.lane_widths[l] for l in controlled])),
+            local_lane_ids=local_ids
+        ))
+
+    return intersections
+
+
+class IntersectionIndex:
+    """
+    Partitions one network-wide VehicleFrame between intersections.
+
+    A vehicle belongs to an intersection while it is on one of that TLS's
+    incoming lanes; vehicles on internal, outgoing or uncontrolled lanes
+    belong to none.
+    """
+
+    def __init__(self, intersections: List[SignalizedIntersection]):
+        self.intersections = intersections
+        self._lane_owner: Dict[str, int] = {}
+        for i, intersection in enumerate(intersections):
+            for lane_id in intersection.sumo_to_local:
+                self._lane_owner[lane_id] = i
+
+    def partition(self, sumo_lane_ids: np.ndarray) -> List[np.ndarray]:
+        """
+        Row indices of each intersection's vehicles
+
+        Args:
+            sumo_lane_ids: (N,) SUMO lane ID per vehicle
+
+        Returns:
+            One sorted (K_i,) index array per intersection, in order
+        """
+        none = len(self.intersections)
+        owner = np.fromiter(
+            (self._lane_owner.get(lane_id, none) for lane_id in sumo_lane_ids),
+            dtype=np.int64, count=len(sumo_lane_ids)
+        )
+
+        order = np.argsort(owner, kind='stable')
+        bounds = np.searchsorted(owner[order], np.arange(none + 1))
+        return [order[bounds[i]:bounds[i + 1]] for i in range(none)]
@@ -0,0 +1,416 @@
+"""
+Parametric grid / arterial corridor networks with a netconvert cache.
+
+GridSpec describes an N x M grid of signalized intersections (a corridor is
+a 1 x M grid): lanes, spacing, speed, demand and signal program. Generating
+a spec writes the plain XML inputs, runs netconvert, and writes routes,
+sumo.cfg and a matching intersection_config.yaml. Outputs are cached under
+cache/networks, keyed on a hash of the spec, so repeated experiments reuse
+the built network instead of re-running netconvert.
+
+Usage:
+    spec = GridSpec(rows=1, cols=10, demand=400)
+    network_dir = generate_network(spec)
+    config_file = network_dir / "sumo.cfg"
+
+Node IDs:
+    J{r}_{c}           signalized intersection, row 0 = north, col 0 = west
+    N{c}, S{c}, W{r}, E{r}   boundary nodes
+Edges are named '{from}_{to}'; link indices of every TLS follow the
+canonical approach order N, E, S, W (lane 0 first).
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import yaml
+
+
+# Bump when the generated files change for the same spec
+GENERATOR_VERSION = 1
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / "cache" / "networks"
+
+TLS_TYPES = ('static', 'actuated')
+
+# Heading of each approach (where traffic comes from) -> (drow, dcol) to the
+# upstream neighbour
+_UPSTREAM = {'N': (-1, 0), 'E': (0, 1), 'S': (1, 0), 'W': (0, -1)}
+
+# For traffic arriving from an approach: approach it leaves towards when
+# going straight / turning right / turning left
+_THROUGH = {'N': 'S', 'E': 'W', 'S': 'N', 'W': 'E'}
+_RIGHT = {'N': 'W', 'E': 'N', 'S': 'E', 'W': 'S'}
+_LEFT = {'N': 'E', 'E': 'S', 'S': 'W', 'W': 'N'}
+
+_CANONICAL_ORDER = ('N', 'E', 'S', 'W')
+
+
+@dataclass(frozen=True)
+class GridSpec:
+    """Parameters of a generated network (all fields feed the cache key)"""
+    rows: int = 1                     # intersections north-south
+    cols: int = 1                     # intersections east-west
+    lanes: int = 3                    # lanes per direction (last = left turn if >= 2)
+    spacing: float = 200.0            # m between neighbouring intersections
+    approach_length: float = 100.0    # m from boundary node to outer intersections
+    speed: float = 13.89              # m/s
+    demand: float = 300.0             # veh/h entering at each boundary edge
+    turn_ratio: float = 0.2           # share of demand turning at the first signal
+    truck_ratio: float = 0.05
+    tls_type: str = 'static'          # 'static' or 'actuated'
+    green_time: float = 30.0
+    yellow_time: float = 3.0
+    offset_step: float = 0.0          # s added to the TLS offset per column (green wave)
+    duration: float = 3600.0
+    step_length: float = 0.1
+
+    def __post_init__(self):
+        if self.rows < 1 or self.cols < 1:
+            raise ValueError(f"Grid needs at least 1x1 intersections, got {self.rows}x{self.cols}")
+        if self.lanes < 1:
+            raise ValueError(f"lanes must be >= 1, got {self.lanes}")
+        if self.tls_type not in TLS_TYPES:
+            raise ValueError(f"Unknown tls_type '{self.tls_type}' (expected one of {TLS_TYPES})")
+
+    @property
+    def num_intersections(self) -> int:
+        return self.rows * self.cols
+
+    @property
+    def name(self) -> str:
+        return f"grid_{self.rows}x{self.cols}"
+
+    def digest(self) -> str:
+        """Stable hash of the spec and generator version"""
+        payload = json.dumps({'version': GENERATOR_VERSION, **asdict(self)}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def corridor(num_intersections: int, **kwargs) -> GridSpec:
+    """Arterial corridor: one row of signals running east-west"""
+    return GridSpec(rows=1, cols=num_intersections, **kwargs)
+
+
+def _neighbour(spec: GridSpec, r: int, c: int, approach: str) -> str:
+    """Node on the given side of intersection (r, c): grid node or boundary"""
+    dr, dc = _UPSTREAM[approach]
+    nr, nc = r + dr, c + dc
+    if 0 <= nr < spec.rows and 0 <= nc < spec.cols:
+        return f"J{nr}_{nc}"
+    return {'N': f"N{c}", 'S': f"S{c}", 'W': f"W{r}", 'E': f"E{r}"}[approach]
+
+
+def _write_nodes(spec: GridSpec, path: Path):
+    lines = []
+    for r in range(spec.rows):
+        for c in range(spec.cols):
+            lines.append(f'    <node id="J{r}_{c}" x="{c * spec.spacing:.2f}" '
+                         f'y="{-r * spec.spacing:.2f}" type="traffic_light"/>')
+
+    top = spec.approach_length
+    bottom = -(spec.rows - 1) * spec.spacing - spec.approach_length
+    left = -spec.approach_length
+    right = (spec.cols - 1) * spec.spacing + spec.approach_length
+    for c in range(spec.cols):
+        lines.append(f'    <node id="N{c}" x="{c * spec.spacing:.2f}" y="{top:.2f}" type="priority"/>')
+        lines.append(f'    <node id="S{c}" x="{c * spec.spacing:.2f}" y="{bottom:.2f}" type="priority"/>')
+    for r in range(spec.rows):
+        lines.append(f'    <node id="W{r}" x="{left:.2f}" y="{-r * spec.spacing:.2f}" type="priority"/>')
+        lines.append(f'    <node id="E{r}" x="{right:.2f}" y="{-r * spec.spacing:.2f}" type="priority"/>')
+
+    path.write_text('<?xml version="1.0" encoding="UTF-8"?>\n<nodes>\n'
+                    + '\n'.join(lines) + '\n</nodes>\n')
+
+
+def _write_edges(spec: GridSpec, path: Path):
+    """One edge per direction between adjacent nodes"""
+    edges = set()
+    for r in range(spec.rows):
+        for c in range(spec.cols):
+            node = f"J{r}_{c}"
+            for approach in _CANONICAL_ORDER:
+                other = _neighbour(spec, r, c, approach)
+                edges.add((other, node))
+                edges.add((node, other))
+
+    lines = [f'    <edge id="{a}_{b}" from="{a}" to="{b}" numLanes="{spec.lanes}" '
+             f'speed="{spec.speed}"/>' for a, b in sorted(edges)]
+    path.write_text('<?xml version="1.0" encoding="UTF-8"?>\n<edges>\n'
+                    + '\n'.join(lines) + '\n</edges>\n')
+
+
+def _lane_movements(lanes: int, lane_index: int) -> List[str]:
+    """Movements served by an incoming lane (lane 0 = rightmost)"""
+    if lanes == 1:
+        return ['right', 'through', 'left']
+    movements = []
+    if lane_index == 0:
+        movements.append('right')
+    if lane_index < lanes - 1 or lanes == 2:
+        movements.append('through')
+    if lane_index == lanes - 1:
+        movements.append('left')
+    return movements
+
+
+def _write_connections_and_tls(spec: GridSpec, conn_path: Path, tls_path: Path):
+    """Explicit connections with canonical link indices, plus tlLogic programs"""
+    connections = []
+    programs = []
+
+    for r in range(spec.rows):
+        for c in range(spec.cols):
+            node = f"J{r}_{c}"
+            link_index = 0
+            # Per link: (approach, is_left)
+            links: List[Tuple[str, bool]] = []
+
+            for approach in _CANONICAL_ORDER:
+                from_edge = f"{_neighbour(spec, r, c, approach)}_{node}"
+                for lane in range(spec.lanes):
+                    for movement in _lane_movements(spec.lanes, lane):
+                        target = {'through': _THROUGH, 'right': _RIGHT, 'left': _LEFT}[movement][approach]
+                        to_edge = f"{node}_{_neighbour(spec, r, c, target)}"
+                        to_lane = {'right': 0, 'left': spec.lanes - 1}.get(movement, lane)
+                        connections.append(
+                            f'    <connection from="{from_edge}" to="{to_edge}" '
+                            f'fromLane="{lane}" toLane="{to_lane}" '
+                            f'tl="{node}" linkIndex="{link_index}"/>'
+                        )
+                        links.append((approach, movement == 'left'))
+                        link_index += 1
+
+            programs.append(_tls_program(spec, node, links, offset=c * spec.offset_step))
+
+    conn_path.write_text('<?xml version="1.0" encoding="UTF-8"?>\n<connections>\n'
+                         + '\n'.join(connections) + '\n</connections>\n')
+    tls_path.write_text('<?xml version="1.0" encoding="UTF-8"?>\n<additional>\n'
+                        + '\n'.join(programs) + '\n</additional>\n')
+
+
+def _tls_program(spec: GridSpec, node: str, links: List[Tuple[str, bool]],
+                 offset: float) -> str:
+    """Two-phase program (NS, EW) with yellow transitions; lefts are permissive"""
+    def state(green_approaches, char):
+        return ''.join(
+            ('g' if is_left and char == 'G' else char) if approach in green_approaches else 'r'
+            for approach, is_left in links
+        )
+
+    if spec.tls_type == 'actuated':
+        green = (f'duration="{spec.green_time:g}" minDur="{min(5.0, spec.green_time):g}" '
+                 f'maxDur="{2 * spec.green_time:g}"')
+    else:
+        green = f'duration="{spec.green_time:g}"'
+    yellow = f'duration="{spec.yellow_time:g}"'
+
+    return (f'    <tlLogic id="{node}" type="{spec.tls_type}" programID="0" offset="{offset:g}">\n'
+            f'        <phase {green} state="{state("NS", "G")}"/>\n'
+            f'        <phase {yellow} state="{state("NS", "y")}"/>\n'
+            f'        <phase {green} state="{state("EW", "G")}"/>\n'
+            f'        <phase {yellow} state="{state("EW", "y")}"/>\n'
+            f'    </tlLogic>')
+
+
+def _write_routes(spec: GridSpec, path: Path):
+    """Flows from every boundary edge: through traffic plus turns at the first signal"""
+    def boundary_exit(r: int, c: int, direction: str) -> str:
+        # Exit edge reached by going straight from (r, c) towards `direction`
+        if direction == 'N':
+            return f"J0_{c}_N{c}"
+        if direction == 'S':
+            return f"J{spec.rows - 1}_{c}_S{c}"
+        if direction == 'W':
+            return f"J{r}_0_W{r}"
+        return f"J{r}_{spec.cols - 1}_E{r}"
+
+    entries = []  # (approach, first intersection row/col, entry edge)
+    for c in range(spec.cols):
+        entries.append(('N', 0, c, f"N{c}_J0_{c}"))
+        entries.append(('S', spec.rows - 1, c, f"S{c}_J{spec.rows - 1}_{c}"))
+    for r in range(spec.rows):
+        entries.append(('W', r, 0, f"W{r}_J{r}_0"))
+        entries.append(('E', r, spec.cols - 1, f"E{r}_J{r}_{spec.cols - 1}"))
+
+    end = f"{spec.duration:g}"
+    flows = []
+    for approach, r, c, entry in entries:
+        cars = spec.demand * (1.0 - spec.truck_ratio)
+        splits = [
+            ('T', _THROUGH[approach], cars * (1.0 - spec.turn_ratio), 'car'),
+            ('R', _RIGHT[approach], cars * spec.turn_ratio / 2, 'car'),
+            ('L', _LEFT[approach], cars * spec.turn_ratio / 2, 'car'),
+            ('truck', _THROUGH[approach], spec.demand * spec.truck_ratio, 'truck'),
+        ]
+        for tag, direction, rate, vtype in splits:
+            if rate <= 0:
+                continue
+            flows.append(
+                f'    <flow id="flow_{entry}_{tag}" type="{vtype}" from="{entry}" '
+                f'to="{boundary_exit(r, c, direction)}" begin="0" end="{end}" '
+                f'vehsPerHour="{rate:.1f}" departSpeed="max" departLane="best"/>'
+            )
+
+    path.write_text(f"""<?xml version="1.0" encoding="UTF-8"?>
+<routes>
+    <vType id="car" accel="2.6" decel="4.5" sigma="0.5" length="5.0"
+           minGap="2.5" maxSpeed="50" guiShape="passenger"/>
+    <vType id="truck" accel="1.8" decel="4.0" sigma="0.5" length="12.0"
+           minGap="3.0" maxSpeed="40" guiShape="truck"/>
+    <vType id="ambulance" accel="3.0" decel="5.0" sigma="0.3" length="6.0"
+           minGap="2.5" maxSpeed="50" guiShape="emergency" color="1,0,0"/>
+    <vType id="fire_truck" accel="2.5" decel="4.5" sigma="0.3" length="8.0"
+           minGap="3.0" maxSpeed="45" guiShape="firebrigade" color="1,0,0"/>
+
+{chr(10).join(flows)}
+</routes>
+""")
+
+
+def _write_sumo_config(spec: GridSpec, path: Path):
+    path.write_text(f"""<?xml version="1.0" encoding="UTF-8"?>
+<configuration>
+    <input>
+        <net-file value="network.net.xml"/>
+        <route-files value="routes.rou.xml"/>
+    </input>
+    <time>
+        <begin value="0"/>
+        <end value="{spec.duration:g}"/>
+        <step-length value="{spec.step_length:g}"/>
+    </time>
+    <processing>
+        <time-to-teleport value="-1"/>
+        <max-depart-delay value="300"/>
+    </processing>
+    <report>
+        <verbose value="false"/>
+        <no-step-log value="true"/>
+    </report>
+</configuration>
+""")
+
+
+def write_intersection_config(net_file: Path, path: Path) -> Dict:
+    """
+    Write intersection_config.yaml for a built network
+
+    'intersection' is the first TLS (sorted ID) in the schema LaneMapper
+    reads; 'intersections' holds the same block for every TLS.
+    """
+    from simulation.geometry_cache import compile_network
+    from simulation.intersections import discover_intersections
+
+    intersections = discover_intersections(compile_network(str(net_file)))
+    blocks = {}
+    for intersection in intersections:
+        block = intersection.lane_mapper_config()['intersection']
+        block['counting_lines'] = {'approach': 50.0, 'queue': 20.0, 'stop': 0.0}
+        blocks[intersection.tls_id] = block
+
+    config = {
+        'intersection': blocks[intersections[0].tls_id],
+        'intersections': blocks
+    }
+    with open(path, 'w') as f:
+        yaml.safe_dump(config, f, sort_keys=False)
+    return config
+
+
+def _build(spec: GridSpec, out_dir: Path):
+    """Write all files for spec into out_dir (must exist)"""
+    _write_nodes(spec, out_dir / "network.nod.xml")
+    _write_edges(spec, out_dir / "network.edg.xml")
+    _write_connections_and_tls(spec, out_dir / "network.con.xml",
+                               out_dir / "traffic_lights.add.xml")
+
+    cmd = [
+        'netconvert',
+        '--node-files=network.nod.xml',
+        '--edge-files=network.edg.xml',
+        '--connection-files=network.con.xml',
+        '--tllogic-files=traffic_lights.add.xml',
+        '--output-file=network.net.xml',
+        '--no-turnarounds=true',
+        '--junctions.corner-detail=5',
+    ]
+    result = subprocess.run(cmd, cwd=out_dir, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"netconvert failed for {spec.name}: {result.stderr.strip()}")
+
+    _write_routes(spec, out_dir / "routes.rou.xml")
+    _write_sumo_config(spec, out_dir / "sumo.cfg")
+    write_intersection_config(out_dir / "network.net.xml", out_dir / "intersection_config.yaml")
+
+
+def generate_network(spec: GridSpec, cache_dir: Optional[str] = None,
+                     force: bool = False) -> Path:
+    """
+    Build (or reuse) the network for spec
+
+    Args:
+        spec: Network parameters
+        cache_dir: Cache root (default: cache/networks)
+        force: Rebuild even if a cached copy exists
+
+    Returns:
+        Directory containing sumo.cfg, network.net.xml, routes.rou.xml and
+        intersection_config.yaml
+
+    Raises:
+        RuntimeError: If netconvert fails
+    """
+    cache_root = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+    out_dir = cache_root / f"{spec.name}_{spec.digest()[:16]}"
+
+    if (out_dir / "sumo.cfg").exists() and not force:
+        return out_dir
+
+    cache_root.mkdir(parents=True, exist_ok=True)
+    build_dir = Path(tempfile.mkdtemp(prefix=f".tmp{os.getpid()}_", dir=cache_root))
+    try:
+        _build(spec, build_dir)
+        (build_dir / "spec.json").write_text(json.dumps(asdict(spec), indent=2))
+        if out_dir.exists():
+            shutil.rmtree(out_dir)
+        os.replace(build_dir, out_dir)
+    except BaseException:
+        shutil.rmtree(build_dir, ignore_errors=True)
+        raise
+
+    return out_dir
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Generate a grid / corridor network')
+    parser.add_argument('--rows', type=int, default=1)
+    parser.add_argument('--cols', type=int, default=1)
+    parser.add_argument('--lanes', type=int, default=3)
+    parser.add_argument('--spacing', type=float, default=200.0)
+    parser.add_argument('--demand', type=float, default=300.0,
+                        help='veh/h per boundary entry (default: 300)')
+    parser.add_argument('--tls-type', choices=TLS_TYPES, default='static')
+    parser.add_argument('--offset-step', type=float, default=0.0,
+                        help='TLS offset added per column in seconds (default: 0)')
+    parser.add_argument('--force', action='store_true', help='Rebuild cached network')
+    args = parser.parse_args()
+
+    spec = GridSpec(rows=args.rows, cols=args.cols, lanes=args.lanes,
+                    spacing=args.spacing, demand=args.demand,
+                    tls_type=args.tls_type, offset_step=args.offset_step)
+    out_dir = generate_network(spec, force=args.force)
+    print(f"✓ {spec.name} ({spec.num_intersections} intersections): {out_dir}")
+
+
+if __name__ == "__main__":
+    main()
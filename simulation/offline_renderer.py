@@ -0,0 +1,196 @@
+"""
+Parallel offline rendering of recorded runs.
+
+A trace recorded with annotations (TraceRecorder.record with signal state,
+controller mode and overlay stats) holds everything AnnotatedCamera needs,
+so video no longer has to be drawn inside the simulation loop. The trace's
+steps are split into contiguous frame ranges; each range is rendered and
+encoded to its own segment file by a worker process, and the segments are
+concatenated in order into the final video.
+
+Usage:
+    render_trace("output/run.npz", "output/run.mp4", workers=8)
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import cv2
+
+from simulation.annotated_camera import AnnotatedCamera
+from simulation.trace import TraceReader
+from simulation.video_writer import StreamingVideoWriter
+
+
+# Shown for steps recorded before the first control decision
+DEFAULT_SIGNAL_STATE = 'r' * 12
+DEFAULT_CONTROLLER_MODE = 'UNKNOWN'
+
+
+def split_frames(num_frames: int, num_segments: int) -> List[Tuple[int, int]]:
+    """
+    Split [0, num_frames) into contiguous, near-equal [start, end) ranges
+
+    Args:
+        num_frames: Total frames
+        num_segments: Requested number of ranges (fewer if frames run out)
+    """
+    num_segments = max(1, min(num_segments, num_frames))
+    bounds = [round(i * num_frames / num_segments) for i in range(num_segments + 1)]
+    return [(bounds[i], bounds[i + 1]) for i in range(num_segments)
+            if bounds[i + 1] > bounds[i]]
+
+
+def render_segment(trace_path: str, start: int, end: int, output: str,
+                   image_size: Tuple[int, int] = (1920, 1080),
+                   view_range: float = 150.0,
+                   encoder: str = 'auto') -> int:
+    """
+    Render trace steps [start, end) to one video file
+
+    Runs in a worker process: the trace is loaded and the camera (with its
+    cached road layer) built once per segment.
+
+    Returns:
+        Number of frames written
+    """
+    trace = TraceReader(trace_path)
+    camera = AnnotatedCamera(image_size=image_size, view_range=view_range,
+                             intersection_center=trace.intersection_pos)
+
+    with StreamingVideoWriter(output, camera.image_size,
+                              fps=1.0 / trace.step_length,
+                              encoder=encoder) as video:
+        for step in range(start, end):
+            signal_state, mode, stats = trace.annotation(step)
+            video.write(camera.render_annotated_frame(
+                vehicles=trace.frame(step),
+                signal_state=signal_state or DEFAULT_SIGNAL_STATE,
+                controller_mode=mode or DEFAULT_CONTROLLER_MODE,
+                current_time=float(trace.times[step]),
+                stats=stats
+            ))
+    return video.frames_written
+
+
+def concatenate_videos(segments: Sequence[str], output: str,
+                       encoder: str = 'auto') -> None:
+    """
+    Join video segments of identical format, in order
+
+    ffmpeg joins them with the concat demuxer without re-encoding; the
+    OpenCV fallback decodes each segment and re-encodes it.
+
+    Args:
+        segments: Segment files in playback order
+        output: Video file to write
+        encoder: 'ffmpeg', 'opencv' or 'auto' (as for StreamingVideoWriter)
+    """
+    if encoder == 'auto':
+        encoder = 'ffmpeg' if shutil.which('ffmpeg') else 'opencv'
+
+    if encoder == 'ffmpeg':
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as listing:
+            for segment in segments:
+                listing.write(f"file '{Path(segment).resolve()}'\n")
+        try:
+            subprocess.run(
+                ['ffmpeg', '-y', '-loglevel', 'error', '-f', 'concat', '-safe', '0',
+                 '-i', listing.name, '-c', 'copy', '-movflags', '+faststart',
+                 '-f', 'mp4', str(output)],
+                check=True, capture_output=True
+            )
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(
+                f"ffmpeg concat failed: {e.stderr.decode(errors='replace').strip()}"
+            ) from e
+        finally:
+            os.unlink(listing.name)
+        return
+
+    writer = None
+    try:
+        for segment in segments:
+            capture = cv2.VideoCapture(str(segment))
+            if not capture.isOpened():
+                raise RuntimeError(f"cv2.VideoCapture could not open {segment}")
+            if writer is None:
+                size = (int(capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                        int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+                writer = cv2.VideoWriter(str(output), cv2.VideoWriter_fourcc(*'mp4v'),
+                                         capture.get(cv2.CAP_PROP_FPS), size)
+                if not writer.isOpened():
+                    raise RuntimeError(f"cv2.VideoWriter could not open {output}")
+            ok, frame = capture.read()
+            while ok:
+                writer.write(frame)
+                ok, frame = capture.read()
+            capture.release()
+    finally:
+        if writer is not None:
+            writer.release()
+
+
+def render_trace(trace_path: str, output: str,
+                 workers: Optional[int] = None,
+                 segments: Optional[int] = None,
+                 image_size: Tuple[int, int] = (1920, 1080),
+                 view_range: float = 150.0,
+                 encoder: str = 'auto') -> Path:
+    """
+    Render a recorded trace to video on a process pool
+
+    Args:
+        trace_path: Trace written by TraceRecorder (annotated for overlays)
+        output: Video file to write (replaced atomically when complete)
+        workers: Pool size (None = os.cpu_count())
+        segments: Frame ranges to split the trace into (None = one per worker)
+        image_size: Frame (width, height)
+        view_range: Camera view range in meters
+        encoder: Segment encoder ('auto', 'ffmpeg' or 'opencv')
+
+    Returns:
+        Path of the finished video
+    """
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+
+    num_frames = len(TraceReader(trace_path))
+    if num_frames == 0:
+        raise ValueError(f"Trace {trace_path} has no steps to render")
+
+    workers = workers or os.cpu_count() or 1
+    ranges = split_frames(num_frames, segments or workers)
+
+    tmp_prefix = f".tmp{os.getpid()}_{output.stem}"
+    segment_paths = [str(output.with_name(f"{tmp_prefix}_{i:03d}{output.suffix}"))
+                     for i in range(len(ranges))]
+    tmp_output = output.with_name(f"{tmp_prefix}{output.suffix}")
+
+    try:
+        with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as pool:
+            futures = [
+                pool.submit(render_segment, str(trace_path), start, end, path,
+                            image_size, view_range, encoder)
+                for (start, end), path in zip(ranges, segment_paths)
+            ]
+            written = sum(future.result() for future in futures)
+        if written != num_frames:
+            raise RuntimeError(f"Rendered {written} of {num_frames} frames")
+
+        if len(segment_paths) == 1:
+            os.replace(segment_paths[0], tmp_output)
+        else:
+            concatenate_videos(segment_paths, str(tmp_output), encoder)
+        os.replace(tmp_output, output)
+    finally:
+        for path in segment_paths + [str(tmp_output)]:
+            if os.path.exists(path):
+                os.unlink(path)
+
+    return output
@@ -0,0 +1,131 @@
+"""
+Multi-rate scheduling for the simulation control loop.
+
+SUMO advances at a fixed base rate, but the downstream stages do not need
+that resolution: queues and densities change over seconds and signal
+decisions are made on a 1 s grid. MultiRateScheduler decides, per SUMO
+step, which stages are due and how much simulated time has passed since
+each one last ran, so stages receive their dt instead of assuming one.
+
+Usage:
+    scheduler = MultiRateScheduler(base_rate=10.0)
+    for step in range(steps):
+        sumo.step()
+        due = scheduler.tick()
+        if 'state_estimation' in due:
+            state = estimator.update(perceived, t, dt=due['state_estimation'])
+"""
+
+from typing import Dict, Optional
+
+
+# Stage rates in Hz. 'sumo' is the base (simulation step) rate.
+DEFAULT_STAGE_RATES = {
+    'sumo': 10.0,
+    'state_estimation': 2.0,
+    'control': 1.0,
+    'metrics': 1.0
+}
+
+# Mesoscopic fast mode: 1 s SUMO steps, every stage once per step
+MESO_STAGE_RATES = {
+    'sumo': 1.0,
+    'state_estimation': 1.0,
+    'control': 1.0,
+    'metrics': 1.0
+}
+
+
+class MultiRateScheduler:
+    """
+    Fires stages at integer divisions of the base simulation rate.
+
+    Counting is done in whole steps, so there is no floating-point drift.
+    Every stage fires on the first tick; a stage at rate r then fires every
+    base_rate / r steps. Stages are returned in registration order, which
+    callers rely on (estimation before control before metrics).
+    """
+
+    def __init__(self, base_rate: float = DEFAULT_STAGE_RATES['sumo'],
+                 rates: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            base_rate: Simulation steps per simulated second
+            rates: stage name -> rate in Hz (default: DEFAULT_STAGE_RATES
+                without 'sumo')
+        """
+        if base_rate <= 0:
+            raise ValueError(f"base_rate must be positive, got {base_rate}")
+
+        self.base_rate = base_rate
+        self.step_length = 1.0 / base_rate
+
+        self._periods: Dict[str, int] = {}
+        self._last_step: Dict[str, Optional[int]] = {}
+        self.call_counts: Dict[str, int] = {}
+        self._step = -1
+
+        if rates is None:
+            rates = {k: v for k, v in DEFAULT_STAGE_RATES.items() if k != 'sumo'}
+        for name, rate in rates.items():
+            self.add_stage(name, rate)
+
+    def add_stage(self, name: str, rate: float):
+        """
+        Register a stage
+
+        Raises:
+            ValueError: If the rate is not positive, exceeds the base rate, or
+                does not divide it into a whole number of steps
+        """
+        if rate <= 0 or rate > self.base_rate:
+            raise ValueError(
+                f"Stage '{name}' rate must be in (0, {self.base_rate}] Hz, got {rate}"
+            )
+
+        period = self.base_rate / rate
+        if abs(period - round(period)) > 1e-9:
+            raise ValueError(
+                f"Stage '{name}' rate {rate} Hz is not an integer division "
+                f"of the {self.base_rate} Hz base rate"
+            )
+
+        self._periods[name] = int(round(period))
+        self._last_step[name] = None
+        self.call_counts[name] = 0
+
+    def period(self, name: str) -> float:
+        """Nominal interval between runs of a stage (seconds)"""
+        return self._periods[name] * self.step_length
+
+    def tick(self) -> Dict[str, float]:
+        """
+        Advance one simulation step
+
+        Returns:
+            {stage_name: dt} for every stage due this step, where dt is the
+            simulated time since the stage last ran (its nominal period on
+            the first run)
+        """
+        self._step += 1
+        due = {}
+
+        for name, period in self._periods.items():
+            if self._step % period != 0:
+                continue
+
+            last = self._last_step[name]
+            steps = period if last is None else self._step - last
+            due[name] = steps * self.step_length
+
+            self._last_step[name] = self._step
+            self.call_counts[name] += 1
+
+        return due
+
+    def reset(self):
+        """Restart counting (e.g. for a new episode)"""
+        self._step = -1
+        for name in self._periods:
+            self._last_step[name] = None
+            self.call_counts[name] = 0
@@ -0,0 +1,114 @@
+"""
+Change-only traffic light actuation.
+
+Controllers return their full signal state on every control tick, but
+SUMO holds a state set through TraCI until told otherwise, so resending an
+unchanged state is a wasted round-trip per traffic light. SignalActuator
+remembers the last state written to each TLS, coalesces the commands of
+one step, and writes only the ones that differ - once per step, in flush().
+
+Usage:
+    actuator = SignalActuator(sumo)
+    for step in range(steps):
+        sumo.step()
+        actuator.command(controller.update(state, t), tls_id)
+        actuator.flush(t)
+"""
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+
+@dataclass(frozen=True)
+class ActuationEvent:
+    """A state actually written to a traffic light"""
+    time: float
+    tls_id: str
+    state: str
+    previous: Optional[str]  # None for the first write of a run
+
+
+class SignalActuator:
+    """
+    Sends signal states to SUMO only when they change.
+
+    command() may be called any number of times per step; the last command
+    per TLS wins. flush() writes the changed states and records one
+    ActuationEvent per write.
+    """
+
+    def __init__(self, sumo_interface):
+        """
+        Args:
+            sumo_interface: SUMOInterface whose traffic lights are driven
+        """
+        self.sumo = sumo_interface
+        self._last_state: Dict[str, str] = {}  # tls_id -> state written
+        self._pending: Dict[str, str] = {}     # tls_id -> state to write on flush
+
+        self.events: List[ActuationEvent] = []
+        self.command_counts: Counter = Counter()  # tls_id -> commands received
+        self.write_counts: Counter = Counter()    # tls_id -> states written
+
+    def command(self, state: Optional[str], tls_id: str = "center") -> bool:
+        """
+        Request a signal state for the next flush()
+
+        Args:
+            state: SUMO state string for tls_id (None = no command)
+            tls_id: Traffic light ID
+
+        Returns:
+            True if a write is pending for tls_id after this command
+        """
+        if state is None:
+            return tls_id in self._pending
+
+        self.command_counts[tls_id] += 1
+        if state == self._last_state.get(tls_id):
+            # Unchanged - also cancels an earlier command of this step
+            self._pending.pop(tls_id, None)
+            return False
+
+        self._pending[tls_id] = state
+        return True
+
+    def flush(self, timestamp: float) -> int:
+        """
+        Write this step's changed states to SUMO
+
+        Args:
+            timestamp: Simulation time recorded on the actuation events
+
+        Returns:
+            Number of traffic lights written
+        """
+        for tls_id, state in self._pending.items():
+            self.sumo.set_traffic_light_state(state, tls_id)
+            self.events.append(ActuationEvent(
+                time=timestamp, tls_id=tls_id, state=state,
+                previous=self._last_state.get(tls_id)
+            ))
+            self._last_state[tls_id] = state
+            self.write_counts[tls_id] += 1
+
+        written = len(self._pending)
+        self._pending.clear()
+        return written
+
+    def last_state(self, tls_id: str = "center") -> Optional[str]:
+        """State last written to tls_id (None if never written)"""
+        return self._last_state.get(tls_id)
+
+    def events_for(self, tls_id: str) -> List[ActuationEvent]:
+        """Actuation events of one traffic light, in time order"""
+        return [e for e in self.events if e.tls_id == tls_id]
+
+    def reset(self):
+        """Forget written states and statistics (e.g. for a new run)"""
+        self._last_state.clear()
+        self._pending.clear()
+        self.events.clear()
+        self.command_counts.clear()
+        self.write_counts.clear()
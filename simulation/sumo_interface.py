@@ -1,16 +1,56 @@
 """
 SUMO simulation interface using TraCI.
 Handles simulation control, vehicle queries, and signal manipulation.
+
+Two backends are supported behind the same API:
+    - 'traci':   external sumo/sumo-gui process over a TraCI socket
+    - 'libsumo': SUMO running in-process (no socket serialization)
 """
 
 import os
 import sys
 import traci
+import traci.constants as tc
 import sumolib
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 import numpy as np
 
+from simulation.geometry_cache import load_network
+from simulation.intersections import SignalizedIntersection, discover_intersections
+
+
+SUPPORTED_BACKENDS = ('traci', 'libsumo')
+
+# Per-vehicle variables fetched in one bulk subscription result per step
+VEHICLE_SUBSCRIPTION_VARS = (
+    tc.VAR_POSITION,
+    tc.VAR_LANE_ID,
+    tc.VAR_TYPE,
+    tc.VAR_SPEED,
+    tc.VAR_ANGLE,
+    tc.VAR_WAITING_TIME,
+)
+
+# Per-edge aggregates for mesoscopic runs (meso vehicles have no lane or
+# continuous position, only the edge/segment they are queued on)
+EDGE_SUBSCRIPTION_VARS = (
+    tc.LAST_STEP_VEHICLE_NUMBER,
+    tc.LAST_STEP_VEHICLE_HALTING_NUMBER,
+    tc.LAST_STEP_MEAN_SPEED,
+    tc.VAR_WAITING_TIME,
+    tc.LAST_STEP_VEHICLE_ID_LIST,
+)
+
+# Per-lane aggregates served by the get_lane_* getters once subscribed
+LANE_SUBSCRIPTION_VARS = (
+    tc.LAST_STEP_VEHICLE_NUMBER,
+    tc.LAST_STEP_VEHICLE_HALTING_NUMBER,
+    tc.LAST_STEP_MEAN_SPEED,
+    tc.LAST_STEP_OCCUPANCY,
+    tc.VAR_WAITING_TIME,
+)
+
 
 @dataclass
 class VehicleInfo:
@@ -25,58 +65,312 @@ class VehicleInfo:
     waiting_time: float  # seconds stopped
 
 
+@dataclass
+class VehicleFrame:
+    """
+    Columnar (struct-of-arrays) snapshot of all vehicles at one step.
+    
+    Row i across every array describes one vehicle. String columns hold
+    interned str objects, so repeated types/lanes share storage. Iterating
+    or indexing yields VehicleInfo views for code that expects objects.
+    """
+    ids: np.ndarray                       # (N,) object - vehicle IDs
+    types: np.ndarray                     # (N,) object - vType IDs
+    lane_ids: np.ndarray                  # (N,) object - SUMO lane IDs
+    x: np.ndarray                         # (N,) float64 - meters
+    y: np.ndarray                         # (N,) float64 - meters
+    speed: np.ndarray                     # (N,) float64 - m/s
+    angle: np.ndarray                     # (N,) float64 - degrees
+    waiting_time: np.ndarray              # (N,) float64 - seconds stopped
+    distance_to_intersection: np.ndarray  # (N,) float64 - meters
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    def __getitem__(self, i: int) -> VehicleInfo:
+        """Materialize a single row as VehicleInfo"""
+        return VehicleInfo(
+            id=self.ids[i],
+            type=self.types[i],
+            position=(float(self.x[i]), float(self.y[i])),
+            speed=float(self.speed[i]),
+            angle=float(self.angle[i]),
+            lane_id=self.lane_ids[i],
+            distance_to_intersection=float(self.distance_to_intersection[i]),
+            waiting_time=float(self.waiting_time[i])
+        )
+    
+    def __iter__(self):
+        for i in range(len(self.ids)):
+            yield self[i]
+    
+    @property
+    def positions(self) -> np.ndarray:
+        """(N, 2) array of (x, y)"""
+        return np.column_stack((self.x, self.y))
+    
+    def take(self, rows: np.ndarray) -> 'VehicleFrame':
+        """Sub-frame with the given row indices (or boolean mask)"""
+        return VehicleFrame(
+            ids=self.ids[rows],
+            types=self.types[rows],
+            lane_ids=self.lane_ids[rows],
+            x=self.x[rows],
+            y=self.y[rows],
+            speed=self.speed[rows],
+            angle=self.angle[rows],
+            waiting_time=self.waiting_time[rows],
+            distance_to_intersection=self.distance_to_intersection[rows]
+        )
+    
+    def to_vehicle_infos(self) -> List[VehicleInfo]:
+        """Materialize every row (for legacy callers)"""
+        return list(self)
+    
+    @classmethod
+    def from_columns(cls, ids, types, lane_ids, x, y, speed, angle,
+                     waiting_time,
+                     intersection_pos: Tuple[float, float]) -> 'VehicleFrame':
+        """Build frame from raw per-column sequences"""
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        
+        return cls(
+            ids=_intern_array(ids),
+            types=_intern_array(types),
+            lane_ids=_intern_array(lane_ids),
+            x=x,
+            y=y,
+            speed=np.asarray(speed, dtype=np.float64),
+            angle=np.asarray(angle, dtype=np.float64),
+            waiting_time=np.asarray(waiting_time, dtype=np.float64),
+            distance_to_intersection=np.hypot(
+                x - intersection_pos[0], y - intersection_pos[1]
+            )
+        )
+    
+    @classmethod
+    def from_vehicle_infos(cls, vehicles: List[VehicleInfo]) -> 'VehicleFrame':
+        """Build frame from a list of VehicleInfo objects"""
+        if not vehicles:
+            return cls.empty()
+        
+        return cls(
+            ids=_intern_array([v.id for v in vehicles]),
+            types=_intern_array([v.type for v in vehicles]),
+            lane_ids=_intern_array([v.lane_id for v in vehicles]),
+            x=np.array([v.position[0] for v in vehicles], dtype=np.float64),
+            y=np.array([v.position[1] for v in vehicles], dtype=np.float64),
+            speed=np.array([v.speed for v in vehicles], dtype=np.float64),
+            angle=np.array([v.angle for v in vehicles], dtype=np.float64),
+            waiting_time=np.array([v.waiting_time for v in vehicles], dtype=np.float64),
+            distance_to_intersection=np.array(
+                [v.distance_to_intersection for v in vehicles], dtype=np.float64
+            )
+        )
+    
+    @classmethod
+    def empty(cls) -> 'VehicleFrame':
+        """Frame with zero vehicles"""
+        return cls(
+            ids=np.empty(0, dtype=object),
+            types=np.empty(0, dtype=object),
+            lane_ids=np.empty(0, dtype=object),
+            x=np.empty(0),
+            y=np.empty(0),
+            speed=np.empty(0),
+            angle=np.empty(0),
+            waiting_time=np.empty(0),
+            distance_to_intersection=np.empty(0)
+        )
+
+
+@dataclass
+class EdgeAggregates:
+    """
+    Columnar per-edge traffic aggregates at one step.
+    
+    Row i describes edge_ids[i]. emergency_vehicles holds (ID, vType) of
+    the emergency vehicles spawned through add_emergency_vehicle that are
+    on the edge.
+    """
+    edge_ids: np.ndarray        # (E,) object
+    vehicle_count: np.ndarray   # (E,) int64
+    halting_count: np.ndarray   # (E,) int64 - vehicles slower than 0.1 m/s
+    mean_speed: np.ndarray      # (E,) float64 - m/s (free speed if empty)
+    waiting_time: np.ndarray    # (E,) float64 - summed waiting seconds
+    emergency_vehicles: List[List[Tuple[str, str]]]
+    
+    def __len__(self) -> int:
+        return len(self.edge_ids)
+
+
+def _intern_array(values) -> np.ndarray:
+    """Object array of interned strings"""
+    arr = np.empty(len(values), dtype=object)
+    arr[:] = [sys.intern(v) for v in values]
+    return arr
+
+
 class SUMOInterface:
     """Interface to SUMO simulation via TraCI"""
     
-    def __init__(self, config_file: str, use_gui: bool = False):
+    def __init__(self, config_file: str, use_gui: bool = False,
+                 use_subscriptions: bool = True, backend: str = 'traci',
+                 step_length: float = 0.1, route_file: Optional[str] = None,
+                 mesoscopic: bool = False):
         """
         Initialize SUMO connection
         
         Args:
             config_file: Path to sumo.cfg file
             use_gui: Whether to use sumo-gui (visual) or sumo (headless)
+            use_subscriptions: Fetch vehicle state through TraCI subscriptions
+                (one bulk call per step) instead of per-vehicle getters
+            backend: 'traci' (socket to external SUMO) or 'libsumo' (in-process)
+            step_length: Simulated seconds per step (SUMO --step-length)
+            route_file: Route file replacing the config's route-files
+                (e.g. a compiled scenario; None = use the config's)
+            mesoscopic: Run SUMO's mesoscopic model (--mesosim) with
+                junction control; query traffic with get_edge_aggregates()
         """
+        if backend not in SUPPORTED_BACKENDS:
+            raise ValueError(
+                f"backend must be one of {SUPPORTED_BACKENDS}, got '{backend}'"
+            )
+        if backend == 'libsumo' and use_gui:
+            raise ValueError("libsumo backend does not support sumo-gui")
+        
         self.config_file = config_file
         self.use_gui = use_gui
+        self.use_subscriptions = use_subscriptions
+        self.backend = backend
+        self.step_length = step_length
+        self.route_file = route_file
+        self.mesoscopic = mesoscopic
+        self._api = self._load_backend(backend)
         self.connected = False
         self.step_count = 0
+        self._subscribed_edges: List[str] = []
+        self._lane_results: Dict[str, dict] = {}  # subscribed lane -> last step values
+        self.emergency_vehicles: Dict[str, str] = {}  # spawned ID -> vType
         
         # Get network directory
         self.network_dir = os.path.dirname(config_file)
         self.net_file = os.path.join(self.network_dir, 'network.net.xml')
         
-        # Load network for geometric queries
-        self.net = sumolib.net.readNet(self.net_file)
+        # Compiled network geometry (cached on disk, keyed on file hash)
+        self.network = load_network(self.net_file)
+        self._net = None
         
-        # Get intersection node
-        self.intersection_node = self.net.getNode('center')
-        self.intersection_pos = (
-            self.intersection_node.getCoord()[0],
-            self.intersection_node.getCoord()[1]
-        )
+        # Primary intersection: the 'center' node, else the first TLS
+        self.intersection_pos = self._primary_intersection_pos()
+        self._intersections = None
         
         print(f"SUMO network loaded: {self.net_file}")
         print(f"Intersection position: {self.intersection_pos}")
     
-    def start(self, port: int = 8813):
-        """Start SUMO simulation"""
+    def get_primary_intersection(self) -> SignalizedIntersection:
+        """The 'center' TLS, else the first discovered one"""
+        intersections = self.get_intersections()
+        if not intersections:
+            raise ValueError(f"No traffic lights in {self.net_file}")
+        return next((i for i in intersections if i.tls_id == 'center'), intersections[0])
+    
+    def _primary_intersection_pos(self) -> Tuple[float, float]:
+        """Reference point for distance_to_intersection"""
+        if 'center' in self.network.nodes:
+            return self.network.node_position('center')
+        
+        for tls_id in self.tls_ids:
+            if tls_id in self.network.nodes:
+                return self.network.node_position(tls_id)
+        
+        min_x, min_y, max_x, max_y = self.network.bounds
+        return ((min_x + max_x) / 2, (min_y + max_y) / 2)
+    
+    @property
+    def tls_ids(self) -> List[str]:
+        """All traffic light IDs in the network (sorted)"""
+        return sorted(self.network.traffic_lights)
+    
+    def get_intersections(self) -> List[SignalizedIntersection]:
+        """Signalized intersections discovered from the net file"""
+        if self._intersections is None:
+            self._intersections = discover_intersections(self.network)
+        return self._intersections
+    
+    @staticmethod
+    def _load_backend(backend: str):
+        """Return the TraCI-compatible module for the selected backend"""
+        if backend == 'traci':
+            return traci
+        
+        try:
+            import libsumo
+        except ImportError as e:
+            raise ImportError(
+                "libsumo backend requested but libsumo is not installed "
+                "(pip install libsumo)"
+            ) from e
+        return libsumo
+    
+    def start(self, port: int = 8813, seed: Optional[int] = None,
+              state_file: Optional[str] = None):
+        """
+        Start SUMO simulation
+        
+        Args:
+            port: TraCI port (ignored by the libsumo backend)
+            seed: Random seed for reproducible demand (None = random run)
+            state_file: Saved state to start from (SUMO --load-state);
+                time starts at the snapshot time. Prefer this over
+                load_state(), which re-inserts flows that had already
+                emitted all their vehicles before the snapshot.
+        """
         sumo_binary = "sumo-gui" if self.use_gui else "sumo"
         
         sumo_cmd = [
             sumo_binary,
             "-c", self.config_file,
-            "--step-length", "0.1",
+            "--step-length", str(self.step_length),
             "--time-to-teleport", "-1",
             "--no-step-log",
             "--no-warnings",
-            "--random"
+            # Snapshots restore the exact random stream and vehicle states
+            "--save-state.rng",
+            "--save-state.precision", "8"
         ]
         
+        if self.route_file is not None:
+            sumo_cmd.extend(["--route-files", self.route_file])
+        
+        if state_file is not None:
+            sumo_cmd.extend(["--load-state", state_file])
+        
+        if self.mesoscopic:
+            # Junction control makes meso vehicles obey the traffic lights
+            sumo_cmd.extend(["--mesosim", "true", "--meso-junction-control", "true"])
+        
+        if seed is None:
+            sumo_cmd.append("--random")
+        else:
+            sumo_cmd.extend(["--seed", str(seed)])
+        
         try:
-            traci.start(sumo_cmd, port=port)
+            if self.backend == 'libsumo':
+                self._api.start(sumo_cmd)
+            else:
+                self._api.start(sumo_cmd, port=port)
             self.connected = True
             self.step_count = 0
-            print(f"✓ SUMO started ({sumo_binary})")
+            self.emergency_vehicles.clear()
+            self._lane_results.clear()
+            
+            # Vehicles already in the network (e.g. loaded from state)
+            if self.use_subscriptions:
+                self._subscribe_vehicles(self._api.vehicle.getIDList())
+            print(f"✓ SUMO started ({sumo_binary}, {self.backend})")
         except Exception as e:
             print(f"✗ Failed to start SUMO: {e}")
             raise
@@ -86,52 +380,215 @@ class SUMOInterface:
         if not self.connected:
             raise RuntimeError("SUMO not connected")
         
-        traci.simulationStep()
+        self._api.simulationStep()
         self.step_count += 1
+        
+        if self._lane_results:
+            self._lane_results.update(self._api.lane.getAllSubscriptionResults())
+        
+        # Subscribe newly departed vehicles; arrived vehicles drop out
+        # of the subscription results automatically
+        if self.use_subscriptions:
+            self._subscribe_vehicles(self._api.simulation.getDepartedIDList())
+    
+    def _subscribe_vehicles(self, vehicle_ids):
+        """Subscribe vehicles to the per-step state variables"""
+        for vid in vehicle_ids:
+            try:
+                self._api.vehicle.subscribe(vid, VEHICLE_SUBSCRIPTION_VARS)
+            except self._api.TraCIException:
+                continue  # Vehicle may have left simulation
+    
+    def save_state(self, state_file: str):
+        """
+        Save complete simulation state (vehicles, signals, RNG) to file
+        
+        Args:
+            state_file: Output path (.xml, .xml.gz or .sbx)
+        """
+        if not self.connected:
+            raise RuntimeError("SUMO not connected")
+        
+        self._api.simulation.saveState(state_file)
+    
+    def load_state(self, state_file: str):
+        """
+        Replace current simulation state with a saved snapshot
+        
+        Simulation time jumps to the snapshot time. Vehicles restored from
+        the snapshot are subscribed like newly departed ones. Flows that
+        had finished emitting are not in the snapshot and start over from
+        the route file; start(state_file=...) restores them exactly.
+        
+        Args:
+            state_file: File written by save_state()
+        """
+        if not self.connected:
+            raise RuntimeError("SUMO not connected")
+        
+        self._api.simulation.loadState(state_file)
+        
+        if self.use_subscriptions:
+            self._subscribe_vehicles(self._api.vehicle.getIDList())
     
     def close(self):
         """Close SUMO connection"""
         if self.connected:
-            traci.close()
+            self._api.close()
             self.connected = False
             print("✓ SUMO connection closed")
     
     def get_current_time(self) -> float:
         """Get simulation time in seconds"""
-        return traci.simulation.getTime()
+        return self._api.simulation.getTime()
     
     def get_all_vehicles(self) -> List[VehicleInfo]:
         """Get information for all vehicles in simulation"""
-        vehicle_ids = traci.vehicle.getIDList()
+        if self.use_subscriptions:
+            return self._get_all_vehicles_subscribed()
+        
+        vehicle_ids = self._api.vehicle.getIDList()
         vehicles = []
         
         for vid in vehicle_ids:
             try:
-                pos = traci.vehicle.getPosition(vid)
-                lane_id = traci.vehicle.getLaneID(vid)
-                
-                # Calculate distance to intersection
-                dist = np.sqrt(
-                    (pos[0] - self.intersection_pos[0])**2 + 
-                    (pos[1] - self.intersection_pos[1])**2
-                )
-                
-                vehicle = VehicleInfo(
-                    id=vid,
-                    type=traci.vehicle.getTypeID(vid),
-                    position=pos,
-                    speed=traci.vehicle.getSpeed(vid),
-                    angle=traci.vehicle.getAngle(vid),
-                    lane_id=lane_id,
-                    distance_to_intersection=dist,
-                    waiting_time=traci.vehicle.getWaitingTime(vid)
+                vehicle = self._make_vehicle_info(
+                    vid,
+                    vtype=self._api.vehicle.getTypeID(vid),
+                    pos=self._api.vehicle.getPosition(vid),
+                    speed=self._api.vehicle.getSpeed(vid),
+                    angle=self._api.vehicle.getAngle(vid),
+                    lane_id=self._api.vehicle.getLaneID(vid),
+                    waiting_time=self._api.vehicle.getWaitingTime(vid)
                 )
                 vehicles.append(vehicle)
-            except traci.exceptions.TraCIException:
+            except self._api.TraCIException:
                 continue  # Vehicle may have left simulation
         
         return vehicles
     
+    def _get_all_vehicles_subscribed(self) -> List[VehicleInfo]:
+        """Build VehicleInfo list from this step's subscription results"""
+        results = self._api.vehicle.getAllSubscriptionResults()
+        vehicles = []
+        
+        for vid, values in results.items():
+            vehicles.append(self._make_vehicle_info(
+                vid,
+                vtype=values[tc.VAR_TYPE],
+                pos=values[tc.VAR_POSITION],
+                speed=values[tc.VAR_SPEED],
+                angle=values[tc.VAR_ANGLE],
+                lane_id=values[tc.VAR_LANE_ID],
+                waiting_time=values[tc.VAR_WAITING_TIME]
+            ))
+        
+        return vehicles
+    
+    def subscribe_edges(self, edge_ids: List[str]):
+        """Subscribe edges to the aggregates returned by get_edge_aggregates()"""
+        for edge_id in edge_ids:
+            self._api.edge.subscribe(edge_id, EDGE_SUBSCRIPTION_VARS)
+        self._subscribed_edges = list(edge_ids)
+    
+    def subscribe_lanes(self, lane_ids: List[str]):
+        """
+        Subscribe lanes so the get_lane_* getters read the bulk per-step
+        subscription result instead of issuing one call each
+        """
+        for lane_id in lane_ids:
+            self._api.lane.subscribe(lane_id, LANE_SUBSCRIPTION_VARS)
+            self._lane_results.setdefault(lane_id, {})
+        self._lane_results.update(self._api.lane.getAllSubscriptionResults())
+    
+    def _lane_value(self, lane_id: str, var: int, getter: str, default):
+        """Subscribed value of a lane variable, else a direct query"""
+        values = self._lane_results.get(lane_id)
+        if values is not None and var in values:
+            return values[var]
+        try:
+            return getattr(self._api.lane, getter)(lane_id)
+        except self._api.TraCIException:
+            return default
+    
+    def get_edge_aggregates(self) -> EdgeAggregates:
+        """
+        Aggregates of the edges passed to subscribe_edges(), in that order
+        
+        One bulk subscription result per step; the cost does not depend on
+        the number of vehicles.
+        """
+        results = self._api.edge.getAllSubscriptionResults()
+        rows = [results.get(edge_id, {}) for edge_id in self._subscribed_edges]
+        
+        emergency = self.emergency_vehicles
+        return EdgeAggregates(
+            edge_ids=np.array(self._subscribed_edges, dtype=object),
+            vehicle_count=np.array(
+                [r.get(tc.LAST_STEP_VEHICLE_NUMBER, 0) for r in rows], dtype=np.int64),
+            halting_count=np.array(
+                [r.get(tc.LAST_STEP_VEHICLE_HALTING_NUMBER, 0) for r in rows], dtype=np.int64),
+            mean_speed=np.array(
+                [r.get(tc.LAST_STEP_MEAN_SPEED, 0.0) for r in rows], dtype=np.float64),
+            waiting_time=np.array(
+                [r.get(tc.VAR_WAITING_TIME, 0.0) for r in rows], dtype=np.float64),
+            emergency_vehicles=[
+                [(vid, emergency[vid]) for vid in r.get(tc.LAST_STEP_VEHICLE_ID_LIST, ())
+                 if vid in emergency]
+                for r in rows
+            ]
+        )
+    
+    def get_vehicle_frame(self) -> VehicleFrame:
+        """
+        Get all vehicles as a columnar VehicleFrame.
+        
+        With subscriptions enabled the frame is filled straight from the
+        bulk subscription result, without creating VehicleInfo objects.
+        """
+        if not self.use_subscriptions:
+            return VehicleFrame.from_vehicle_infos(self.get_all_vehicles())
+        
+        results = self._api.vehicle.getAllSubscriptionResults()
+        if not results:
+            return VehicleFrame.empty()
+        
+        values = list(results.values())
+        positions = np.array([r[tc.VAR_POSITION] for r in values], dtype=np.float64)
+        
+        return VehicleFrame.from_columns(
+            ids=list(results.keys()),
+            types=[r[tc.VAR_TYPE] for r in values],
+            lane_ids=[r[tc.VAR_LANE_ID] for r in values],
+            x=positions[:, 0],
+            y=positions[:, 1],
+            speed=[r[tc.VAR_SPEED] for r in values],
+            angle=[r[tc.VAR_ANGLE] for r in values],
+            waiting_time=[r[tc.VAR_WAITING_TIME] for r in values],
+            intersection_pos=self.intersection_pos
+        )
+    
+    def _make_vehicle_info(self, vid: str, vtype: str, pos: Tuple[float, float],
+                           speed: float, angle: float, lane_id: str,
+                           waiting_time: float) -> VehicleInfo:
+        """Create VehicleInfo with distance to intersection filled in"""
+        # Calculate distance to intersection
+        dist = np.sqrt(
+            (pos[0] - self.intersection_pos[0])**2 + 
+            (pos[1] - self.intersection_pos[1])**2
+        )
+        
+        return VehicleInfo(
+            id=vid,
+            type=vtype,
+            position=pos,
+            speed=speed,
+            angle=angle,
+            lane_id=lane_id,
+            distance_to_intersection=dist,
+            waiting_time=waiting_time
+        )
+    
     def get_vehicles_on_lane(self, lane_id: str) -> List[VehicleInfo]:
         """Get all vehicles on a specific lane"""
         all_vehicles = self.get_all_vehicles()
@@ -139,7 +596,7 @@ class SUMOInterface:
     
     def get_traffic_light_state(self, tls_id: str = "center") -> str:
         """Get current traffic light state string"""
-        return traci.trafficlight.getRedYellowGreenState(tls_id)
+        return self._api.trafficlight.getRedYellowGreenState(tls_id)
     
     def set_traffic_light_state(self, state: str, tls_id: str = "center"):
         """
@@ -150,32 +607,67 @@ class SUMOInterface:
                   G=green, y=yellow, r=red for each connection
             tls_id: Traffic light ID
         """
-        traci.trafficlight.setRedYellowGreenState(tls_id, state)
+        self._api.trafficlight.setRedYellowGreenState(tls_id, state)
     
     def set_traffic_light_phase(self, phase_index: int, tls_id: str = "center"):
         """Set traffic light to specific phase"""
-        traci.trafficlight.setPhase(tls_id, phase_index)
+        self._api.trafficlight.setPhase(tls_id, phase_index)
     
     def get_lane_vehicles_count(self, lane_id: str) -> int:
         """Get number of vehicles on lane"""
-        try:
-            return traci.lane.getLastStepVehicleNumber(lane_id)
-        except traci.exceptions.TraCIException:
-            return 0
+        return self._lane_value(lane_id, tc.LAST_STEP_VEHICLE_NUMBER,
+                                'getLastStepVehicleNumber', 0)
+    
+    def get_lane_halting_count(self, lane_id: str) -> int:
+        """Get number of vehicles slower than 0.1 m/s on lane"""
+        return self._lane_value(lane_id, tc.LAST_STEP_VEHICLE_HALTING_NUMBER,
+                                'getLastStepHaltingNumber', 0)
     
     def get_lane_occupancy(self, lane_id: str) -> float:
-        """Get lane occupancy percentage (0-100)"""
-        try:
-            return traci.lane.getLastStepOccupancy(lane_id)
-        except traci.exceptions.TraCIException:
-            return 0.0
+        """Get fraction of the lane length covered by vehicles (0-1)"""
+        return self._lane_value(lane_id, tc.LAST_STEP_OCCUPANCY,
+                                'getLastStepOccupancy', 0.0)
     
     def get_lane_mean_speed(self, lane_id: str) -> float:
-        """Get mean speed on lane (m/s)"""
-        try:
-            return traci.lane.getLastStepMeanSpeed(lane_id)
-        except traci.exceptions.TraCIException:
-            return 0.0
+        """Get mean speed on lane (m/s; the lane speed limit if empty)"""
+        return self._lane_value(lane_id, tc.LAST_STEP_MEAN_SPEED,
+                                'getLastStepMeanSpeed', 0.0)
+    
+    def get_lane_waiting_time(self, lane_id: str) -> float:
+        """Get summed waiting time of the vehicles on lane (seconds)"""
+        return self._lane_value(lane_id, tc.VAR_WAITING_TIME,
+                                'getWaitingTime', 0.0)
+    
+    def get_emergency_vehicle_states(self) -> List[VehicleInfo]:
+        """
+        State of the emergency vehicles spawned through add_emergency_vehicle
+        
+        A targeted query of only those vehicles, independent of traffic
+        volume. Vehicles not yet inserted are skipped; arrived ones are
+        forgotten.
+        """
+        vehicles = []
+        for vid, vtype in list(self.emergency_vehicles.items()):
+            try:
+                lane_id = self._api.vehicle.getLaneID(vid)
+                if not lane_id:
+                    continue  # Waiting for insertion
+                vehicles.append(self._make_vehicle_info(
+                    vid,
+                    vtype=vtype,
+                    pos=self._api.vehicle.getPosition(vid),
+                    speed=self._api.vehicle.getSpeed(vid),
+                    angle=self._api.vehicle.getAngle(vid),
+                    lane_id=lane_id,
+                    waiting_time=self._api.vehicle.getWaitingTime(vid)
+                ))
+            except self._api.TraCIException:
+                del self.emergency_vehicles[vid]  # Arrived
+        return vehicles
+    
+    def get_vehicle_lane_position(self, vehicle_id: str) -> float:
+        """Distance driven along the vehicle's current lane (meters)"""
+        return self._api.vehicle.getLanePosition(vehicle_id)
     
     def add_emergency_vehicle(self, 
                             route_id: str, 
@@ -192,22 +684,29 @@ class SUMOInterface:
         vid = f"emergency_{self.step_count}_{vtype}"
         
         try:
-            traci.vehicle.add(
+            self._api.vehicle.add(
                 vehID=vid,
                 routeID=route_id,
                 typeID=vtype,
                 depart=depart_time if depart_time else 'now'
             )
+            self.emergency_vehicles[vid] = vtype
             print(f"✓ Added emergency vehicle: {vid} on route {route_id}")
             return vid
-        except traci.exceptions.TraCIException as e:
+        except self._api.TraCIException as e:
             print(f"✗ Failed to add emergency vehicle: {e}")
             return None
     
+    @property
+    def net(self):
+        """Full sumolib network, parsed on first access"""
+        if self._net is None:
+            self._net = sumolib.net.readNet(self.net_file)
+        return self._net
+    
     def get_network_bounds(self) -> Tuple[float, float, float, float]:
         """Get network bounding box (min_x, min_y, max_x, max_y)"""
-        boundary = self.net.getBoundary()
-        return boundary
+        return self.network.bounds
     
     def __enter__(self):
         """Context manager entry"""
@@ -0,0 +1,329 @@
+"""
+Recorded vehicle traces for open-loop experiments.
+
+TraceRecorder captures the per-step vehicle stream of a SUMO run
+(get_vehicle_frame / get_all_vehicles) and writes it to a single columnar
+.npz file. TraceReader loads it back and returns VehicleFrames by step or
+timestamp without SUMO, so state estimation and control can be iterated on
+a fixed, exactly reproducible input.
+
+File layout (all arrays, one row per vehicle observation):
+    x, y, speed, angle, waiting_time, distance   float64
+    id_code, type_code, lane_code                int32 - index into *_vocab
+    id_vocab, type_vocab, lane_vocab             str
+    step_time                                    float64, one per step
+    step_offset                                  int64, steps + 1 - rows of
+                                                 step i are [off[i], off[i+1])
+    intersection_pos, step_length, version       metadata
+
+Optional per-step annotations (present when record() was given any):
+    step_signal, step_mode                       str, '' = none that step
+    stat_names                                   str, overlay stat keys
+    step_stats                                   float64 (steps, stats),
+                                                 NaN = stat absent
+    stat_is_int                                  bool, stat was always int
+"""
+
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from simulation.sumo_interface import VehicleFrame, VehicleInfo
+
+
+TRACE_FORMAT_VERSION = 1
+
+_FLOAT_COLUMNS = ('x', 'y', 'speed', 'angle', 'waiting_time', 'distance')
+
+
+class _Vocabulary:
+    """Maps strings to dense integer codes in first-seen order"""
+
+    def __init__(self):
+        self.codes: Dict[str, int] = {}
+
+    def encode(self, values) -> np.ndarray:
+        codes = self.codes
+        return np.fromiter(
+            (codes.setdefault(v, len(codes)) for v in values),
+            dtype=np.int32, count=len(values)
+        )
+
+    def to_array(self) -> np.ndarray:
+        return np.array(list(self.codes), dtype=str)
+
+
+class TraceRecorder:
+    """
+    Accumulates vehicle frames in memory and writes them on close().
+
+    Usage:
+        recorder = TraceRecorder("run.npz", sumo.intersection_pos, sumo.step_length)
+        for step in range(steps):
+            sumo.step()
+            recorder.record(current_time, sumo.get_vehicle_frame())
+        recorder.close()
+    """
+
+    def __init__(self, path: str, intersection_pos: Tuple[float, float],
+                 step_length: float = 0.1, compress: bool = False):
+        """
+        Args:
+            path: Output .npz file
+            intersection_pos: Intersection center the distances refer to
+            step_length: Simulation step length of the recorded run
+            compress: Use np.savez_compressed (smaller, slower to load)
+        """
+        self.path = Path(path)
+        self.intersection_pos = intersection_pos
+        self.step_length = step_length
+        self.compress = compress
+
+        self._columns: Dict[str, List[np.ndarray]] = {
+            name: [] for name in _FLOAT_COLUMNS + ('id_code', 'type_code', 'lane_code')
+        }
+        self._ids = _Vocabulary()
+        self._types = _Vocabulary()
+        self._lanes = _Vocabulary()
+        self._step_time: List[float] = []
+        self._step_count: List[int] = []
+        self._step_signal: List[str] = []
+        self._step_mode: List[str] = []
+        self._step_stats: List[Dict[str, float]] = []
+        self._annotated = False
+        self.closed = False
+
+    def record(self, timestamp: float,
+               vehicles: Union[VehicleFrame, List[VehicleInfo]],
+               signal_state: Optional[str] = None,
+               controller_mode: Optional[str] = None,
+               stats: Optional[Dict[str, float]] = None):
+        """
+        Append one simulation step
+
+        Args:
+            timestamp: Simulation time of the step
+            vehicles: VehicleFrame or get_all_vehicles() result
+            signal_state: Signal state in effect during the step (optional)
+            controller_mode: Controller mode, e.g. "NORMAL" (optional)
+            stats: Numeric overlay stats, e.g. {'vehicles': 12} (optional)
+        """
+        if self.closed:
+            raise RuntimeError("TraceRecorder already closed")
+
+        frame = vehicles if isinstance(vehicles, VehicleFrame) \
+            else VehicleFrame.from_vehicle_infos(vehicles)
+
+        cols = self._columns
+        cols['x'].append(frame.x)
+        cols['y'].append(frame.y)
+        cols['speed'].append(frame.speed)
+        cols['angle'].append(frame.angle)
+        cols['waiting_time'].append(frame.waiting_time)
+        cols['distance'].append(frame.distance_to_intersection)
+        cols['id_code'].append(self._ids.encode(frame.ids))
+        cols['type_code'].append(self._types.encode(frame.types))
+        cols['lane_code'].append(self._lanes.encode(frame.lane_ids))
+
+        self._step_time.append(timestamp)
+        self._step_count.append(len(frame))
+
+        self._step_signal.append(signal_state or '')
+        self._step_mode.append(controller_mode or '')
+        self._step_stats.append(stats or {})
+        if signal_state or controller_mode or stats:
+            self._annotated = True
+
+    def __len__(self) -> int:
+        return len(self._step_time)
+
+    def close(self) -> Path:
+        """Write the trace file (atomically) and return its path"""
+        if self.closed:
+            return self.path
+
+        arrays = {
+            name: np.concatenate(chunks) if chunks else np.empty(
+                0, dtype=np.int32 if name.endswith('_code') else np.float64
+            )
+            for name, chunks in self._columns.items()
+        }
+        arrays.update(
+            id_vocab=self._ids.to_array(),
+            type_vocab=self._types.to_array(),
+            lane_vocab=self._lanes.to_array(),
+            step_time=np.asarray(self._step_time, dtype=np.float64),
+            step_offset=np.concatenate(
+                ([0], np.cumsum(self._step_count, dtype=np.int64))
+            ),
+            intersection_pos=np.asarray(self.intersection_pos, dtype=np.float64),
+            step_length=np.float64(self.step_length),
+            version=np.int64(TRACE_FORMAT_VERSION)
+        )
+        if self._annotated:
+            arrays.update(self._annotation_arrays())
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f".tmp{os.getpid()}_{self.path.name}")
+        save = np.savez_compressed if self.compress else np.savez
+        with open(tmp_path, 'wb') as f:
+            save(f, **arrays)
+        os.replace(tmp_path, self.path)
+
+        self.closed = True
+        self._columns = {}
+        return self.path
+
+    def _annotation_arrays(self) -> Dict[str, np.ndarray]:
+        """Per-step annotation columns; stats become a NaN-padded matrix"""
+        names = list(dict.fromkeys(k for stats in self._step_stats for k in stats))
+        step_stats = np.full((len(self._step_stats), len(names)), np.nan)
+        is_int = np.ones(len(names), dtype=bool)
+        for step, stats in enumerate(self._step_stats):
+            for col, name in enumerate(names):
+                if name in stats:
+                    value = stats[name]
+                    step_stats[step, col] = value
+                    is_int[col] &= isinstance(value, (int, np.integer))
+
+        return dict(
+            step_signal=np.array(self._step_signal, dtype=str),
+            step_mode=np.array(self._step_mode, dtype=str),
+            stat_names=np.array(names, dtype=str),
+            step_stats=step_stats,
+            stat_is_int=is_int
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+
+
+class TraceReader:
+    """
+    Random access to a recorded trace.
+
+    All columns are loaded once; frame(i) is then a handful of array
+    slices plus vocabulary lookups.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Trace file written by TraceRecorder
+
+        Raises:
+            ValueError: If the file has an unsupported format version
+        """
+        self.path = Path(path)
+
+        with np.load(self.path, allow_pickle=False) as data:
+            version = int(data['version'])
+            if version != TRACE_FORMAT_VERSION:
+                raise ValueError(
+                    f"Unsupported trace version {version} in {self.path} "
+                    f"(expected {TRACE_FORMAT_VERSION})"
+                )
+
+            self._columns = {name: data[name] for name in _FLOAT_COLUMNS}
+            self._id_code = data['id_code']
+            self._type_code = data['type_code']
+            self._lane_code = data['lane_code']
+
+            self.times: np.ndarray = data['step_time']
+            self.offsets: np.ndarray = data['step_offset']
+            self.intersection_pos = tuple(data['intersection_pos'].tolist())
+            self.step_length = float(data['step_length'])
+
+            # Interned object vocabularies, so decoded frames match live ones
+            self._id_vocab = self._object_vocab(data['id_vocab'])
+            self._type_vocab = self._object_vocab(data['type_vocab'])
+            self._lane_vocab = self._object_vocab(data['lane_vocab'])
+
+            self.has_annotations = 'step_signal' in data.files
+            if self.has_annotations:
+                self._step_signal = data['step_signal']
+                self._step_mode = data['step_mode']
+                self._stat_names = [str(n) for n in data['stat_names']]
+                self._step_stats = data['step_stats']
+                self._stat_is_int = data['stat_is_int']
+
+    @staticmethod
+    def _object_vocab(values: np.ndarray) -> np.ndarray:
+        vocab = np.empty(len(values), dtype=object)
+        vocab[:] = [sys.intern(str(v)) for v in values]
+        return vocab
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    @property
+    def num_observations(self) -> int:
+        return int(self.offsets[-1])
+
+    def step_at(self, timestamp: float) -> int:
+        """Index of the last recorded step at or before timestamp"""
+        step = int(np.searchsorted(self.times, timestamp + 1e-9, side='right')) - 1
+        if step < 0:
+            raise KeyError(f"No recorded step at or before t={timestamp}")
+        return step
+
+    def frame(self, step: int) -> VehicleFrame:
+        """VehicleFrame for a step index"""
+        if not -len(self) <= step < len(self):
+            raise IndexError(f"Step {step} out of range for {len(self)}-step trace")
+        step %= len(self)
+        rows = slice(self.offsets[step], self.offsets[step + 1])
+        cols = self._columns
+
+        return VehicleFrame(
+            ids=self._id_vocab[self._id_code[rows]],
+            types=self._type_vocab[self._type_code[rows]],
+            lane_ids=self._lane_vocab[self._lane_code[rows]],
+            x=cols['x'][rows],
+            y=cols['y'][rows],
+            speed=cols['speed'][rows],
+            angle=cols['angle'][rows],
+            waiting_time=cols['waiting_time'][rows],
+            distance_to_intersection=cols['distance'][rows]
+        )
+
+    def frame_at(self, timestamp: float) -> VehicleFrame:
+        """VehicleFrame for the last step at or before timestamp"""
+        return self.frame(self.step_at(timestamp))
+
+    def vehicle_infos(self, step: int) -> List[VehicleInfo]:
+        """Same data as SUMOInterface.get_all_vehicles() returned for the step"""
+        return self.frame(step).to_vehicle_infos()
+
+    def annotation(self, step: int) -> Tuple[Optional[str], Optional[str], Dict[str, float]]:
+        """
+        Recorded (signal_state, controller_mode, stats) of a step
+
+        Missing values are None / absent from stats; traces recorded
+        without annotations return (None, None, {}) for every step.
+        """
+        if not -len(self) <= step < len(self):
+            raise IndexError(f"Step {step} out of range for {len(self)}-step trace")
+        if not self.has_annotations:
+            return None, None, {}
+
+        stats = {}
+        for name, value, is_int in zip(self._stat_names, self._step_stats[step],
+                                       self._stat_is_int):
+            if not np.isnan(value):
+                stats[name] = int(value) if is_int else float(value)
+
+        return (str(self._step_signal[step]) or None,
+                str(self._step_mode[step]) or None,
+                stats)
+
+    def __iter__(self) -> Iterator[Tuple[float, VehicleFrame]]:
+        for step in range(len(self)):
+            yield float(self.times[step]), self.frame(step)
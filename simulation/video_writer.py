@@ -0,0 +1,177 @@
+"""
+Streaming video output for rendered frames.
+
+Frames go through a bounded queue to a writer thread that encodes them as
+they arrive - into an ffmpeg subprocess's stdin as raw RGB, or through
+cv2.VideoWriter when ffmpeg is not installed. Nothing touches the disk
+except the output video, and rendering only waits for the encoder when
+the queue is full.
+
+Usage:
+    with StreamingVideoWriter("demo.mp4", (1920, 1080), fps=10) as video:
+        for step in range(steps):
+            video.write(camera.render_frame(vehicles))
+"""
+
+import queue
+import shutil
+import subprocess
+import threading
+from pathlib import Path
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+SUPPORTED_ENCODERS = ('auto', 'ffmpeg', 'opencv')
+
+# Same encoding as the PNG-sequence path: H.264, QuickTime compatible
+FFMPEG_OUTPUT_ARGS = [
+    '-c:v', 'libx264',
+    '-preset', 'medium',
+    '-crf', '23',
+    '-pix_fmt', 'yuv420p',
+    '-movflags', '+faststart',
+]
+
+_STOP = object()
+
+
+class StreamingVideoWriter:
+    """
+    Encodes RGB frames to a video file on a background thread.
+
+    write() copies the frame (camera buffers are reused between renders)
+    and blocks only while queue_size frames are already waiting. Encoder
+    errors are raised from the next write() or from close().
+    """
+
+    def __init__(self, path: str, frame_size: Tuple[int, int], fps: float = 10.0,
+                 encoder: str = 'auto', queue_size: int = 32):
+        """
+        Args:
+            path: Output video file (.mp4)
+            frame_size: (width, height) of every frame
+            fps: Frames per second of the output
+            encoder: 'ffmpeg' (stdin pipe), 'opencv' (cv2.VideoWriter) or
+                'auto' (ffmpeg if on PATH, else opencv)
+            queue_size: Frames buffered between renderer and encoder
+        """
+        if encoder not in SUPPORTED_ENCODERS:
+            raise ValueError(f"encoder must be one of {SUPPORTED_ENCODERS}, got '{encoder}'")
+        if encoder == 'auto':
+            encoder = 'ffmpeg' if shutil.which('ffmpeg') else 'opencv'
+
+        self.path = Path(path)
+        self.frame_size = tuple(frame_size)
+        self.fps = fps
+        self.encoder = encoder
+        self.frames_written = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._sink = self._open_sink()
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="video-writer", daemon=True)
+        self._thread.start()
+
+    def _open_sink(self):
+        """Start the ffmpeg process or open the OpenCV writer"""
+        width, height = self.frame_size
+
+        if self.encoder == 'ffmpeg':
+            cmd = [
+                'ffmpeg', '-y', '-loglevel', 'error',
+                '-f', 'rawvideo', '-pix_fmt', 'rgb24',
+                '-s', f'{width}x{height}', '-framerate', str(self.fps),
+                '-i', '-',
+                *FFMPEG_OUTPUT_ARGS,
+                str(self.path)
+            ]
+            try:
+                return subprocess.Popen(cmd, stdin=subprocess.PIPE,
+                                        stderr=subprocess.PIPE)
+            except FileNotFoundError as e:
+                raise RuntimeError("ffmpeg not found; use encoder='opencv'") from e
+
+        writer = cv2.VideoWriter(str(self.path), cv2.VideoWriter_fourcc(*'mp4v'),
+                                 self.fps, (width, height))
+        if not writer.isOpened():
+            raise RuntimeError(f"cv2.VideoWriter could not open {self.path}")
+        return writer
+
+    def write(self, frame: np.ndarray):
+        """
+        Queue one RGB frame (H, W, 3) uint8 for encoding
+
+        Args:
+            frame: Frame matching frame_size; copied before queuing
+        """
+        if self._closed:
+            raise RuntimeError("write() on a closed StreamingVideoWriter")
+        self._raise_error()
+
+        height, width = frame.shape[:2]
+        if (width, height) != self.frame_size:
+            raise ValueError(f"Frame size {(width, height)} does not match {self.frame_size}")
+
+        # Block while the encoder is behind, but notice if it died meanwhile
+        item = np.ascontiguousarray(frame, dtype=np.uint8).copy()
+        while True:
+            try:
+                self._queue.put(item, timeout=1.0)
+                return
+            except queue.Full:
+                self._raise_error()
+
+    def _run(self):
+        """Writer thread: encode queued frames until the stop marker"""
+        while True:
+            frame = self._queue.get()
+            if frame is _STOP:
+                return
+            if self._error is not None:
+                continue  # Drain so write() never blocks forever
+            try:
+                if self.encoder == 'ffmpeg':
+                    self._sink.stdin.write(frame.data)
+                else:
+                    self._sink.write(cv2.cvtColor(frame, cv2.COLOR_RGB2BGR))
+                self.frames_written += 1
+            except Exception as e:
+                self._error = e
+
+    def _raise_error(self):
+        """Re-raise an encoder failure in the caller's thread"""
+        if self._error is not None:
+            raise RuntimeError(f"Video encoding failed: {self._error}") from self._error
+
+    def close(self):
+        """Flush queued frames, finish the file and stop the writer thread"""
+        if self._closed:
+            return
+        self._closed = True
+
+        self._queue.put(_STOP)
+        self._thread.join()
+
+        if self.encoder == 'ffmpeg':
+            try:
+                self._sink.stdin.close()
+            except BrokenPipeError:
+                pass
+            stderr = self._sink.stderr.read()
+            if self._sink.wait() != 0 and self._error is None:
+                self._error = RuntimeError(stderr.decode(errors='replace').strip())
+        else:
+            self._sink.release()
+
+        self._raise_error()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
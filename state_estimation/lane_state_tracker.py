@@ -13,11 +13,12 @@ Key Improvements from Day 1:
 """
 
 import numpy as np
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple, Union
 from dataclasses import dataclass, field
 from collections import deque
 
 from perception.types import PerceivedVehicle
+from perception.perceived_frame import PerceivedFrame
 
 
 @dataclass(frozen=True)
@@ -117,7 +118,10 @@ class LaneStateTracker:
         print(f"✓ Initialized tracker for {len(lane_ids)} lanes")
         print(f"  Queue thresholds: {self.QUEUE_DISTANCE_THRESHOLD}m, {self.STOPPED_SPEED_THRESHOLD}m/s")
     
-    def update(self, perceived_vehicles: List[PerceivedVehicle], current_time: float):
+    def update(self,
+               perceived_vehicles: Union[List[PerceivedVehicle], PerceivedFrame,
+                                         Dict[str, LaneState]],
+               current_time: float):
         """
         Update lane states based on perceived vehicles.
         
@@ -125,41 +129,52 @@ class LaneStateTracker:
         Empty lanes produce zero-valued states (not missing entries).
         
         Args:
-            perceived_vehicles: List of PerceivedVehicle objects
+            perceived_vehicles: List of PerceivedVehicle objects, a
+                columnar PerceivedFrame (no per-vehicle objects needed), or
+                {lane_id: LaneState} measured directly from lane aggregates
             current_time: Current simulation time in seconds
         
         Postcondition: len(self.current_states) == len(self.lane_ids)
         """
-        # Group vehicles by lane first (for efficiency)
-        # CRITICAL: Initialize ALL lanes, even those with no vehicles
-        vehicles_by_lane: Dict[str, List[PerceivedVehicle]] = {
-            lid: [] for lid in self.lane_ids
-        }
+        if isinstance(perceived_vehicles, dict):
+            self._update_from_lane_states(perceived_vehicles, current_time)
+            return
+        
+        if isinstance(perceived_vehicles, PerceivedFrame):
+            frame = perceived_vehicles
+        else:
+            frame = PerceivedFrame.from_vehicles(perceived_vehicles)
+        
+        track_ids = frame.track_ids.tolist()
+        speeds = frame.speeds
         
-        for vehicle in perceived_vehicles:
+        # Group row indices by lane (CRITICAL: every lane present, even if empty)
+        rows_by_lane: Dict[str, List[int]] = {lid: [] for lid in self.lane_ids}
+        
+        for row, (track_id, lane_id) in enumerate(zip(track_ids, frame.lane_ids.tolist())):
             # Track vehicle first appearance
-            if vehicle.track_id not in self.vehicle_first_seen:
-                self.vehicle_first_seen[vehicle.track_id] = current_time
-                self.vehicle_stop_time[vehicle.track_id] = None
-                self.vehicle_last_speed[vehicle.track_id] = 0.0
+            if track_id not in self.vehicle_first_seen:
+                self.vehicle_first_seen[track_id] = current_time
+                self.vehicle_stop_time[track_id] = None
+                self.vehicle_last_speed[track_id] = 0.0
             
             # Track vehicle lane
-            if vehicle.lane_id:
-                self.vehicle_last_lane[vehicle.track_id] = vehicle.lane_id
+            if lane_id:
+                self.vehicle_last_lane[track_id] = lane_id
                 
-                if vehicle.lane_id in vehicles_by_lane:
-                    vehicles_by_lane[vehicle.lane_id].append(vehicle)
+                if lane_id in rows_by_lane:
+                    rows_by_lane[lane_id].append(row)
         
         # Update stop/start times for all vehicles
-        self._update_stop_times(perceived_vehicles, current_time)
+        self._update_stop_times(track_ids, speeds.tolist(), current_time)
         
         # Compute state for each lane
         # INVARIANT: Create state for EVERY lane, even if empty
         new_states = {}
         for lane_id in self.lane_ids:
-            vehicles = vehicles_by_lane[lane_id]
             new_states[lane_id] = self._compute_lane_state(
-                lane_id, vehicles, current_time
+                lane_id, frame, np.array(rows_by_lane[lane_id], dtype=int),
+                speeds, current_time
             )
         
         # INVARIANT CHECK: Complete snapshot guarantee
@@ -172,112 +187,105 @@ class LaneStateTracker:
             self.state_history[lane_id].append(state)
         
         # Clean up old vehicle tracking data
-        self._cleanup_old_vehicles(perceived_vehicles, current_time)
+        self._cleanup_old_vehicles(set(track_ids), current_time)
+    
+    def _update_from_lane_states(self, lane_states: Dict[str, LaneState],
+                                 current_time: float):
+        """
+        Take lane states measured by aggregate perception as-is.
+        
+        No per-vehicle tracking happens; lanes missing from lane_states
+        get empty states so the complete-snapshot invariant still holds.
+        """
+        new_states = {
+            lane_id: lane_states.get(lane_id) or LaneState(lane_id=lane_id, timestamp=current_time)
+            for lane_id in self.lane_ids
+        }
+        
+        self.current_states = new_states
+        for lane_id, state in new_states.items():
+            self.state_history[lane_id].append(state)
     
-    def _update_stop_times(self, vehicles: List[PerceivedVehicle], current_time: float):
+    def _update_stop_times(self, track_ids: List[int], speeds: List[float],
+                           current_time: float):
         """
         Update stop/start times for all vehicles.
         
         Fixes Day 1 bug: waiting time now tracks from stop event, not first_seen.
         """
-        for v in vehicles:
-            # Calculate speed magnitude
-            speed = np.sqrt(v.velocity[0]**2 + v.velocity[1]**2)
-            
-            # Get previous speed
-            prev_speed = self.vehicle_last_speed.get(v.track_id, speed)
-            
+        for track_id, speed in zip(track_ids, speeds):
             # Detect stop event
             if speed < self.STOPPED_SPEED_THRESHOLD:
-                if v.track_id not in self.vehicle_stop_time or \
-                   self.vehicle_stop_time[v.track_id] is None:
+                if self.vehicle_stop_time.get(track_id) is None:
                     # Vehicle just stopped
-                    self.vehicle_stop_time[v.track_id] = current_time
+                    self.vehicle_stop_time[track_id] = current_time
             else:
                 # Vehicle is moving - reset stop time
-                self.vehicle_stop_time[v.track_id] = None
+                self.vehicle_stop_time[track_id] = None
             
             # Update last speed
-            self.vehicle_last_speed[v.track_id] = speed
+            self.vehicle_last_speed[track_id] = speed
     
     def _compute_lane_state(self, 
                            lane_id: str,
-                           vehicles: List[PerceivedVehicle],
+                           frame: PerceivedFrame,
+                           indices: np.ndarray,
+                           speeds: np.ndarray,
                            current_time: float) -> LaneState:
         """
         Compute complete state for a single lane.
         
+        Args:
+            lane_id: Lane being computed
+            frame: All perceived vehicles this timestep
+            indices: Rows of frame assigned to this lane (input order)
+            speeds: Speed magnitude for every row of frame
+            current_time: Current simulation time
+        
         Returns immutable LaneState object.
         """
-        if len(vehicles) == 0:
+        if len(indices) == 0:
             return LaneState(lane_id=lane_id, timestamp=current_time)
         
         # Extract vehicle metrics
-        distances = []
-        speeds = []
-        stopped_count = 0
-        queued_vehicles = []
-        
-        for v in vehicles:
-            # Distance
-            if v.distance_to_stop_line >= 0:
-                distances.append(v.distance_to_stop_line)
-            
-            # Speed
-            speed = np.sqrt(v.velocity[0]**2 + v.velocity[1]**2)
-            speeds.append(speed)
-            
-            # Stopped count
-            if speed < self.STOPPED_SPEED_THRESHOLD:
-                stopped_count += 1
-            
-            # Queue detection
-            if (v.distance_to_stop_line >= 0 and 
-                v.distance_to_stop_line <= self.QUEUE_DISTANCE_THRESHOLD and
-                speed < self.STOPPED_SPEED_THRESHOLD):
-                queued_vehicles.append(v)
+        lane_distances = frame.distances_to_stop_line[indices]
+        lane_speeds = speeds[indices]
+        in_lane = lane_distances >= 0
+        stopped = lane_speeds < self.STOPPED_SPEED_THRESHOLD
+        
+        # Queue detection
+        queued = in_lane & (lane_distances <= self.QUEUE_DISTANCE_THRESHOLD) & stopped
         
         # Basic stats
-        vehicle_count = len(vehicles)
-        avg_speed = np.mean(speeds) if speeds else 0.0
+        vehicle_count = len(indices)
+        stopped_count = int(np.count_nonzero(stopped))
+        avg_speed = np.mean(lane_speeds)
         
         # Queue metrics
-        if queued_vehicles:
-            queue_length = max(v.distance_to_stop_line for v in queued_vehicles)
-            queue_vehicle_count = len(queued_vehicles)
-        else:
-            queue_length = 0.0
-            queue_vehicle_count = 0
+        queue_vehicle_count = int(np.count_nonzero(queued))
+        queue_length = float(lane_distances[queued].max()) if queue_vehicle_count else 0.0
         
         # Density (vehicles per 100m)
         density = (vehicle_count / self.LANE_LENGTH) * 100.0
         
         # Waiting time (FIXED: from stop time, not first seen)
+        # Only count waiting time if vehicle is currently stopped
         waiting_times = []
-        for v in vehicles:
-            speed = np.sqrt(v.velocity[0]**2 + v.velocity[1]**2)
-            
-            # Only count waiting time if vehicle is currently stopped
-            if speed < self.STOPPED_SPEED_THRESHOLD:
-                stop_time = self.vehicle_stop_time.get(v.track_id)
-                if stop_time is not None:
-                    waiting_time = current_time - stop_time
-                    waiting_times.append(waiting_time)
+        for track_id in frame.track_ids[indices[stopped]].tolist():
+            stop_time = self.vehicle_stop_time.get(track_id)
+            if stop_time is not None:
+                waiting_times.append(current_time - stop_time)
         
         avg_waiting_time = np.mean(waiting_times) if waiting_times else 0.0
         
         # Emergency vehicle detection
-        emergency_vehicles = [v for v in vehicles if v.is_emergency]
-        has_emergency = len(emergency_vehicles) > 0
+        emergency = frame.is_emergency[indices]
+        has_emergency = bool(emergency.any())
         emergency_distance = None
         
-        if emergency_vehicles:
-            emergency_distances = [
-                v.distance_to_stop_line for v in emergency_vehicles
-                if v.distance_to_stop_line >= 0
-            ]
-            if emergency_distances:
-                emergency_distance = min(emergency_distances)
+        emergency_distances = lane_distances[emergency & in_lane]
+        if emergency_distances.size > 0:
+            emergency_distance = float(emergency_distances.min())
         
         # Create immutable state
         return LaneState(
@@ -292,20 +300,18 @@ class LaneStateTracker:
             avg_waiting_time=avg_waiting_time,
             has_emergency_vehicle=has_emergency,
             emergency_vehicle_distance=emergency_distance,
-            vehicle_distances=tuple(distances),
-            vehicle_speeds=tuple(speeds)
+            vehicle_distances=tuple(lane_distances[in_lane].tolist()),
+            vehicle_speeds=tuple(lane_speeds.tolist())
         )
     
     def _cleanup_old_vehicles(self, 
-                             current_vehicles: List[PerceivedVehicle],
+                             current_track_ids: Set[int],
                              current_time: float):
         """
         Remove tracking data for vehicles that have left.
         
         Increased timeout from 5s to 10s for safety (Day 2 improvement).
         """
-        current_track_ids = {v.track_id for v in current_vehicles}
-        
         # Find vehicles to remove
         to_remove = []
         for track_id in self.vehicle_first_seen.keys():
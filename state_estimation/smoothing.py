@@ -14,7 +14,7 @@ class ExponentialMovingAverage:
     Smooths noisy measurements while being responsive to changes.
     """
     
-    def __init__(self, alpha: float = 0.3):
+    def __init__(self, alpha: float = 0.3, reference_dt: Optional[float] = None):
         """
         Initialize EMA filter
         
@@ -23,17 +23,32 @@ class ExponentialMovingAverage:
                   0 = no update (ignore new data)
                   1 = no smoothing (use raw data)
                   0.3 = good balance for traffic
+            reference_dt: Update interval alpha was tuned for. When set,
+                updates with a different dt use the alpha giving the same
+                decay per second of time. None = alpha is per update.
         """
         self.alpha = alpha
+        self.reference_dt = reference_dt
         self.state: Dict[str, float] = {}
     
-    def update(self, key: str, value: float) -> float:
+    def alpha_for(self, dt: Optional[float]) -> float:
+        """Smoothing factor for an update dt seconds after the previous one"""
+        if dt is None or self.reference_dt is None:
+            return self.alpha
+        n = dt / self.reference_dt
+        if abs(n - 1.0) < 1e-9:
+            return self.alpha
+        # n reference updates of (1-α) decay == one update of (1-α)^n
+        return 1.0 - (1.0 - self.alpha) ** n
+    
+    def update(self, key: str, value: float, dt: Optional[float] = None) -> float:
         """
         Update EMA for a key
         
         Args:
             key: Identifier (e.g., lane_id)
             value: New measurement
+            dt: Seconds since the previous update (see reference_dt)
             
         Returns:
             Smoothed value
@@ -43,7 +58,8 @@ class ExponentialMovingAverage:
             self.state[key] = value
         else:
             # EMA update: S_t = α * x_t + (1-α) * S_{t-1}
-            self.state[key] = self.alpha * value + (1 - self.alpha) * self.state[key]
+            alpha = self.alpha_for(dt)
+            self.state[key] = alpha * value + (1 - alpha) * self.state[key]
         
         return self.state[key]
     
@@ -65,25 +81,30 @@ class MultiVariableEMA:
     Useful for smoothing different traffic metrics simultaneously.
     """
     
-    def __init__(self, alphas: Dict[str, float]):
+    def __init__(self, alphas: Dict[str, float],
+                 reference_dt: Optional[float] = None):
         """
         Initialize multi-variable EMA
         
         Args:
             alphas: Dictionary of variable_name -> smoothing_factor
+            reference_dt: Update interval the alphas were tuned for
+                (see ExponentialMovingAverage)
         """
         self.filters = {
-            var: ExponentialMovingAverage(alpha)
+            var: ExponentialMovingAverage(alpha, reference_dt)
             for var, alpha in alphas.items()
         }
     
-    def update(self, key: str, values: Dict[str, float]) -> Dict[str, float]:
+    def update(self, key: str, values: Dict[str, float],
+               dt: Optional[float] = None) -> Dict[str, float]:
         """
         Update all variables for a key
         
         Args:
             key: Identifier (e.g., lane_id)
             values: Dictionary of variable_name -> measurement
+            dt: Seconds since the previous update
             
         Returns:
             Dictionary of variable_name -> smoothed_value
@@ -92,7 +113,7 @@ class MultiVariableEMA:
         
         for var, value in values.items():
             if var in self.filters:
-                smoothed[var] = self.filters[var].update(f"{key}_{var}", value)
+                smoothed[var] = self.filters[var].update(f"{key}_{var}", value, dt)
             else:
                 # No smoothing for unknown variables
                 smoothed[var] = value
@@ -13,10 +13,11 @@ Key Improvements from Day 1:
 """
 
 import numpy as np
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 from dataclasses import dataclass
 
 from perception.types import PerceivedVehicle
+from perception.perceived_frame import PerceivedFrame
 from state_estimation.lane_state_tracker import LaneStateTracker, LaneState
 from state_estimation.smoothing import MultiVariableEMA
 
@@ -71,8 +72,13 @@ class TrafficStateEstimator:
         - density: α=0.4 (less smoothing, faster response)
         - avg_waiting_time: α=0.2 (heavy smoothing, very noisy signal)
         - vehicle_count: α=0.5 (light smoothing, discrete jumps)
+    
+    The factors are per 0.1s update; updates at other intervals (pass dt)
+    are rescaled to the same decay per second.
     """
     
+    SMOOTHING_REFERENCE_DT = 0.1  # seconds - update interval alphas were tuned at
+    
     def __init__(self, lane_ids: List[str], enable_smoothing: bool = True):
         """
         Initialize state estimator.
@@ -94,7 +100,7 @@ class TrafficStateEstimator:
                 'density': 0.4,           # Less: density changes quickly
                 'avg_waiting_time': 0.2,  # Heavy: very noisy, saw-tooth from departures
                 'vehicle_count': 0.5      # Light: discrete jumps, need responsiveness
-            })
+            }, reference_dt=self.SMOOTHING_REFERENCE_DT)
         
         self.lane_ids = lane_ids
         
@@ -102,14 +108,19 @@ class TrafficStateEstimator:
         print(f"  Smoothing: {'enabled' if enable_smoothing else 'disabled'}")
     
     def update(self, 
-               perceived_vehicles: List[PerceivedVehicle], 
-               current_time: float) -> IntersectionState:
+               perceived_vehicles: Union[List[PerceivedVehicle], PerceivedFrame,
+                                         Dict[str, LaneState]], 
+               current_time: float,
+               dt: Optional[float] = None) -> IntersectionState:
         """
         Update state estimation with new perception data.
         
         Args:
-            perceived_vehicles: List of PerceivedVehicle objects from perception
+            perceived_vehicles: List of PerceivedVehicle objects from perception,
+                a columnar PerceivedFrame, or {lane_id: LaneState} from
+                lane-aggregate perception (skips per-vehicle tracking)
             current_time: Current simulation time (seconds)
+            dt: Seconds since the previous update (None = assume 0.1s)
         
         Returns:
             Immutable IntersectionState object
@@ -122,7 +133,7 @@ class TrafficStateEstimator:
         
         # Apply smoothing if enabled
         if self.enable_smoothing:
-            smoothed_states = self._smooth_states(raw_states)
+            smoothed_states = self._smooth_states(raw_states, dt)
         else:
             smoothed_states = raw_states
         
@@ -183,7 +194,8 @@ class TrafficStateEstimator:
         
         return state
     
-    def _smooth_states(self, states: Dict[str, LaneState]) -> Dict[str, LaneState]:
+    def _smooth_states(self, states: Dict[str, LaneState],
+                       dt: Optional[float] = None) -> Dict[str, LaneState]:
         """
         Apply EMA smoothing to lane states.
         
@@ -202,7 +214,7 @@ class TrafficStateEstimator:
             }
             
             # Apply smoothing
-            smoothed_values = self.smoother.update(lane_id, values)
+            smoothed_values = self.smoother.update(lane_id, values, dt)
             
             # Create new immutable state with smoothed values
             smoothed_state = LaneState(
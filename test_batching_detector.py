@@ -0,0 +1,106 @@
+"""
+Unit tests for the micro-batching detector service.
+Uses a stand-in for VehicleDetector.detect_batch (no model weights
+needed) that records the batches it is given.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import numpy as np
+import pytest
+
+from perception.batching_detector import BatchingDetector
+from perception.detection_batch import Detection, DetectionBatch
+
+
+class _RecordingDetector:
+    """detect_batch() stand-in: one detection per frame, tagged with the frame's value"""
+
+    def __init__(self, latency: float = 0.02):
+        self.latency = latency
+        self.batch_sizes = []
+
+    def detect_batch(self, frames, conf_threshold=0.3):
+        self.batch_sizes.append(len(frames))
+        time.sleep(self.latency)
+        results = []
+        for frame in frames:
+            value = int(frame[0, 0, 0])
+            results.append(DetectionBatch.from_detections([
+                Detection(bbox=(value, 0.0, value + 10.0, 10.0), confidence=c,
+                          class_id=2, class_name='car')
+                for c in (0.35, 0.9) if c >= conf_threshold
+            ]))
+        return results
+
+
+def _frame(value: int) -> np.ndarray:
+    return np.full((8, 8, 3), value, dtype=np.uint8)
+
+
+def test_concurrent_requests_are_batched():
+    """Frames submitted together share model calls; results reach their callers."""
+    print("\n" + "="*70)
+    print("TEST: Micro-Batching Under Load")
+    print("="*70)
+
+    model = _RecordingDetector()
+    results = {}
+
+    def camera(camera_id):
+        results[camera_id] = [service.detect(_frame(camera_id * 10 + i)) for i in range(5)]
+
+    with BatchingDetector(model, max_batch_size=4, max_wait=0.05) as service:
+        threads = [threading.Thread(target=camera, args=(k,)) for k in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        stats = service.get_statistics()
+
+    assert sum(model.batch_sizes) == 40 and max(model.batch_sizes) <= 4
+    assert len(model.batch_sizes) < 20, f"FAIL: barely batched {model.batch_sizes}"
+    for camera_id, per_frame in results.items():
+        assert [dets[0].bbox[0] for dets in per_frame] == \
+            [camera_id * 10 + i for i in range(5)], "FAIL: results misrouted"
+    assert stats['frames'] == 40 and stats['avg_batch_size'] > 2
+
+    print(f"✓ 40 frames in {len(model.batch_sizes)} batches "
+          f"(avg {stats['avg_batch_size']:.1f})")
+
+
+def test_light_load_and_errors():
+    """A lone frame waits at most max_wait; thresholds and errors are per request."""
+    print("\n" + "="*70)
+    print("TEST: Micro-Batching Latency / Thresholds / Errors")
+    print("="*70)
+
+    model = _RecordingDetector(latency=0.0)
+    service = BatchingDetector(model, max_batch_size=8, max_wait=0.02)
+
+    start = time.perf_counter()
+    detections = service.detect(_frame(1))
+    assert time.perf_counter() - start < 0.5
+    assert model.batch_sizes == [1] and len(detections) == 2
+
+    # One model call at the loosest threshold, filtered per request
+    loose = service.submit(_frame(2), conf_threshold=0.3)
+    strict = service.submit(_frame(3), conf_threshold=0.5)
+    assert len(loose.result()) == 2
+    assert [d.confidence for d in strict.result()] == [0.9]
+
+    def fail(frames, conf_threshold):
+        raise RuntimeError("model crashed")
+    model.detect_batch = fail
+    with pytest.raises(RuntimeError, match="model crashed"):
+        service.detect(_frame(4))
+
+    service.close()
+    with pytest.raises(RuntimeError):
+        service.submit(_frame(5))
+
+    print("✓ Low-load latency bounded, thresholds per request, errors propagated")
@@ -0,0 +1,68 @@
+"""
+Unit tests for the compiled network geometry cache.
+Checks compiled geometry against sumolib and cache invalidation.
+"""
+
+import sys
+import shutil
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import numpy as np
+import sumolib
+
+from simulation import geometry_cache
+from simulation.geometry_cache import load_network, load_intersection_config
+
+
+NET_FILE = Path(__file__).parent / "sumo_networks" / "simple_4way" / "network.net.xml"
+CONFIG_PATH = Path(__file__).parent / "config" / "intersection_config.yaml"
+
+
+def test_compiled_network_matches_sumolib(tmp_path):
+    """Cached geometry equals what sumolib reports, before and after caching."""
+    print("\n" + "="*70)
+    print("TEST: Compiled Network Geometry")
+    print("="*70)
+
+    net = sumolib.net.readNet(str(NET_FILE))
+
+    compiled = geometry_cache.compile_network(str(NET_FILE))
+    load_network(str(NET_FILE), cache_dir=str(tmp_path))
+    geometry_cache._memo.clear()
+    cached = load_network(str(NET_FILE), cache_dir=str(tmp_path))
+
+    assert len(list(tmp_path.glob("*.pkl"))) == 1
+    for network in (compiled, cached):
+        assert network.nodes['center'] == tuple(net.getNode('center').getCoord()[:2])
+        for edge in net.getEdges():
+            for lane in edge.getLanes():
+                assert np.array_equal(network.lane_shapes[lane.getID()],
+                                      np.array(lane.getShape()))
+                assert network.stop_lines[lane.getID()] == lane.getShape()[-1]
+        assert set(network.traffic_lights) == {t.getID() for t in net.getTrafficLights()}
+        assert 'N_in_0' in network.incoming_lanes['center']
+
+    print(f"✓ {len(cached.lane_shapes)} lanes, {len(cached.nodes)} nodes identical")
+
+
+def test_cache_invalidated_on_source_change(tmp_path):
+    """Editing the source file produces a new cache entry, not stale data."""
+    print("\n" + "="*70)
+    print("TEST: Geometry Cache Invalidation")
+    print("="*70)
+
+    config = tmp_path / "intersection_config.yaml"
+    shutil.copy(CONFIG_PATH, config)
+    cache_dir = tmp_path / "cache"
+
+    first = load_intersection_config(str(config), cache_dir=str(cache_dir))
+    assert first['intersection']['center']['x'] == 200.0
+
+    config.write_text(config.read_text().replace("x: 200.0  # SUMO", "x: 250.0  # SUMO"))
+    second = load_intersection_config(str(config), cache_dir=str(cache_dir))
+
+    assert second['intersection']['center']['x'] == 250.0
+    assert len(list(cache_dir.glob("*.pkl"))) == 2
+
+    print("✓ Changed file recompiled under a new key")
@@ -0,0 +1,60 @@
+"""
+Unit tests for signalized intersection discovery.
+Checks the single-intersection network maps onto the existing lane IDs and
+that a network-wide frame is partitioned correctly between intersections.
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import numpy as np
+
+from simulation.geometry_cache import load_network, load_intersection_config
+from simulation.intersections import discover_intersections, IntersectionIndex
+
+
+NET_FILE = Path(__file__).parent / "sumo_networks" / "simple_4way" / "network.net.xml"
+CONFIG_PATH = Path(__file__).parent / "config" / "intersection_config.yaml"
+
+
+def test_simple_4way_discovery():
+    """The single TLS maps to the hand-written lane IDs and canonical state."""
+    print("\n" + "="*70)
+    print("TEST: Intersection Discovery (simple_4way)")
+    print("="*70)
+
+    intersections = discover_intersections(load_network(str(NET_FILE)))
+    assert [i.tls_id for i in intersections] == ['center']
+
+    center = intersections[0]
+    assert all(sumo == local for sumo, local in center.sumo_to_local.items())
+    assert center.to_sumo_state('GGGrrrGGGrrr') == 'GGGrrrGGGrrr'
+
+    config = load_intersection_config(str(CONFIG_PATH))['intersection']
+    assert set(center.local_lane_ids) == set(config['lanes'])
+    generated = center.lane_mapper_config()['intersection']
+    for lane_id, lane in generated['lanes'].items():
+        assert lane['direction'] == config['lanes'][lane_id]['direction']
+        assert lane['lane_index'] == config['lanes'][lane_id]['lane_index']
+
+    print(f"✓ {len(center.local_lane_ids)} lanes, identity link mapping")
+
+
+def test_partition_by_incoming_lane():
+    """Each vehicle row goes to the intersection owning its lane, or nowhere."""
+    print("\n" + "="*70)
+    print("TEST: Intersection Partition")
+    print("="*70)
+
+    intersections = discover_intersections(load_network(str(NET_FILE)))
+    index = IntersectionIndex(intersections)
+
+    lanes = np.array(['N_in_0', 'N_out_0', 'E_in_1', ':center_0_0', 'W_in_2'], dtype=object)
+    rows = index.partition(lanes)
+
+    assert len(rows) == 1
+    assert rows[0].tolist() == [0, 2, 4]
+    assert index.partition(np.array([], dtype=object))[0].size == 0
+
+    print("✓ Outgoing and internal lanes excluded")
@@ -0,0 +1,152 @@
+"""
+Unit tests for lane-ROI cropped detection.
+Uses a stand-in detector that finds rendered cars by color (no model
+weights needed), so full-frame and ROI results can be compared exactly.
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import cv2
+import numpy as np
+import pytest
+
+from perception.batching_detector import BatchingDetector
+from perception.detection_batch import DetectionBatch, box_iou_matrix
+from perception.lane_mapper import LaneMapper
+from perception.lane_roi_detector import LaneROIDetector, pack_tiles
+from perception.perception_pipeline import PerceptionPipeline
+from simulation.camera_interface import VirtualCamera
+from simulation.sumo_interface import VehicleFrame
+
+
+CONFIG_PATH = str(Path(__file__).parent / "config" / "intersection_config.yaml")
+CENTER = (200.0, 200.0)
+
+
+class _ColorDetector:
+    """detect() stand-in: one box per blob of the rendered car color"""
+
+    imgsz = 640
+
+    def __init__(self):
+        self.calls = []
+
+    def detect(self, frame, conf_threshold=0.3, imgsz=None):
+        self.calls.append((frame.shape, imgsz))
+        mask = (np.abs(frame.astype(int) - (100, 100, 255)) < 30).all(axis=-1)
+        n, _, stats, _ = cv2.connectedComponentsWithStats(mask.astype(np.uint8))
+        x, y, w, h = stats[1:, 0], stats[1:, 1], stats[1:, 2], stats[1:, 3]
+        class_names = np.empty(n - 1, dtype=object)
+        class_names[:] = 'car'
+        return DetectionBatch(
+            boxes=np.stack([x, y, x + w, y + h], axis=1).astype(np.float32),
+            confidences=np.full(n - 1, 0.9, dtype=np.float32),
+            class_ids=np.full(n - 1, 2, dtype=np.int64),
+            class_names=class_names
+        )
+
+
+def test_approach_bounds_and_packing():
+    """Approach rectangles cover their lanes; packed tiles never overlap."""
+    print("\n" + "="*70)
+    print("TEST: Approach Bounds / Tile Packing")
+    print("="*70)
+
+    mapper = LaneMapper(CONFIG_PATH)
+    bounds = mapper.approach_bounds()
+    assert set(bounds) == {'N', 'S', 'E', 'W'}
+
+    rng = np.random.default_rng(0)
+    for approach, (x0, y0, x1, y1) in bounds.items():
+        points = rng.uniform((x0, y0), (x1, y1), size=(500, 2))
+        lane_ids = mapper.assign_lanes(points[:, 0], points[:, 1])
+        assert all(lane_id.startswith(f"{approach}_in_") for lane_id in lane_ids), \
+            f"FAIL: {approach} bounds leave the approach"
+        for lane_id in mapper.get_lanes_by_approach(approach):
+            lane = mapper.get_lane_info(lane_id)
+            for px, py in (lane.stop_line, lane.entry_line):
+                assert x0 <= px <= x1 and y0 <= py <= y1
+    assert mapper.approach_bounds(2.0)['N'][0] == bounds['N'][0] - 2.0
+
+    sizes = [(54, 258), (54, 258), (258, 54), (258, 54), (40, 40)]
+    positions, (width, height) = pack_tiles(sizes, gap=32)
+    rects = [(x, y, x + w, y + h) for (x, y), (w, h) in zip(positions, sizes)]
+    for i, a in enumerate(rects):
+        assert a[2] <= width and a[3] <= height
+        for b in rects[i + 1:]:
+            assert (a[2] + 32 <= b[0] or b[2] + 32 <= a[0] or
+                    a[3] + 32 <= b[1] or b[3] + 32 <= a[1]), "FAIL: tiles overlap"
+    assert width * height < 2.5 * sum(w * h for w, h in sizes)
+
+    print(f"✓ Bounds cover their lanes; 5 tiles packed into {width}x{height}")
+
+
+def test_roi_detection_matches_full_frame():
+    """Approach-lane vehicles are found at the same boxes; others are skipped."""
+    print("\n" + "="*70)
+    print("TEST: Lane-ROI Detection")
+    print("="*70)
+
+    # Queues on every approach, one car at the N/E crop overlap, and two
+    # cars off the approach lanes
+    lanes = [(200.0 + dx, y, 180.0) for dx in (-3.5, 0.0, 3.5) for y in (215.0, 240.0, 280.0)]
+    lanes += [(200.0 + dx, y, 0.0) for dx in (-3.5, 3.5) for y in (185.0, 150.0)]
+    lanes += [(x, 200.0 + dy, 270.0) for dy in (-3.5, 3.5) for x in (220.0, 260.0)]
+    lanes += [(x, 200.0 + dy, 90.0) for dy in (-3.5, 0.0) for x in (180.0, 120.0)]
+    corner = [(203.0, 209.0, 270.0)]
+    off_lane = [(260.0, 260.0, 0.0), (140.0, 150.0, 90.0)]
+    x, y, angle = np.array(lanes + corner + off_lane).T
+    n = len(x)
+    vehicles = VehicleFrame.from_columns(
+        ids=[f"veh_{i}" for i in range(n)], types=['car'] * n,
+        lane_ids=['N_in_0_0'] * n, x=x, y=y, speed=np.zeros(n), angle=angle,
+        waiting_time=np.zeros(n), intersection_pos=CENTER
+    )
+
+    camera = VirtualCamera(image_size=(1280, 720), intersection_center=CENTER)
+    frame = camera.render_frame(vehicles).copy()
+
+    model = _ColorDetector()
+    full = model.detect(frame)
+    assert len(full) == n
+
+    roi_detector = LaneROIDetector(model, LaneMapper(CONFIG_PATH), camera.scale, CENTER)
+    detections = roi_detector.detect(frame)
+    mosaic_shape, imgsz = model.calls[-1]
+    layout = roi_detector.layout((1280, 720), (640, 360))
+
+    assert len(detections) == n - len(off_lane), \
+        f"FAIL: {len(detections)} detections (duplicates or misses)"
+    iou = box_iou_matrix(full.boxes, detections.boxes)
+    assert (iou.max(axis=0) > 0.99).all(), "FAIL: boxes not mapped back to the frame"
+    missed = full.centers[iou.max(axis=1) < 0.99]
+    expected = [camera.world_to_image(px, py) for px, py, _ in off_lane]
+    assert np.allclose(np.sort(missed, axis=0), np.sort(expected, axis=0), atol=2), \
+        "FAIL: wrong vehicles skipped"
+    assert mosaic_shape[:2] == (layout.mosaic_size[1], layout.mosaic_size[0])
+    assert layout.pixel_fraction < 0.2 and imgsz < 640 and imgsz % 32 == 0
+
+    print(f"✓ {len(detections)} lane vehicles matched, off-lane skipped; "
+          f"mosaic {layout.pixel_fraction:.0%} of frame pixels at imgsz {imgsz}")
+
+
+def test_pipeline_rejects_batching_detector():
+    """lane_roi needs per-call imgsz, which a shared BatchingDetector lacks."""
+    print("\n" + "="*70)
+    print("TEST: Lane-ROI Detector Requirements")
+    print("="*70)
+
+    pipeline = PerceptionPipeline(CONFIG_PATH, camera_scale=2.4, intersection_center=CENTER,
+                                  detector=_ColorDetector(), lane_roi=True)
+    assert pipeline.roi_detector is not None
+
+    with BatchingDetector(_ColorDetector()) as shared:
+        with pytest.raises(ValueError, match="lane_roi"):
+            PerceptionPipeline(CONFIG_PATH, camera_scale=2.4, intersection_center=CENTER,
+                               detector=shared, lane_roi=True)
+        assert PerceptionPipeline(CONFIG_PATH, camera_scale=2.4, intersection_center=CENTER,
+                                  detector=shared).roi_detector is None
+
+    print("✓ BatchingDetector rejected with lane_roi, accepted without")
@@ -0,0 +1,100 @@
+"""
+Unit tests for the ONNX Runtime detector backend.
+Uses an untrained YOLOv8n saved locally (no weight download); checks the
+export cache, INT8 quantization and that ONNX outputs match torch's.
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import numpy as np
+import pytest
+
+pytest.importorskip("onnxruntime")
+pytest.importorskip("onnx")
+
+import onnx
+import onnxruntime
+import torch
+from ultralytics import YOLO
+
+from perception.detector import VehicleDetector, Detection
+from perception.onnx_export import (
+    export_onnx, letterbox, calibration_images, DEFAULT_CALIBRATION_DIR
+)
+
+
+IMGSZ = 320
+
+
+@pytest.fixture(scope="module")
+def weights(tmp_path_factory):
+    """Untrained YOLOv8n whose 'car' scores are high enough to detect"""
+    model = YOLO('yolov8n.yaml')
+    with torch.no_grad():
+        for branch in model.model.model[-1].cv3:
+            branch[-1].bias[2] += 14.0
+    path = tmp_path_factory.mktemp("weights") / "tiny.pt"
+    model.save(str(path))
+    return str(path)
+
+
+def _raw(session: onnxruntime.InferenceSession, x: np.ndarray) -> np.ndarray:
+    return session.run(None, {session.get_inputs()[0].name: x})[0]
+
+
+def test_export_cache_and_int8(weights, tmp_path):
+    """Exports are cached; INT8 quantizes the convolutions and keeps metadata."""
+    print("\n" + "="*70)
+    print("TEST: ONNX Export Cache / INT8")
+    print("="*70)
+
+    fp32 = export_onnx(weights, imgsz=IMGSZ, export_dir=tmp_path)
+    mtime = fp32.stat().st_mtime_ns
+    assert export_onnx(weights, imgsz=IMGSZ, export_dir=tmp_path) == fp32
+    assert fp32.stat().st_mtime_ns == mtime, "FAIL: cached export rebuilt"
+
+    int8 = export_onnx(weights, imgsz=IMGSZ, int8=True, export_dir=tmp_path)
+    model = onnx.load(str(int8))
+    assert any(n.op_type == 'QuantizeLinear' for n in model.graph.node)
+    assert 'names' in {p.key for p in model.metadata_props}
+    assert not [p for p in tmp_path.iterdir() if p.name.startswith('.tmp')]
+
+    # Same input -> near-identical scores from the quantized model
+    x = letterbox(next(calibration_images(DEFAULT_CALIBRATION_DIR)), IMGSZ)
+    ref = _raw(onnxruntime.InferenceSession(str(fp32)), x)
+    out = _raw(onnxruntime.InferenceSession(str(int8)), x)
+    assert np.corrcoef(ref[0, 4:].ravel(), out[0, 4:].ravel())[0, 1] > 0.9
+
+    print(f"✓ {fp32.name} cached, {int8.name} quantized")
+
+
+def test_onnx_backend_matches_torch(weights, tmp_path):
+    """The ONNX backend yields the same raw outputs and Detection objects as torch."""
+    print("\n" + "="*70)
+    print("TEST: ONNX vs Torch Detector")
+    print("="*70)
+
+    torch_detector = VehicleDetector(weights, device='cpu', imgsz=IMGSZ)
+    onnx_detector = VehicleDetector(weights, device='cpu', backend='onnx',
+                                    imgsz=IMGSZ, export_dir=str(tmp_path))
+
+    x = letterbox(next(calibration_images(DEFAULT_CALIBRATION_DIR)), IMGSZ)
+    with torch.no_grad():
+        ref = torch_detector.model.model.eval()(torch.from_numpy(x))[0].numpy()
+    out = _raw(onnxruntime.InferenceSession(
+        str(export_onnx(weights, imgsz=IMGSZ, export_dir=tmp_path))), x)
+    assert np.allclose(ref, out, rtol=1e-3, atol=1e-2), "FAIL: raw outputs differ"
+
+    frame = next(calibration_images(DEFAULT_CALIBRATION_DIR))
+    detections = onnx_detector.detect(frame)
+    assert detections and all(isinstance(d, Detection) for d in detections)
+    assert {d.class_name for d in detections} == {'car'}
+    assert [len(d) for d in onnx_detector.detect_batch([frame, frame])] == \
+        [len(detections)] * 2
+
+    with pytest.raises(ValueError):
+        VehicleDetector(weights, device='cpu', int8=True)
+
+    print(f"✓ Raw outputs match torch; {len(detections)} Detection objects from ONNX")
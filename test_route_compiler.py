@@ -0,0 +1,120 @@
+"""
+Unit tests for the scenario route compiler.
+Checks flow scaling, directional bias, demand profiles and caching.
+"""
+
+import sys
+import xml.etree.ElementTree as ET
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import pytest
+
+from evaluation.route_compiler import compile_routes, compile_scenario_routes, config_route_file
+from evaluation.scenarios import ScenarioGenerator, TrafficScenario
+
+
+CONFIG_FILE = str(Path(__file__).parent / "sumo_networks" / "simple_4way" / "sumo.cfg")
+
+
+def _flow_rates(route_file):
+    root = ET.parse(route_file).getroot()
+    return {f.get('id'): float(f.get('vehsPerHour')) for f in root.findall('flow')}
+
+
+def test_multiplier_and_bias(tmp_path):
+    """Peak scales every flow; imbalance scales flows by entry approach."""
+    print("\n" + "="*70)
+    print("TEST: Flow Multiplier and Directional Bias")
+    print("="*70)
+
+    base = _flow_rates(config_route_file(CONFIG_FILE))
+    baseline = ScenarioGenerator.get_baseline_scenario()
+    assert compile_scenario_routes(CONFIG_FILE, baseline, str(tmp_path)) == config_route_file(CONFIG_FILE)
+
+    peak = _flow_rates(compile_scenario_routes(
+        CONFIG_FILE, ScenarioGenerator.get_peak_traffic_scenario(), str(tmp_path)))
+    assert all(abs(peak[k] - 1.5 * v) < 1e-3 for k, v in base.items())
+
+    imbalanced = _flow_rates(compile_scenario_routes(
+        CONFIG_FILE, ScenarioGenerator.get_imbalanced_scenario(), str(tmp_path)))
+    assert abs(imbalanced['flow_N_S'] - 1.5 * base['flow_N_S']) < 1e-3
+    assert abs(imbalanced['flow_E_W'] - 0.5 * base['flow_E_W']) < 1e-3
+    assert abs(imbalanced['flow_trucks_E'] - 0.5 * base['flow_trucks_E']) < 1e-3
+
+    print(f"✓ {len(base)} flows scaled")
+
+
+def test_demand_profile_segments_and_cache(tmp_path):
+    """Profiles split flows into time-sorted segments; output is cached by demand."""
+    print("\n" + "="*70)
+    print("TEST: Demand Profile")
+    print("="*70)
+
+    scenario = TrafficScenario(
+        name="Ramp", description="", duration=300.0, flow_multiplier=2.0,
+        emergency_events=[], demand_profile=[(100.0, 1.5), (200.0, 0.5)]
+    )
+    route_file = compile_scenario_routes(CONFIG_FILE, scenario, str(tmp_path))
+    flows = ET.parse(route_file).getroot().findall('flow')
+
+    begins = [float(f.get('begin')) for f in flows]
+    assert begins == sorted(begins)
+
+    segments = [(f.get('begin'), f.get('end'), float(f.get('vehsPerHour')))
+                for f in flows if f.get('id').startswith('flow_N_S_p')]
+    assert segments == [('0', '100', 600.0), ('100', '200', 900.0), ('200', '3600', 300.0)]
+
+    # Same demand under another name and with emergencies reuses the file
+    scenario.name, scenario.emergency_events = "Other", ScenarioGenerator.get_multiple_emergency_scenario().emergency_events
+    assert compile_scenario_routes(CONFIG_FILE, scenario, str(tmp_path)) == route_file
+    assert len(list(tmp_path.glob("*.rou.xml"))) == 1
+
+    print(f"✓ {len(flows)} flow segments, cached at {Path(route_file).name}")
+
+
+def test_demand_profile_relative_to_run_start(tmp_path):
+    """With a warm-up, profile breakpoints are shifted to the evaluated run."""
+    print("\n" + "="*70)
+    print("TEST: Demand Profile After Warm-up")
+    print("="*70)
+
+    scenario = ScenarioGenerator.get_rush_hour_scenario()
+
+    def boundaries(warmup):
+        route_file = compile_scenario_routes(CONFIG_FILE, scenario, str(tmp_path), warmup=warmup)
+        flows = ET.parse(route_file).getroot().findall('flow')
+        return route_file, [(float(f.get('begin')), float(f.get('end')), float(f.get('vehsPerHour')))
+                            for f in flows if f.get('id').startswith('flow_N_S_p')]
+
+    cold_file, cold = boundaries(0.0)
+    warm_file, warm = boundaries(120.0)
+    assert cold_file != warm_file, "FAIL: warm-up not part of the cache key"
+
+    assert [(b, e) for b, e, _ in cold] == [(0, 60), (60, 120), (120, 240), (240, 3600)]
+    # Warm-up runs the base demand; the evaluated run sees the same profile
+    assert [(b, e) for b, e, _ in warm] == [(0, 120), (120, 180), (180, 240), (240, 360), (360, 3600)]
+    assert [r for *_, r in warm[1:]] == [r for *_, r in cold]
+    assert warm[0][2] == warm[1][2] and warm[3][2] == 2.0 * warm[0][2]
+
+    print(f"✓ Peak at t=120-240s of the run: SUMO time {warm[3][0]:g}-{warm[3][1]:g}s with 120s warm-up")
+
+
+def test_flow_without_end_is_rejected(tmp_path):
+    """A flow end defaulting to the scenario duration would bypass the cache key."""
+    print("\n" + "="*70)
+    print("TEST: Flows Need an Explicit End")
+    print("="*70)
+
+    tree = ET.parse(config_route_file(CONFIG_FILE))
+    del tree.getroot().find('flow').attrib['end']
+    base_route_file = tmp_path / "open_ended.rou.xml"
+    tree.write(base_route_file)
+
+    net_file = str(Path(CONFIG_FILE).parent / "network.net.xml")
+    with pytest.raises(ValueError, match="explicit end"):
+        compile_routes(str(base_route_file), net_file,
+                       ScenarioGenerator.get_peak_traffic_scenario(),
+                       str(tmp_path / "out.rou.xml"))
+
+    print("✓ Open-ended flow rejected")
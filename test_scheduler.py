@@ -0,0 +1,61 @@
+"""
+Unit tests for the multi-rate control loop.
+Checks stage firing / dt bookkeeping and dt-aware smoothing.
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import pytest
+
+from simulation.scheduler import MultiRateScheduler
+from state_estimation.smoothing import ExponentialMovingAverage
+
+
+def test_scheduler_fires_stages_at_their_rates():
+    """10 Hz base: 2 Hz stage every 5 steps, 1 Hz stage every 10 steps."""
+    print("\n" + "="*70)
+    print("TEST: Multi-Rate Scheduler")
+    print("="*70)
+
+    scheduler = MultiRateScheduler(base_rate=10.0, rates={
+        'state_estimation': 2.0,
+        'control': 1.0
+    })
+
+    fired = [scheduler.tick() for _ in range(100)]
+
+    assert scheduler.call_counts == {'state_estimation': 20, 'control': 10}
+    assert list(fired[0]) == ['state_estimation', 'control'], \
+        "FAIL: all stages should fire on the first tick, in registration order"
+    assert fired[5] == {'state_estimation': pytest.approx(0.5)}
+    assert fired[10]['control'] == pytest.approx(1.0)
+    assert all(not due for i, due in enumerate(fired) if i % 5 != 0)
+
+    with pytest.raises(ValueError):
+        scheduler.add_stage('bad', 3.0)  # 10/3 steps is not a whole number
+
+    print("✓ Stages fire on their own grid with correct dt")
+
+
+def test_ema_dt_rescaling_matches_reference_rate():
+    """One update with dt=0.5 equals five 0.1s updates of the same value."""
+    print("\n" + "="*70)
+    print("TEST: dt-Aware EMA")
+    print("="*70)
+
+    fast = ExponentialMovingAverage(alpha=0.3, reference_dt=0.1)
+    slow = ExponentialMovingAverage(alpha=0.3, reference_dt=0.1)
+    fast.update('q', 0.0)
+    slow.update('q', 0.0)
+
+    for _ in range(5):
+        fast.update('q', 10.0, dt=0.1)
+    slow.update('q', 10.0, dt=0.5)
+
+    assert slow.get('q') == pytest.approx(fast.get('q'))
+    assert ExponentialMovingAverage(0.3, 0.1).alpha_for(0.1) == 0.3
+    assert ExponentialMovingAverage(0.3).alpha_for(0.5) == 0.3
+
+    print(f"✓ Smoothed value {slow.get('q'):.4f} independent of update rate")
@@ -0,0 +1,54 @@
+"""
+Unit tests for change-only signal actuation.
+Checks unchanged states are not resent, commands coalesce per step and
+actuation events are recorded per traffic light.
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from simulation.signal_actuator import SignalActuator
+
+
+class _RecordingSumo:
+    """Collects set_traffic_light_state calls"""
+
+    def __init__(self):
+        self.writes = []
+
+    def set_traffic_light_state(self, state, tls_id="center"):
+        self.writes.append((tls_id, state))
+
+
+def test_change_only_writes():
+    """Repeated states cost no writes; the last command of a step wins."""
+    print("\n" + "="*70)
+    print("TEST: Change-Only Actuation")
+    print("="*70)
+
+    sumo = _RecordingSumo()
+    actuator = SignalActuator(sumo)
+
+    for t in range(5):
+        actuator.command('GGGrrrGGGrrr', 'A')
+        actuator.command('rrrGGGrrrGGG', 'B')
+        actuator.flush(float(t))
+    assert sumo.writes == [('A', 'GGGrrrGGGrrr'), ('B', 'rrrGGGrrrGGG')]
+
+    # Change then revert within one step: nothing to send
+    actuator.command('yyyrrryyyrrr', 'A')
+    actuator.command('GGGrrrGGGrrr', 'A')
+    assert actuator.flush(5.0) == 0
+
+    actuator.command('yyyrrryyyrrr', 'A')
+    actuator.command(None, 'B')
+    assert actuator.flush(6.0) == 1
+
+    assert actuator.command_counts == {'A': 8, 'B': 5}
+    assert actuator.write_counts == {'A': 2, 'B': 1}
+    events = actuator.events_for('A')
+    assert [(e.time, e.previous) for e in events] == [(0.0, None), (6.0, 'GGGrrrGGGrrr')]
+    assert actuator.last_state('A') == 'yyyrrryyyrrr'
+
+    print(f"✓ {len(sumo.writes)} writes for {sum(actuator.command_counts.values())} commands")
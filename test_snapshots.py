@@ -0,0 +1,100 @@
+"""
+Unit tests for warm-start snapshots.
+Checks that a restored warm-up continues exactly like a cold run stepped to
+the same time, and that cached snapshots are reused.
+"""
+
+import sys
+from dataclasses import replace
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import numpy as np
+import pytest
+
+from control.fixed_time_controller import FixedTimeController
+from evaluation.evaluator import TrafficControlEvaluator
+from evaluation.route_compiler import compile_scenario_routes
+from evaluation.scenarios import ScenarioGenerator
+from evaluation.snapshots import SnapshotCache
+from simulation.sumo_interface import SUMOInterface
+
+
+NETWORK_DIR = Path(__file__).parent / "sumo_networks" / "simple_4way"
+CONFIG_FILE = str(NETWORK_DIR / "sumo.cfg")
+INTERSECTION_CONFIG = str(Path(__file__).parent / "config" / "intersection_config.yaml")
+WARMUP = 30.0
+SEED = 7
+
+
+def _run(sumo, port, steps, snapshot=None):
+    """(time, {vehicle: position}) after each step, starting from snapshot"""
+    sumo.start(port=port, seed=SEED, state_file=str(snapshot) if snapshot else None)
+    try:
+        states = [(sumo.get_current_time(), None)]
+        for _ in range(steps):
+            sumo.step()
+            frame = sumo.get_vehicle_frame()
+            states.append((sumo.get_current_time(),
+                           dict(zip(frame.ids, map(tuple, frame.positions)))))
+        return states
+    finally:
+        sumo.close()
+
+
+def test_snapshot_restores_warmed_up_traffic(tmp_path):
+    """Loading a warm-up equals a cold run with the same seed, step for step."""
+    print("\n" + "="*70)
+    print("TEST: Warm-up Snapshot Save / Load")
+    print("="*70)
+
+    scenario = ScenarioGenerator.get_rush_hour_scenario()
+    cache = SnapshotCache(CONFIG_FILE, str(tmp_path), step_length=0.1)
+    path = cache.get_or_create(scenario, SEED, WARMUP, port=8871)
+    route_file = compile_scenario_routes(CONFIG_FILE, scenario, warmup=WARMUP)
+
+    warm = _run(SUMOInterface(CONFIG_FILE, route_file=route_file), 8872, 100, snapshot=path)
+    cold = _run(SUMOInterface(CONFIG_FILE, route_file=route_file), 8873, 400)[300:]
+
+    assert warm[0][0] == pytest.approx(WARMUP), "FAIL: snapshot not at the warm-up time"
+    assert cold[0][0] == pytest.approx(WARMUP)
+    assert len(warm[1][1]) > 5, "FAIL: network not filled by the warm-up"
+    for (t_warm, warm_vehicles), (t_cold, cold_vehicles) in zip(warm[1:], cold[1:]):
+        assert t_warm == pytest.approx(t_cold)
+        assert warm_vehicles.keys() == cold_vehicles.keys(), \
+            f"FAIL: vehicle sets differ at t={t_warm:.1f}s"
+        assert np.allclose([warm_vehicles[v] for v in warm_vehicles],
+                           [cold_vehicles[v] for v in warm_vehicles])
+
+    # Key covers seed and step length
+    assert cache.snapshot_path(scenario, SEED + 1, WARMUP) != path
+    assert SnapshotCache(CONFIG_FILE, str(tmp_path), step_length=0.2).snapshot_path(
+        scenario, SEED, WARMUP) != path
+
+    print(f"✓ {len(warm[-1][1])} vehicles identical to the cold run "
+          f"{len(warm) - 1} steps after the {WARMUP:g}s warm-up")
+
+
+def test_evaluator_reuses_snapshot(tmp_path):
+    """Warm-started evaluations load the cached snapshot instead of rebuilding it."""
+    print("\n" + "="*70)
+    print("TEST: Evaluator Snapshot Reuse")
+    print("="*70)
+
+    scenario = replace(ScenarioGenerator.get_rush_hour_scenario(), duration=10.0)
+    evaluator = TrafficControlEvaluator(CONFIG_FILE, INTERSECTION_CONFIG,
+                                        snapshot_dir=str(tmp_path))
+
+    evaluator.evaluate_controller(FixedTimeController(), "Fixed-Time", scenario,
+                                  verbose=False, port=8874, seed=SEED, warmup=WARMUP)
+    [path] = tmp_path.glob("*.xml.gz")
+    assert path == evaluator.snapshots.snapshot_path(scenario, SEED, WARMUP)
+    mtime = path.stat().st_mtime_ns
+
+    metrics = evaluator.evaluate_controller(FixedTimeController(), "Fixed-Time", scenario,
+                                            verbose=False, port=8875, seed=SEED, warmup=WARMUP)
+    assert list(tmp_path.glob("*.xml.gz")) == [path]
+    assert path.stat().st_mtime_ns == mtime, "FAIL: snapshot rebuilt"
+    assert metrics.avg_queue_length > 0, "FAIL: run did not start from warmed-up traffic"
+
+    print(f"✓ {path.name} reused")
@@ -0,0 +1,144 @@
+"""
+Unit tests for recorded vehicle traces.
+Checks that a recorded stream replays exactly, without SUMO.
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import numpy as np
+
+from simulation.sumo_interface import VehicleFrame
+from simulation.trace import TraceRecorder, TraceReader
+from perception.lane_mapper import LaneMapper
+from perception.replay_adapter import ReplayPerceptionAdapter
+from perception.sumo_adapter import vehicle_frame_to_perceived
+
+
+CONFIG_PATH = str(Path(__file__).parent / "config" / "intersection_config.yaml")
+INTERSECTION_POS = (200.0, 200.0)
+
+
+def _random_frames(steps: int, seed: int = 0):
+    """Synthetic per-step vehicle frames with vehicles entering and leaving"""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for step in range(steps):
+        n = int(rng.integers(0, 15))
+        ids = [f"veh_{i}" for i in sorted(rng.choice(30, size=n, replace=False))]
+        frames.append(VehicleFrame.from_columns(
+            ids=ids,
+            types=[str(rng.choice(['car', 'truck', 'ambulance'])) for _ in ids],
+            lane_ids=[str(rng.choice(['N_in_0_0', 'E_in_1_0', ':center_0_0'])) for _ in ids],
+            x=rng.uniform(50, 350, n),
+            y=rng.uniform(50, 350, n),
+            speed=rng.uniform(0, 14, n),
+            angle=rng.uniform(0, 360, n),
+            waiting_time=rng.uniform(0, 30, n),
+            intersection_pos=INTERSECTION_POS
+        ))
+    return frames
+
+
+def _assert_frames_equal(a: VehicleFrame, b: VehicleFrame):
+    for field in ('ids', 'types', 'lane_ids', 'x', 'y', 'speed', 'angle',
+                  'waiting_time', 'distance_to_intersection'):
+        assert np.array_equal(getattr(a, field), getattr(b, field)), f"FAIL: {field} differs"
+
+
+def test_trace_round_trip(tmp_path):
+    """Recorded frames read back bit-identical, indexed by step and time."""
+    print("\n" + "="*70)
+    print("TEST: Trace Round Trip")
+    print("="*70)
+
+    frames = _random_frames(50)
+    path = tmp_path / "trace.npz"
+
+    with TraceRecorder(str(path), INTERSECTION_POS, step_length=0.1) as recorder:
+        for step, frame in enumerate(frames):
+            recorder.record(round((step + 1) * 0.1, 6), frame)
+
+    trace = TraceReader(str(path))
+
+    assert len(trace) == 50
+    assert trace.intersection_pos == INTERSECTION_POS
+    for step, frame in enumerate(frames):
+        _assert_frames_equal(trace.frame(step), frame)
+
+    # Timestamps between steps resolve to the preceding step
+    assert trace.step_at(1.0) == 9
+    assert trace.step_at(1.04) == 9
+    assert trace.vehicle_infos(9) == frames[9].to_vehicle_infos()
+
+    print(f"✓ {len(trace)} steps / {trace.num_observations} observations identical")
+
+
+def test_replay_adapter_matches_live_conversion(tmp_path):
+    """Replay output equals the live ground-truth conversion of the same frames."""
+    print("\n" + "="*70)
+    print("TEST: Replay Perception Adapter")
+    print("="*70)
+
+    frames = _random_frames(20, seed=1)
+    path = tmp_path / "trace.npz"
+
+    recorder = TraceRecorder(str(path), INTERSECTION_POS)
+    for step, frame in enumerate(frames):
+        recorder.record(step * 0.1, frame)
+    recorder.close()
+
+    mapper = LaneMapper(CONFIG_PATH)
+    adapter = ReplayPerceptionAdapter(str(path), mapper)
+
+    track_ids = {}
+    for step, frame in enumerate(frames):
+        replayed = adapter.perceive_frame(adapter.timestamps[step])
+
+        ids = np.array([track_ids.setdefault(v, len(track_ids) + 1) for v in frame.ids],
+                       dtype=np.int64)
+        expected = vehicle_frame_to_perceived(frame, ids, mapper)
+
+        assert replayed.to_vehicles() == expected.to_vehicles(), \
+            f"FAIL: replay differs at step {step}"
+
+    print(f"✓ {len(frames)} replayed steps match live conversion")
+
+
+def test_trace_annotations(tmp_path):
+    """Signal state, controller mode and overlay stats round-trip per step."""
+    print("\n" + "="*70)
+    print("TEST: Trace Annotations")
+    print("="*70)
+
+    frames = _random_frames(4, seed=2)
+    path = tmp_path / "annotated.npz"
+
+    with TraceRecorder(str(path), INTERSECTION_POS) as recorder:
+        recorder.record(0.1, frames[0])
+        recorder.record(0.2, frames[1], signal_state='GGGrrrGGGrrr',
+                        controller_mode='NORMAL', stats={'vehicles': 7, 'stopped': 2})
+        recorder.record(0.3, frames[2], signal_state='rrrGGGrrrGGG',
+                        controller_mode='EMERGENCY',
+                        stats={'vehicles': 8, 'stopped': 3, 'emergency_distance': 41.5})
+        recorder.record(0.4, frames[3])
+
+    trace = TraceReader(str(path))
+    assert trace.has_annotations
+    assert trace.annotation(0) == (None, None, {})
+    assert trace.annotation(1) == ('GGGrrrGGGrrr', 'NORMAL', {'vehicles': 7, 'stopped': 2})
+    signal, mode, stats = trace.annotation(2)
+    assert (signal, mode) == ('rrrGGGrrrGGG', 'EMERGENCY')
+    assert stats == {'vehicles': 8, 'stopped': 3, 'emergency_distance': 41.5}
+    assert isinstance(stats['vehicles'], int) and isinstance(stats['emergency_distance'], float)
+    _assert_frames_equal(trace.frame(3), frames[3])
+
+    # Plain traces carry no annotations
+    plain = tmp_path / "plain.npz"
+    with TraceRecorder(str(plain), INTERSECTION_POS) as recorder:
+        recorder.record(0.1, frames[0])
+    assert not TraceReader(str(plain)).has_annotations
+    assert TraceReader(str(plain)).annotation(0) == (None, None, {})
+
+    print("✓ Annotations round-trip; plain traces report none")
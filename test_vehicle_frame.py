@@ -0,0 +1,128 @@
+"""
+Unit tests for columnar vehicle frames.
+Checks that VehicleFrame / PerceivedFrame paths match the per-object paths.
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import numpy as np
+
+from simulation.sumo_interface import VehicleInfo, VehicleFrame
+from perception.types import PerceivedVehicle
+from perception.perceived_frame import PerceivedFrame
+from perception.lane_mapper import LaneMapper
+from state_estimation.lane_state_tracker import LaneStateTracker
+
+
+CONFIG_PATH = str(Path(__file__).parent / "config" / "intersection_config.yaml")
+LANE_IDS = [f"{a}_in_{i}" for a in ['N', 'S', 'E', 'W'] for i in range(3)]
+
+
+def test_vehicle_frame_round_trip():
+    """VehicleInfo list -> VehicleFrame -> VehicleInfo views is lossless."""
+    print("\n" + "="*70)
+    print("TEST: VehicleFrame Round Trip")
+    print("="*70)
+    
+    vehicles = [
+        VehicleInfo(id="v1", type="car", position=(200.0, 230.0), speed=5.0,
+                    angle=180.0, lane_id="N_in_0_0", distance_to_intersection=30.0,
+                    waiting_time=0.0),
+        VehicleInfo(id="v2", type="ambulance", position=(150.0, 198.0), speed=0.0,
+                    angle=90.0, lane_id="W_in_1", distance_to_intersection=50.04,
+                    waiting_time=4.5),
+    ]
+    
+    frame = VehicleFrame.from_vehicle_infos(vehicles)
+    
+    assert len(frame) == 2
+    assert frame.positions.shape == (2, 2)
+    assert frame.to_vehicle_infos() == vehicles, "FAIL: lazy views differ from input"
+    assert frame[1].type == "ambulance"
+    assert len(VehicleFrame.empty()) == 0
+    
+    print("✓ Lazy VehicleInfo views match original objects")
+
+
+def test_vectorized_lane_assignment():
+    """assign_lanes / get_distances_to_stop_line match scalar versions."""
+    print("\n" + "="*70)
+    print("TEST: Vectorized Lane Assignment")
+    print("="*70)
+    
+    mapper = LaneMapper(CONFIG_PATH)
+    points = np.random.default_rng(0).uniform(50.0, 350.0, size=(2000, 2))
+    
+    lane_ids = mapper.assign_lanes(points[:, 0], points[:, 1])
+    distances = mapper.get_distances_to_stop_line(points[:, 0], points[:, 1], lane_ids)
+    
+    for (x, y), lane_id, dist in zip(points, lane_ids, distances):
+        expected_lane = mapper.assign_lane((x, y))
+        assert lane_id == expected_lane, f"FAIL: {lane_id} != {expected_lane} at {(x, y)}"
+        
+        expected_dist = mapper.get_distance_to_stop_line((x, y), lane_id) if lane_id else -1.0
+        assert dist == expected_dist, f"FAIL: distance {dist} != {expected_dist}"
+    
+    print(f"✓ {len(points)} positions assigned identically")
+
+
+def test_tracker_frame_matches_list():
+    """LaneStateTracker gives identical states for list and frame input."""
+    print("\n" + "="*70)
+    print("TEST: Tracker Frame vs List Input")
+    print("="*70)
+    
+    rng = np.random.default_rng(1)
+    list_tracker = LaneStateTracker(LANE_IDS)
+    frame_tracker = LaneStateTracker(LANE_IDS)
+    
+    for step in range(100):
+        vehicles = []
+        for track_id in rng.choice(40, size=20, replace=False):
+            lane_id = rng.choice(LANE_IDS + [None])
+            speed = rng.choice([0.0, 0.3, 4.0])
+            vehicles.append(PerceivedVehicle(
+                track_id=int(track_id), class_name="car",
+                is_emergency=bool(rng.random() < 0.05), confidence=1.0,
+                position=(0.0, 0.0), velocity=(speed * 0.6, speed * 0.8),
+                lane_id=lane_id,
+                distance_to_stop_line=float(rng.uniform(0, 60)) if lane_id else -1.0
+            ))
+        
+        current_time = step * 0.1
+        list_tracker.update(vehicles, current_time)
+        frame_tracker.update(PerceivedFrame.from_vehicles(vehicles), current_time)
+        
+        assert list_tracker.get_all_states() == frame_tracker.get_all_states(), \
+            f"FAIL: states differ at step {step}"
+    
+    print("✓ 100 steps of identical lane states")
+
+
+def test_perceived_frame_views_validate():
+    """PerceivedFrame rows materialize as valid PerceivedVehicle objects."""
+    print("\n" + "="*70)
+    print("TEST: PerceivedFrame Views")
+    print("="*70)
+    
+    vehicles = [
+        PerceivedVehicle(
+            track_id=7, class_name="car", is_emergency=False, confidence=1.0,
+            position=(200.0, 220.0), velocity=(0.0, -3.0),
+            lane_id="N_in_0", distance_to_stop_line=15.0
+        ),
+        PerceivedVehicle(
+            track_id=8, class_name="truck", is_emergency=False, confidence=0.9,
+            position=(120.0, 120.0), velocity=(0.0, 0.0),
+            lane_id=None, distance_to_stop_line=-1.0
+        ),
+    ]
+    
+    frame = PerceivedFrame.from_vehicles(vehicles)
+    
+    assert frame.to_vehicles() == vehicles, "FAIL: views differ from input"
+    assert np.allclose(frame.speeds, [3.0, 0.0])
+    
+    print("✓ Views round-trip through frozen PerceivedVehicle")
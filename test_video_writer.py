@@ -0,0 +1,50 @@
+"""
+Unit tests for the streaming video writer.
+Checks frames queued from a reused buffer all reach the encoder and that
+mismatched frames are rejected.
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import cv2
+import numpy as np
+import pytest
+
+from simulation.video_writer import StreamingVideoWriter
+
+
+def test_stream_frames_to_opencv(tmp_path):
+    """Every written frame is encoded, even when the caller reuses its buffer."""
+    print("\n" + "="*70)
+    print("TEST: Streaming Video Writer")
+    print("="*70)
+
+    path = tmp_path / "out.mp4"
+    buffer = np.zeros((120, 160, 3), dtype=np.uint8)
+
+    with StreamingVideoWriter(str(path), (160, 120), fps=10, encoder='opencv',
+                              queue_size=2) as video:
+        for i in range(12):
+            buffer[:] = i * 20
+            video.write(buffer)
+        with pytest.raises(ValueError):
+            video.write(np.zeros((100, 160, 3), dtype=np.uint8))
+
+    assert video.frames_written == 12
+    capture = cv2.VideoCapture(str(path))
+    assert int(capture.get(cv2.CAP_PROP_FRAME_COUNT)) == 12
+    brightness = []
+    while True:
+        ok, frame = capture.read()
+        if not ok:
+            break
+        brightness.append(frame.mean())
+    capture.release()
+    assert brightness == sorted(brightness) and brightness[-1] > brightness[0] + 100
+
+    with pytest.raises(RuntimeError):
+        video.write(buffer)
+
+    print(f"✓ {video.frames_written} frames encoded ({path.stat().st_size} bytes)")
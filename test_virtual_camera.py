@@ -0,0 +1,73 @@
+"""
+Unit tests for VirtualCamera rendering.
+Checks the static road layer is built once per camera configuration and
+that frames are the background plus the vehicles only.
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import numpy as np
+
+from simulation.camera_interface import VirtualCamera
+from simulation.sumo_interface import VehicleInfo
+
+
+def _vehicle(x, y, vtype='car', angle=90.0):
+    return VehicleInfo(id=f"{x}_{y}", type=vtype, position=(x, y), speed=5.0,
+                       angle=angle, lane_id='E_in_0',
+                       distance_to_intersection=0.0, waiting_time=0.0)
+
+
+def test_background_cached_per_configuration():
+    """Roads are drawn once; frames differ from them only around vehicles."""
+    print("\n" + "="*70)
+    print("TEST: Cached Background Layer")
+    print("="*70)
+
+    camera = VirtualCamera(image_size=(640, 360), view_range=100.0)
+    empty = camera.render_frame([]).copy()
+    background = camera.background
+    assert np.array_equal(empty, background)
+
+    frame = camera.render_frame([_vehicle(40.0, 0.0, 'truck')])
+    assert camera.background is background
+    changed = np.argwhere((frame != background).any(axis=2))
+    px, py = camera.world_to_image(40.0, 0.0)
+    assert changed.size > 0
+    assert np.abs(changed[:, 1] - px).max() <= 12 * camera.scale / 2 + 4
+    assert np.abs(changed[:, 0] - py).max() <= 12 * camera.scale / 2 + 4
+
+    # The frame buffer is reused; the background is not touched
+    assert camera.render_frame([]) is frame
+    assert np.array_equal(frame, empty)
+
+    camera.intersection_center = (10.0, 0.0)
+    assert camera.background is not background
+
+    print(f"✓ {len(changed)} vehicle pixels drawn over a cached background")
+
+
+def test_batched_vehicles_by_type():
+    """List and columnar input render identically, one color per vType."""
+    print("\n" + "="*70)
+    print("TEST: Batched Vehicle Rasterization")
+    print("="*70)
+
+    from simulation.sumo_interface import VehicleFrame
+
+    camera = VirtualCamera(image_size=(640, 360), view_range=100.0)
+    vehicles = [_vehicle(-60.0, -1.6, 'car', 90.0), _vehicle(30.0, 1.6, 'truck', 270.0),
+                _vehicle(1.6, 50.0, 'ambulance', 180.0), _vehicle(-1.6, -70.0, 'bus', 0.0)]
+
+    from_list = camera.render_frame(vehicles).copy()
+    from_frame = camera.render_frame(VehicleFrame.from_vehicle_infos(vehicles))
+    assert np.array_equal(from_list, from_frame)
+
+    for v in vehicles:
+        color = camera.vehicle_colors.get(v.type, camera.vehicle_colors['default'])
+        px, py = camera.world_to_image(*v.position)
+        assert tuple(from_frame[py, px]) == color, v.type
+
+    print(f"✓ {len(vehicles)} vehicles in {len(set(v.type for v in vehicles))} color classes")